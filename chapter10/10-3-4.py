@@ -0,0 +1,337 @@
+# File: incremental_centrality_enron.py
+# 목적: 이메일이 계속 추가/삭제되는 Enron 그래프에서 중심성을 '증분(incremental)'으로 유지하는 실습
+# 내용:
+#   - Degree: 엣지 삽입/삭제 시 해당 두 노드만 갱신 (항상 정확)
+#   - PageRank / Eigenvector: 이전 점수를 시작값으로 쓰는 warm-start 거듭제곱 반복(power iteration)
+#   - Drift 추적: 잔차(residual)로 오차 상한을 추정해, 정확도가 떨어졌을 때만 전체 재계산
+# 의존성: numpy, scipy, networkx
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.io import mmread
+
+
+def print_graph_info(graph, info: str = "Graph"):
+    """그래프의 기본 정보를 출력하는 유틸리티 함수"""
+    print(f"\n---- {info} ----")
+    print(f"Graph Type: {graph.__class__.__name__}")
+    print(f"Number of nodes: {graph.number_of_nodes():,}")
+    print(f"Number of edges: {graph.number_of_edges():,}")
+
+
+@dataclass
+class RefreshStats:
+    """refresh() 한 번의 결과 기록"""
+    pagerank_iters: int
+    eigen_iters: int
+    pagerank_error: float          # PageRank 오차 상한 (L1)
+    eigen_error: float             # Eigenvector 마지막 반복의 L1 잔차
+    drift: float                   # 마지막 전체 재계산 이후 PageRank 이동량 (L1)
+    full_recompute: bool
+    seconds: float
+    changed_edges: int = 0
+
+
+@dataclass
+class IncrementalCentrality:
+    """
+    진화하는 방향 그래프의 중심성을 증분으로 유지하는 클래스
+    - add_edge / remove_edge: 그래프와 degree를 즉시 갱신하고 '변경됨' 표시만 남긴다.
+    - refresh: 이전 PageRank/Eigenvector 벡터에서 출발해 최대 warm_iters번만 반복한다.
+      반복 후 잔차로 오차 상한을 추정하고, 정확도가 떨어졌을 때만 전체 재계산한다.
+
+    PageRank 오차 상한: ||x - x*||_1 <= ||Px - x||_1 / (1 - alpha)
+      (P는 감쇠가 포함된 PageRank 연산자, alpha < 1 이므로 수축 사상)
+    - 오차 상한은 '현재 벡터'의 잔차로 매번 새로 계산하므로 배치가 쌓여도 누적되지 않는다.
+    - drift: 마지막 전체 재계산 시점의 점수에서 현재 점수가 얼마나 움직였는지(L1 거리)
+      → max_drift를 넘으면 기준선이 낡았다고 보고 전체 재계산한다.
+    """
+    graph: nx.DiGraph
+    alpha: float = 0.85
+    tol: float = 1.0e-10           # 수렴 기준 (networkx와 같이 err < n * tol)
+    warm_iters: int = 20           # 증분 갱신 시 허용하는 최대 반복 수
+    error_tol: float = 1.0e-4      # warm 결과의 오차 상한(L1)이 이 값을 넘으면 전체 재계산
+    max_drift: float = 0.05        # 기준선 대비 누적 이동량(L1)이 이 값을 넘으면 전체 재계산
+    max_iter: int = 1000
+
+    nodes: list = field(init=False)
+    index: dict = field(init=False)
+    degree: dict = field(init=False)
+    pagerank: np.ndarray = field(init=False)
+    eigenvector: np.ndarray = field(init=False)
+    history: list[RefreshStats] = field(init=False, default_factory=list)
+    _baseline: np.ndarray = field(init=False)       # 마지막 전체 재계산 시점의 PageRank
+    _A: sparse.csr_array = field(init=False)         # nodes 순서의 인접 행렬
+    _pending: list = field(init=False, default_factory=list)  # (행, 열, ±1) 변경 목록
+
+    def __post_init__(self):
+        self.nodes = list(self.graph.nodes())
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self.degree = dict(self.graph.degree())
+        self._A = nx.to_scipy_sparse_array(self.graph, nodelist=self.nodes, weight=None, format="csr")
+        self.full_recompute()
+
+    # =========================
+    # 그래프 변경 (Degree는 즉시 정확하게 갱신)
+    # =========================
+    def _ensure_node(self, node) -> None:
+        if node not in self.index:
+            self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+            self.degree[node] = 0
+            self.graph.add_node(node)
+
+    def add_edge(self, u, v) -> bool:
+        """엣지 삽입. 이미 있는 엣지면 아무것도 하지 않고 False 반환"""
+        self._ensure_node(u)
+        self._ensure_node(v)
+        if self.graph.has_edge(u, v):
+            return False
+        self.graph.add_edge(u, v)
+        self.degree[u] += 1
+        self.degree[v] += 1
+        self._pending.append((self.index[u], self.index[v], 1.0))
+        return True
+
+    def remove_edge(self, u, v) -> bool:
+        """엣지 삭제. 없는 엣지면 False 반환 (노드는 남겨 둔다)"""
+        if not self.graph.has_edge(u, v):
+            return False
+        self.graph.remove_edge(u, v)
+        self.degree[u] -= 1
+        self.degree[v] -= 1
+        self._pending.append((self.index[u], self.index[v], -1.0))
+        return True
+
+    def degree_centrality(self) -> dict:
+        """nx.degree_centrality와 같은 정규화: degree / (n - 1)"""
+        n = len(self.nodes)
+        scale = 1.0 / (n - 1) if n > 1 else 1.0
+        return {node: d * scale for node, d in self.degree.items()}
+
+    # =========================
+    # 반복 계산 (CSR 행렬 위에서 수행)
+    # =========================
+    def _adjacency(self) -> sparse.csr_array:
+        """
+        밀린 변경분만 희소 행렬로 만들어 기존 CSR에 더한다.
+        - 매번 networkx 그래프 전체를 CSR로 다시 변환하지 않는다.
+        - 새 노드가 생겼으면 행렬 크기를 먼저 늘린다.
+        """
+        n = len(self.nodes)
+        if self._A.shape[0] < n:
+            self._A.resize((n, n))
+        if self._pending:
+            rows, cols, vals = zip(*self._pending)
+            delta = sparse.csr_array((vals, (rows, cols)), shape=(n, n))
+            self._A = (self._A + delta).tocsr()
+            self._A.eliminate_zeros()
+            self._pending.clear()
+        return self._A
+
+    def _pagerank_iterate(self, A, x: np.ndarray, n_iter: int, tol: float) -> tuple[np.ndarray, int, float]:
+        """
+        networkx의 _pagerank_scipy와 같은 갱신식
+        - 진출 차수가 0인(dangling) 노드의 확률은 전체 노드에 균등 분배
+        반환: (벡터, 반복 수, 마지막 L1 잔차)
+        """
+        n = A.shape[0]
+        out_deg = np.asarray(A.sum(axis=1)).ravel()
+        inv_out = np.divide(1.0, out_deg, out=np.zeros(n), where=out_deg != 0)
+        dangling = out_deg == 0
+        teleport = (1.0 - self.alpha) / n
+
+        err = np.inf
+        for it in range(1, n_iter + 1):
+            x_last = x
+            x = self.alpha * ((x * inv_out) @ A + x[dangling].sum() / n) + teleport
+            err = np.abs(x - x_last).sum()
+            if err < n * tol:
+                return x, it, err
+        return x, n_iter, err
+
+    @staticmethod
+    def _eigen_iterate(A, x: np.ndarray, n_iter: int, tol: float) -> tuple[np.ndarray, int, float]:
+        """
+        networkx eigenvector_centrality와 같은 갱신식 (x <- x + A^T x, L2 정규화)
+        - 단위행렬을 더해 주기적인 그래프에서도 수렴하도록 한다.
+        """
+        n = A.shape[0]
+        err = np.inf
+        for it in range(1, n_iter + 1):
+            x_last = x
+            x = x + x @ A
+            norm = np.linalg.norm(x)
+            x = x / norm if norm > 0 else x
+            err = np.abs(x - x_last).sum()
+            if err < n * tol:
+                return x, it, err
+        return x, n_iter, err
+
+    def _extend(self, vec: np.ndarray, fill: float) -> np.ndarray:
+        """새로 생긴 노드만큼 벡터를 늘린다"""
+        missing = len(self.nodes) - len(vec)
+        if missing <= 0:
+            return vec
+        return np.concatenate([vec, np.full(missing, fill)])
+
+    # =========================
+    # 전체 재계산 / 증분 갱신
+    # =========================
+    def full_recompute(self, changed_edges: int = 0, warm: tuple | None = None) -> RefreshStats:
+        """
+        tol까지 수렴시키는 기준 계산
+        - warm=None: 균등 분포에서 출발
+        - warm=(pr, ev, pr_iters, ev_iters, seconds): refresh()가 이미 돌린 warm 결과에서 이어서,
+          남은 반복 예산(max_iter - 이미 쓴 횟수)만큼만 더 돈다
+        """
+        start = time.perf_counter()
+        changed_edges += len(self._pending)
+        A = self._adjacency()
+        n = A.shape[0]
+        if warm is None:
+            pr0, ev0, pr_used, ev_used, spent = np.full(n, 1.0 / n), np.full(n, 1.0 / n), 0, 0, 0.0
+        else:
+            pr0, ev0, pr_used, ev_used, spent = warm
+        self.pagerank, pr_it, pr_err = self._pagerank_iterate(A, pr0, max(self.max_iter - pr_used, 1), self.tol)
+        self.pagerank /= self.pagerank.sum()
+        self.eigenvector, ev_it, ev_err = self._eigen_iterate(A, ev0, max(self.max_iter - ev_used, 1), self.tol)
+        pr_it += pr_used
+        ev_it += ev_used
+        stats = RefreshStats(
+            pagerank_iters=pr_it,
+            eigen_iters=ev_it,
+            pagerank_error=pr_err / (1.0 - self.alpha),
+            eigen_error=ev_err,
+            drift=0.0,
+            full_recompute=True,
+            seconds=spent + time.perf_counter() - start,
+            changed_edges=changed_edges,
+        )
+        self._baseline = self.pagerank.copy()
+        self.history.append(stats)
+        return stats
+
+    def refresh(self) -> RefreshStats:
+        """
+        누적된 변경을 반영한다.
+        1) 이전 벡터를 시작값으로 warm_iters번까지만 반복
+        2) 오차 상한이 error_tol 이하이고 기준선 대비 drift가 max_drift 이하이면 채택
+        3) 둘 중 하나라도 넘으면 full_recompute()로 넘어가되, warm 결과에서 이어서 수렴시킨다
+        """
+        if not self._pending:
+            return self.history[-1]
+
+        start = time.perf_counter()
+        changed = len(self._pending)
+        A = self._adjacency()
+        n = A.shape[0]
+        pr0 = self._extend(self.pagerank, 1.0 / n)
+        pr0 = pr0 / pr0.sum()
+        ev0 = self._extend(self.eigenvector, 0.0)
+
+        pr, pr_it, pr_err = self._pagerank_iterate(A, pr0, self.warm_iters, self.tol)
+        ev, ev_it, ev_err = self._eigen_iterate(A, ev0, self.warm_iters, self.tol)
+        pr = pr / pr.sum()
+        pr_error = pr_err / (1.0 - self.alpha)
+        drift = np.abs(pr - self._extend(self._baseline, 0.0)).sum()
+
+        if pr_error > self.error_tol or ev_err > self.error_tol or drift > self.max_drift:
+            warm = (pr, ev, pr_it, ev_it, time.perf_counter() - start)
+            return self.full_recompute(changed_edges=changed, warm=warm)
+
+        self.pagerank, self.eigenvector = pr, ev
+        stats = RefreshStats(
+            pagerank_iters=pr_it,
+            eigen_iters=ev_it,
+            pagerank_error=pr_error,
+            eigen_error=ev_err,
+            drift=drift,
+            full_recompute=False,
+            seconds=time.perf_counter() - start,
+            changed_edges=changed,
+        )
+        self.history.append(stats)
+        return stats
+
+    def pagerank_dict(self) -> dict:
+        return dict(zip(self.nodes, self.pagerank))
+
+    def eigenvector_dict(self) -> dict:
+        return dict(zip(self.nodes, self.eigenvector))
+
+
+def simulate_email_stream(G: nx.DiGraph, n_batches: int, batch_size: int, seed: int = 42):
+    """
+    새 이메일 도착(엣지 삽입)과 오래된 관계 만료(엣지 삭제)를 흉내 내는 배치 생성기
+    - 배치마다 (추가할 엣지 목록, 삭제할 엣지 목록)을 돌려준다. 받는 쪽은 삽입 → 삭제 순서로 적용한다고 가정.
+    - 엣지 목록 스냅샷도 같은 순서로 갱신해, 이미 삭제한 엣지를 다시 고르지 않고 새로 넣은 엣지도 만료될 수 있게 한다.
+    """
+    rng = np.random.default_rng(seed)
+    nodes = np.fromiter(G.nodes(), dtype=np.int64)
+    edges = list(G.edges())
+    pos = {e: i for i, e in enumerate(edges)}
+    for _ in range(n_batches):
+        src = rng.choice(nodes, size=batch_size)
+        dst = rng.choice(nodes, size=batch_size)
+        inserts = [(int(u), int(v)) for u, v in zip(src, dst) if u != v]
+        picked = rng.choice(len(edges), size=min(batch_size // 2, len(edges)), replace=False)
+        deletes = [edges[i] for i in picked]
+        yield inserts, deletes
+
+        for e in inserts:
+            if e not in pos:
+                pos[e] = len(edges)
+                edges.append(e)
+        for e in deletes:
+            # 목록 끝 원소를 빈자리로 옮겨 O(1) 삭제
+            i = pos.pop(e)
+            last = edges.pop()
+            if i < len(edges):
+                edges[i] = last
+                pos[last] = i
+
+
+def main():
+    # 1) 데이터 로드 (10-2-2.py와 동일한 전처리)
+    matrix = mmread("email-Enron.mtx").tocsr()
+    G: nx.DiGraph = nx.from_scipy_sparse_array(matrix, create_using=nx.DiGraph())
+    largest_component_nodes = max(nx.weakly_connected_components(G), key=len)
+    G_largest = G.subgraph(largest_component_nodes).copy()
+    print_graph_info(G_largest, "Largest Connected Component")
+
+    # 2) 초기 계산
+    tracker = IncrementalCentrality(G_largest)
+    first = tracker.history[-1]
+    print(f"\n[초기 전체 계산] {first.seconds:.2f}s, PageRank {first.pagerank_iters}회, "
+          f"Eigenvector {first.eigen_iters}회 반복")
+
+    # 3) 스트림 반영: 배치마다 증분 갱신
+    print("\nbatch | +edges | -edges | PR iters | EV iters | PR error | EV error | drift    | full | sec")
+    for b, (inserts, deletes) in enumerate(simulate_email_stream(tracker.graph, n_batches=12, batch_size=2000), 1):
+        added = sum(tracker.add_edge(u, v) for u, v in inserts)
+        removed = sum(tracker.remove_edge(u, v) for u, v in deletes)
+        s = tracker.refresh()
+        print(f"{b:>5} | {added:>6} | {removed:>6} | {s.pagerank_iters:>8} | {s.eigen_iters:>8} | "
+              f"{s.pagerank_error:.2e} | {s.eigen_error:.2e} | {s.drift:.2e} | "
+              f"{'Y' if s.full_recompute else 'N':>4} | {s.seconds:.2f}")
+
+    # 4) 검증: Degree는 정확히 일치, PageRank는 networkx 결과와 비교
+    assert tracker.degree == dict(tracker.graph.degree()), "degree 불일치"
+    reference = nx.pagerank(tracker.graph, alpha=tracker.alpha, tol=tracker.tol)
+    incremental = tracker.pagerank_dict()
+    max_err = max(abs(incremental[n] - reference[n]) for n in reference)
+    print(f"\nDegree: 정확히 일치 / PageRank 최대 절대 오차(vs nx.pagerank): {max_err:.2e}")
+
+    top5 = sorted(incremental, key=incremental.get, reverse=True)[:5]
+    print("PageRank 상위 5개 노드:", top5)
+
+
+if __name__ == "__main__":
+    main()
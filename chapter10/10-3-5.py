@@ -0,0 +1,340 @@
+# File: community_detection_csr.py
+# 목적: email-Enron.mtx의 희소 인접 행렬(CSR) 위에서 바로 커뮤니티를 탐지하는 실습
+# 내용:
+#   - Label Propagation: 이웃 레이블 가중치 합이 가장 큰 레이블로 갱신
+#   - Louvain: 모듈러리티 이득이 가장 큰 커뮤니티로 이동(local move) → 커뮤니티를 노드로 묶어(aggregate) 반복
+#   - local move 단계는 노드 구간을 나눠 스레드 풀에서 병렬로 계산 (NumPy 연산은 GIL을 놓고 실행된다)
+#   - 결과는 노드별 커뮤니티 번호 배열(membership, 0이 가장 큰 커뮤니티)
+#   - membership으로 matplotlib/pyvis 색을 입히고, degree 대신 커뮤니티 기준으로 부분 그래프를 고른다
+# 의존성: numpy, scipy, networkx, matplotlib
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.io import mmread
+from scipy.sparse.csgraph import connected_components
+
+
+# =========================
+# 입력 준비
+# =========================
+def load_undirected_csr(path: str = "email-Enron.mtx") -> sparse.csr_array:
+    """
+    .mtx를 무방향 가중치 CSR로 읽는다.
+    - 패턴 행렬이면 가중치 1, 대칭화(A + A^T 후 1로 클리핑)하고 자기 루프는 제거한다.
+    """
+    A = sparse.csr_array(mmread(path), dtype=np.float64)
+    A = ((A + A.T) > 0).astype(np.float64)
+    A.setdiag(0)
+    A.eliminate_zeros()
+    return A.tocsr()
+
+
+def largest_component(A: sparse.csr_array) -> tuple[sparse.csr_array, np.ndarray]:
+    """최대 연결 성분만 남긴 CSR과 원래 노드 번호 배열을 반환"""
+    _, comp = connected_components(A, directed=False)
+    keep = np.flatnonzero(comp == np.bincount(comp).argmax())
+    return A[keep][:, keep].tocsr(), keep
+
+
+def modularity(A: sparse.csr_array, membership: np.ndarray) -> float:
+    """
+    Q = Σ_c [ in_c / 2m - (tot_c / 2m)^2 ]
+    - in_c: 커뮤니티 c 내부 인접 행렬 원소 합, tot_c: c에 속한 노드 degree 합
+    - 대칭 인접 행렬 기준이므로 networkx.community.modularity와 같은 값이 나온다.
+    """
+    coo = A.tocoo()
+    m2 = coo.data.sum()
+    if m2 == 0:
+        return 0.0
+    same = membership[coo.row] == membership[coo.col]
+    tot = np.bincount(membership, weights=np.asarray(A.sum(axis=1)).ravel())
+    return float(coo.data[same].sum() / m2 - ((tot / m2) ** 2).sum())
+
+
+def compact_membership(labels: np.ndarray) -> np.ndarray:
+    """레이블을 0..k-1로 다시 매기되, 큰 커뮤니티일수록 작은 번호를 준다"""
+    _, labels = np.unique(labels, return_inverse=True)
+    sizes = np.bincount(labels)
+    rank = np.empty_like(sizes)
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(len(sizes))
+    return rank[labels].astype(np.int32)
+
+
+# =========================
+# 공통 연산: (노드, 이웃 커뮤니티)별 가중치 합
+# =========================
+def _neighbor_label_weights(
+    A: sparse.csr_array, labels: np.ndarray, start: int, end: int, active: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    노드 구간 [start, end)에 대해 (노드, 이웃 레이블, 가중치 합) 세 배열을 돌려준다.
+    - 자기 자신으로 향하는 원소(대각)는 제외한다.
+    - active(노드별 bool)를 주면 해당 노드의 행만 계산한다.
+    - 정렬 + reduceat으로 그룹 합을 구해 파이썬 반복 없이 처리한다.
+    """
+    lo, hi = A.indptr[start], A.indptr[end]
+    src = np.repeat(np.arange(start, end), np.diff(A.indptr[start:end + 1]))
+    dst = A.indices[lo:hi]
+    w = A.data[lo:hi]
+    keep = src != dst
+    if active is not None:
+        keep &= active[src]
+    src, lab, w = src[keep], labels[dst[keep]], w[keep]
+    if len(src) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    key = src.astype(np.int64) * (int(labels.max()) + 1) + lab
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    return src[order][starts], lab[order][starts], np.add.reduceat(w[order], starts)
+
+
+def _best_per_node(node: np.ndarray, cand: np.ndarray, score: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """노드별로 score가 가장 큰 후보 하나만 고른다"""
+    if len(node) == 0:
+        return node, cand, score
+    order = np.lexsort((-score, node))
+    node, cand, score = node[order], cand[order], score[order]
+    first = np.flatnonzero(np.r_[True, node[1:] != node[:-1]])
+    return node[first], cand[first], score[first]
+
+
+def _parallel_chunks(fn, n: int, n_jobs: int, chunk_size: int) -> list:
+    """노드 구간을 chunk_size 단위로 나눠 fn(start, end)를 스레드 풀에서 실행"""
+    bounds = [(s, min(s + chunk_size, n)) for s in range(0, n, chunk_size)]
+    if n_jobs == 1 or len(bounds) == 1:
+        return [fn(s, e) for s, e in bounds]
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(lambda b: fn(*b), bounds))
+
+
+def _concat(parts: list) -> tuple[np.ndarray, ...]:
+    return tuple(np.concatenate(cols) for cols in zip(*parts))
+
+
+# =========================
+# Label Propagation
+# =========================
+def label_propagation(
+    A: sparse.csr_array,
+    max_iter: int = 50,
+    tol: float = 1e-3,
+    seed: int = 42,
+    n_jobs: int | None = None,
+    chunk_size: int = 4096,
+) -> np.ndarray:
+    """
+    가중치 Label Propagation
+    - 각 노드는 이웃 레이블별 가중치 합이 가장 큰 레이블을 택한다.
+    - 동점이면 현재 레이블을 유지하고, 그 외 동점은 난수로 깬다.
+    - 동기식 갱신의 진동(두 레이블이 번갈아 바뀌는 현상)을 막기 위해
+      한 반복에서 무작위 절반의 노드만 갱신한다.
+    - 바뀐 노드 비율이 tol 미만이면 종료
+    """
+    n = A.shape[0]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n, dtype=np.int64)
+    eps = 1e-6 * (A.data.min() if A.nnz else 1.0)
+
+    for _ in range(max_iter):
+        parts = _parallel_chunks(
+            lambda s, e: _neighbor_label_weights(A, labels, s, e), n, n_jobs, chunk_size
+        )
+        node, lab, w = _concat(parts)
+        if len(node) == 0:
+            break
+        score = w + eps * (lab == labels[node]) + 0.5 * eps * rng.random(len(w))
+        best_node, best_lab, _ = _best_per_node(node, lab, score)
+
+        update = rng.random(len(best_node)) < 0.5
+        best_node, best_lab = best_node[update], best_lab[update]
+        changed = best_lab != labels[best_node]
+        labels[best_node] = best_lab
+        if changed.sum() < tol * n:
+            break
+
+    return compact_membership(labels)
+
+
+# =========================
+# Louvain
+# =========================
+def _local_move(
+    A: sparse.csr_array,
+    comm: np.ndarray,
+    rng: np.random.Generator,
+    n_jobs: int,
+    chunk_size: int,
+    n_batches: int,
+    max_sweeps: int,
+    tol: float,
+) -> tuple[np.ndarray, bool]:
+    """
+    Louvain 1단계(local move)
+    - 노드 순서를 섞은 뒤 n_batches개 묶음으로 나누고, 묶음 안의 노드는 동시에(병렬로) 최적 이동을 계산한다.
+    - 묶음마다 커뮤니티 degree 합(tot)을 다시 계산하므로, 묶음 수가 많을수록 순차 Louvain에 가깝다.
+    - 이득(2m 배 스케일): gain(c) = k_i,c - k_i * tot_c(i 제외) / 2m
+    반환: (커뮤니티 배열, 이동이 한 번이라도 있었는지)
+    """
+    n = A.shape[0]
+    k = np.asarray(A.sum(axis=1)).ravel()
+    m2 = k.sum()
+    moved_any = False
+    q_prev = modularity(A, comm)
+
+    for _ in range(max_sweeps):
+        perm = rng.permutation(n)
+        rank = np.empty(n, dtype=np.int64)
+        rank[perm] = np.arange(n)
+        batch_of = rank * n_batches // n
+
+        for b in range(n_batches):
+            tot = np.bincount(comm, weights=k, minlength=n)
+            active = batch_of == b
+
+            def best_moves(s: int, e: int):
+                node, cand, w = _neighbor_label_weights(A, comm, s, e, active)
+                own = cand == comm[node]
+                tot_c = tot[cand] - np.where(own, k[node], 0.0)
+                gain = w - k[node] * tot_c / m2
+                best_node, best_c, best_gain = _best_per_node(node, cand, gain)
+
+                # 현재 커뮤니티에 남을 때의 이득 (현재 커뮤니티에 이웃이 없으면 k_i,c = 0)
+                current = -k[best_node] * (tot[comm[best_node]] - k[best_node]) / m2
+                own_node, own_gain = node[own], gain[own]
+                if len(own_node):
+                    idx = np.minimum(np.searchsorted(own_node, best_node), len(own_node) - 1)
+                    found = own_node[idx] == best_node
+                    current[found] = own_gain[idx[found]]
+
+                better = (best_c != comm[best_node]) & (best_gain > current + 1e-12)
+                return best_node[better], best_c[better]
+
+            moves = _parallel_chunks(best_moves, n, n_jobs, chunk_size)
+            node, target = _concat(moves)
+            if len(node):
+                comm[node] = target
+                moved_any = True
+
+        q = modularity(A, comm)
+        if q - q_prev < tol:
+            break
+        q_prev = q
+
+    return comm, moved_any
+
+
+def louvain(
+    A: sparse.csr_array,
+    max_levels: int = 10,
+    max_sweeps: int = 20,
+    n_batches: int = 8,
+    tol: float = 1e-6,
+    seed: int = 42,
+    n_jobs: int | None = None,
+    chunk_size: int = 4096,
+) -> np.ndarray:
+    """
+    Louvain 모듈러리티 최적화
+    1) local move: 노드를 이웃 커뮤니티로 옮겨 모듈러리티를 높인다 (병렬 묶음 처리)
+    2) aggregate: 커뮤니티를 하나의 노드로 묶은 그래프 A' = S^T A S 를 만든다
+    3) 더 이상 이동이 없을 때까지 1)~2) 반복
+    반환: 원래 노드 기준 membership 배열
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    rng = np.random.default_rng(seed)
+    membership = np.arange(A.shape[0], dtype=np.int64)
+    level_graph = A
+
+    for _ in range(max_levels):
+        comm = np.arange(level_graph.shape[0], dtype=np.int64)
+        comm, moved = _local_move(level_graph, comm, rng, n_jobs, chunk_size, n_batches, max_sweeps, tol)
+        if not moved:
+            break
+        _, comm = np.unique(comm, return_inverse=True)
+        membership = comm[membership]
+
+        n_comm = int(comm.max()) + 1
+        S = sparse.csr_array(
+            (np.ones(len(comm)), (np.arange(len(comm)), comm)),
+            shape=(len(comm), n_comm),
+        )
+        level_graph = (S.T @ level_graph @ S).tocsr()
+
+    return compact_membership(membership)
+
+
+# =========================
+# 시각화 연계
+# =========================
+def community_colors(membership: np.ndarray, cmap: str = "tab20") -> list[str]:
+    """membership → HEX 색 목록 (pyvis add_node(color=...)나 matplotlib node_color에 그대로 사용)"""
+    palette = plt.get_cmap(cmap)
+    return [mcolors.to_hex(palette(c % palette.N)) for c in membership]
+
+
+def community_focus_nodes(
+    A: sparse.csr_array, membership: np.ndarray, community: int, top_k: int | None = None
+) -> np.ndarray:
+    """
+    degree 상위 대신 '특정 커뮤니티'로 부분 그래프 노드를 고른다.
+    - top_k를 주면 커뮤니티 안에서 degree가 높은 노드 top_k개만 남긴다.
+    """
+    members = np.flatnonzero(membership == community)
+    if top_k is None or top_k >= len(members):
+        return members
+    deg = np.diff(A.indptr)[members]
+    return members[np.argsort(-deg, kind="stable")[:top_k]]
+
+
+def main():
+    # 1) CSR 로드 + 최대 연결 성분
+    A_full = load_undirected_csr("email-Enron.mtx")
+    A, node_ids = largest_component(A_full)
+    print(f"LCC: nodes={A.shape[0]:,}, edges={A.nnz // 2:,}")
+
+    # 2) 두 알고리즘 실행
+    results = {}
+    for name, fn in [("Label Propagation", label_propagation), ("Louvain", louvain)]:
+        start = time.perf_counter()
+        membership = fn(A)
+        elapsed = time.perf_counter() - start
+        sizes = np.bincount(membership)
+        results[name] = membership
+        print(f"\n---- {name} ----")
+        print(f"시간: {elapsed:.2f}s, 커뮤니티 수: {len(sizes):,}, 모듈러리티: {modularity(A, membership):.4f}")
+        print(f"상위 5개 커뮤니티 크기: {sizes[:5].tolist()}")
+
+    # 3) 커뮤니티 기준 부분 그래프: 가장 큰 두 커뮤니티에서 degree 상위 노드만 골라 그리기
+    membership = results["Louvain"]
+    focus = np.concatenate([community_focus_nodes(A, membership, c, top_k=60) for c in (0, 1)])
+    sub = A[focus][:, focus]
+    G_focus = nx.from_scipy_sparse_array(sub)
+    G_focus = nx.relabel_nodes(G_focus, dict(enumerate(node_ids[focus])))
+    print(f"\nFocus subgraph (community 0, 1): nodes={G_focus.number_of_nodes()}, edges={G_focus.number_of_edges()}")
+
+    colors = community_colors(membership[focus])
+    pos = nx.spring_layout(G_focus, seed=42)
+    plt.figure(figsize=(8, 6))
+    nx.draw_networkx_nodes(G_focus, pos, node_size=25, node_color=colors, alpha=0.9)
+    nx.draw_networkx_edges(G_focus, pos, width=0.2, alpha=0.4)
+    plt.title("Top-degree nodes of the two largest Louvain communities")
+    plt.axis("off")
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+# File: graph_pipeline_benchmark.py
+# 목적: chapter10 분석 흐름(load → LCC → degree top-k → centrality → layout → render)의 단계별 소요 시간 측정
+# 내용:
+#   - 입력: email-Enron.mtx + 합성 확장 그래프(R-MAT, Barabási–Albert; Enron 대비 10배/100배)
+#   - 백엔드: networkx(교재 방식) vs scipy CSR(희소 행렬 직접 연산), python-igraph는 설치돼 있으면 함께 비교
+#   - 측정: 단계별 wall time, 단계 종료 시점까지의 peak RSS, 전체 합계 → JSON 결과 파일
+#   - 이전 결과(baseline) JSON과 비교해 느려진 단계를 회귀(regression)로 표시
+#   - (그래프, 백엔드) 조합마다 별도 프로세스에서 실행해 peak RSS가 서로 섞이지 않게 한다
+# 의존성: numpy, scipy, networkx, matplotlib (선택: python-igraph)
+#
+# 사용 예:
+#   python 10-4-4.py                                  # Enron + 10배 합성 그래프
+#   python 10-4-4.py --scales 1 10 100 --backends scipy
+#   python 10-4-4.py --baseline bench_prev.json       # 회귀 검사 (느려지면 종료 코드 1)
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import get_context
+
+import numpy as np
+from scipy import sparse
+from scipy.io import mmread
+from scipy.sparse.csgraph import connected_components
+
+ENRON_PATH = "email-Enron.mtx"
+TOP_K = 1000                # 10-2-2.py의 top_k와 동일
+MAX_NX_EDGES = 2_000_000    # 이보다 큰 그래프는 networkx 백엔드를 건너뛴다 (엣지당 수백 byte → 수 GB)
+
+try:
+    import igraph  # noqa: F401
+    HAS_IGRAPH = True
+except ImportError:
+    HAS_IGRAPH = False
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS(MB). Linux는 KB, macOS는 byte 단위로 돌려준다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """with timer.stage("name"): ... 형태로 단계별 시간과 peak RSS를 기록"""
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        yield
+        self.stages[name] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+
+
+# =========================
+# 합성 그래프 생성
+# =========================
+def rmat_graph(n_nodes: int, n_edges: int, a=0.57, b=0.19, c=0.19, seed: int = 42) -> sparse.csr_array:
+    """
+    R-MAT 생성기 (Graph500 기본 확률)
+    - 노드 수는 2의 거듭제곱으로 올림, 각 비트마다 4분면을 확률 (a, b, c, d)로 고른다
+    - 반환: 자기 루프를 뺀 대칭 패턴 CSR
+    """
+    rng = np.random.default_rng(seed)
+    scale = int(np.ceil(np.log2(max(n_nodes, 2))))
+    rows = np.zeros(n_edges, dtype=np.int64)
+    cols = np.zeros(n_edges, dtype=np.int64)
+    for bit in range(scale):
+        r = rng.random(n_edges)
+        right = (r >= a) & (r < a + b) | (r >= a + b + c)
+        down = r >= a + b
+        rows |= down.astype(np.int64) << bit
+        cols |= right.astype(np.int64) << bit
+    return _symmetric_csr(rows, cols, 1 << scale)
+
+
+def barabasi_albert_graph(n_nodes: int, m: int, seed: int = 42, batch: int = 4096) -> sparse.csr_array:
+    """
+    Barabási–Albert 선호적 연결(preferential attachment)을 묶음 단위로 근사 생성
+    - 엣지 끝점 배열에서 균등 추출 = degree 비례 추출
+    - batch개 노드를 한꺼번에 붙이므로 같은 묶음끼리는 서로를 고르지 않는다 (큰 그래프에서 영향 미미)
+    """
+    rng = np.random.default_rng(seed)
+    endpoints = np.empty(2 * m * n_nodes, dtype=np.int64)
+    rows_all, cols_all = [], []
+    # 시드: m+1개 노드 완전 그래프
+    seed_nodes = np.arange(m + 1)
+    r0, c0 = np.triu_indices(m + 1, k=1)
+    rows_all.append(seed_nodes[r0])
+    cols_all.append(seed_nodes[c0])
+    filled = 2 * len(r0)
+    endpoints[:filled] = np.concatenate([r0, c0])
+
+    for start in range(m + 1, n_nodes, batch):
+        new = np.arange(start, min(start + batch, n_nodes))
+        targets = endpoints[rng.integers(0, filled, size=(len(new), m))]
+        src = np.repeat(new, m)
+        dst = targets.ravel()
+        rows_all.append(src)
+        cols_all.append(dst)
+        endpoints[filled:filled + 2 * len(src)] = np.concatenate([src, dst])
+        filled += 2 * len(src)
+
+    return _symmetric_csr(np.concatenate(rows_all), np.concatenate(cols_all), n_nodes)
+
+
+def _symmetric_csr(rows: np.ndarray, cols: np.ndarray, n: int) -> sparse.csr_array:
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    A = sparse.csr_array(
+        (np.ones(2 * len(rows), dtype=np.float32), (np.r_[rows, cols], np.r_[cols, rows])),
+        shape=(n, n),
+    )
+    A.sum_duplicates()
+    A.data[:] = 1.0
+    return A
+
+
+def prepare_inputs(scales: list[int], models: list[str], workdir: str) -> list[tuple[str, str]]:
+    """
+    벤치마크 입력 목록 [(이름, 파일 경로)]
+    - scale 1은 원본 Enron, 나머지는 합성 그래프를 .npz로 저장해 load 단계를 공정하게 비교
+    """
+    base = mmread(ENRON_PATH).tocsr()
+    n0, e0 = base.shape[0], base.nnz // 2
+    inputs = []
+    for s in scales:
+        if s == 1:
+            inputs.append(("enron", ENRON_PATH))
+            continue
+        for model in models:
+            if model == "rmat":
+                A = rmat_graph(n0 * s, e0 * s)
+            else:
+                A = barabasi_albert_graph(n0 * s, m=max(1, round(e0 / n0)))
+            path = os.path.join(workdir, f"{model}_x{s}.npz")
+            sparse.save_npz(path, A)
+            inputs.append((f"{model}_x{s}", path))
+    return inputs
+
+
+# =========================
+# 백엔드별 파이프라인
+# =========================
+def _load_csr(path: str) -> sparse.csr_array:
+    if path.endswith(".npz"):
+        return sparse.csr_array(sparse.load_npz(path))
+    return sparse.csr_array(mmread(path).tocsr())
+
+
+def _render_png(graph_nx, pos) -> int:
+    """
+    focus 부분 그래프를 그려 PNG 바이트 수를 반환 (화면 출력 없이 메모리에 저장)
+    - arrows=False: DiGraph 엣지를 화살표 패치 대신 LineCollection 하나로 그린다.
+      (화살표는 엣지마다 패치를 만들어 밀집 부분 그래프에서 수십 분이 걸린다)
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    nx.draw_networkx_nodes(graph_nx, pos, ax=ax, node_size=20, node_color="#1f78b4", alpha=0.8)
+    nx.draw_networkx_edges(graph_nx, pos, ax=ax, width=0.2, alpha=0.4, arrows=False)
+    ax.axis("off")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100)
+    plt.close(fig)
+    return buf.tell()
+
+
+def run_networkx(path: str, timer: StageTimer) -> dict:
+    """10-2-2.py / 10-2-4.py와 같은 networkx 방식"""
+    import networkx as nx
+
+    with timer.stage("load"):
+        G = nx.from_scipy_sparse_array(_load_csr(path), create_using=nx.DiGraph())
+    with timer.stage("lcc"):
+        G_largest = G.subgraph(max(nx.weakly_connected_components(G), key=len)).copy()
+    with timer.stage("degree_topk"):
+        degree_scores = dict(G_largest.degree())
+        top_nodes = sorted(degree_scores, key=degree_scores.get, reverse=True)[:TOP_K]
+        G_focus = G_largest.subgraph(top_nodes).copy()
+    with timer.stage("centrality"):
+        pr = nx.pagerank(G_largest, alpha=0.85)
+    with timer.stage("layout"):
+        pos = nx.spring_layout(G_focus, seed=42)
+    with timer.stage("render"):
+        _render_png(G_focus, pos)
+    return {"nodes": G.number_of_nodes(), "edges": G.number_of_edges(), "top_pagerank": max(pr, key=pr.get)}
+
+
+def _pagerank_csr(A: sparse.csr_array, alpha: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+    """networkx _pagerank_scipy와 같은 갱신식을 CSR에서 직접 수행"""
+    n = A.shape[0]
+    out_deg = np.asarray(A.sum(axis=1)).ravel()
+    inv_out = np.divide(1.0, out_deg, out=np.zeros(n), where=out_deg != 0)
+    dangling = out_deg == 0
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * ((x * inv_out) @ A + x[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            break
+    return x / x.sum()
+
+
+def run_scipy(path: str, timer: StageTimer) -> dict:
+    """같은 단계를 CSR 배열 연산으로 수행 (networkx 그래프는 focus 부분 그래프에만 사용)"""
+    import networkx as nx
+
+    with timer.stage("load"):
+        A = _load_csr(path)
+    with timer.stage("lcc"):
+        _, comp = connected_components(A, directed=True, connection="weak")
+        keep = np.flatnonzero(comp == np.bincount(comp).argmax())
+        A_lcc = A[keep][:, keep].tocsr()
+    with timer.stage("degree_topk"):
+        # DiGraph.degree()와 같이 진입 + 진출 차수
+        degree = np.diff(A_lcc.indptr) + np.bincount(A_lcc.indices, minlength=A_lcc.shape[0])
+        k = min(TOP_K, len(degree))
+        top = np.argpartition(-degree, k - 1)[:k]
+        top = top[np.argsort(-degree[top], kind="stable")]
+        G_focus = nx.from_scipy_sparse_array(A_lcc[top][:, top], create_using=nx.DiGraph())
+    with timer.stage("centrality"):
+        pr = _pagerank_csr(A_lcc)
+    with timer.stage("layout"):
+        pos = nx.spring_layout(G_focus, seed=42)
+    with timer.stage("render"):
+        _render_png(G_focus, pos)
+    return {"nodes": A.shape[0], "edges": int(A.nnz), "top_pagerank": int(keep[pr.argmax()])}
+
+
+def run_igraph(path: str, timer: StageTimer) -> dict:
+    """python-igraph(C 구현) 백엔드"""
+    import igraph as ig
+    import networkx as nx
+
+    with timer.stage("load"):
+        coo = _load_csr(path).tocoo()
+        g = ig.Graph(n=coo.shape[0], edges=np.column_stack([coo.row, coo.col]).tolist(), directed=True)
+        g.vs["name"] = list(range(g.vcount()))  # giant()가 번호를 다시 매기므로 원래 노드 번호를 속성으로 보존
+    with timer.stage("lcc"):
+        g_lcc = g.connected_components(mode="weak").giant()
+    with timer.stage("degree_topk"):
+        degree = np.asarray(g_lcc.degree())
+        top = np.argsort(-degree, kind="stable")[:TOP_K]
+        sub = g_lcc.induced_subgraph(top.tolist())
+        G_focus = nx.DiGraph(sub.get_edgelist())
+        G_focus.add_nodes_from(range(sub.vcount()))
+    with timer.stage("centrality"):
+        pr = np.asarray(g_lcc.pagerank(damping=0.85))
+    with timer.stage("layout"):
+        pos = nx.spring_layout(G_focus, seed=42)
+    with timer.stage("render"):
+        _render_png(G_focus, pos)
+    # 다른 백엔드와 같은 원래 노드 번호로 보고
+    return {"nodes": g.vcount(), "edges": g.ecount(), "top_pagerank": int(g_lcc.vs[int(pr.argmax())]["name"])}
+
+
+BACKENDS = {"networkx": run_networkx, "scipy": run_scipy, "igraph": run_igraph}
+
+
+def _run_one(graph_name: str, path: str, backend: str) -> dict:
+    """별도 프로세스에서 실행되는 한 번의 측정"""
+    timer = StageTimer()
+    start = time.perf_counter()
+    info = BACKENDS[backend](path, timer)
+    return {
+        "graph": graph_name,
+        "backend": backend,
+        **info,
+        "stages": timer.stages,
+        "total_seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+# =========================
+# 결과 저장 / 회귀 비교
+# =========================
+def compare_with_baseline(results: list[dict], baseline: dict, threshold: float, min_seconds: float = 0.05) -> list[str]:
+    """
+    같은 (graph, backend, stage)끼리 비교해 threshold배 이상 느려진 항목을 돌려준다.
+    - 너무 짧은 단계(min_seconds 미만)는 측정 잡음이 커서 제외
+    """
+    prev = {(r["graph"], r["backend"]): r for r in baseline.get("runs", [])}
+    regressions = []
+    for r in results:
+        old = prev.get((r["graph"], r["backend"]))
+        if old is None:
+            continue
+        for stage, cur in r["stages"].items():
+            before = old["stages"].get(stage, {}).get("seconds")
+            if before is None or max(before, cur["seconds"]) < min_seconds:
+                continue
+            if cur["seconds"] > before * threshold:
+                regressions.append(
+                    f"{r['graph']}/{r['backend']}/{stage}: {before:.3f}s -> {cur['seconds']:.3f}s"
+                )
+    return regressions
+
+
+def print_table(results: list[dict]) -> None:
+    stages = ["load", "lcc", "degree_topk", "centrality", "layout", "render"]
+    header = f"{'graph':<12} {'backend':<9} " + " ".join(f"{s:>11}" for s in stages) + f" {'total':>8} {'RSS(MB)':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        cells = " ".join(f"{r['stages'][s]['seconds']:>11.3f}" for s in stages)
+        print(f"{r['graph']:<12} {r['backend']:<9} {cells} {r['total_seconds']:>8.2f} {r['peak_rss_mb']:>8.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="chapter10 graph pipeline benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Enron 대비 배율 (1=원본)")
+    parser.add_argument("--models", nargs="+", default=["rmat", "ba"], choices=["rmat", "ba"])
+    parser.add_argument("--backends", nargs="+", default=["networkx", "scipy", "igraph"], choices=list(BACKENDS))
+    parser.add_argument("--max-nx-edges", type=int, default=MAX_NX_EDGES, help="networkx 백엔드를 돌릴 최대 엣지 수")
+    parser.add_argument("--output", default="graph_benchmark.json")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="이 배수 이상 느려지면 회귀")
+    args = parser.parse_args(argv)
+
+    backends = [b for b in args.backends if b != "igraph" or HAS_IGRAPH]
+    if "igraph" in args.backends and not HAS_IGRAPH:
+        print("python-igraph 미설치: igraph 백엔드는 건너뜀")
+
+    results = []
+    ctx = get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir:
+        for graph_name, path in prepare_inputs(args.scales, args.models, workdir):
+            n_edges = _load_csr(path).nnz
+            for backend in backends:
+                if backend == "networkx" and n_edges > args.max_nx_edges:
+                    print(f"[skip] {graph_name}/networkx: edges={n_edges:,} > {args.max_nx_edges:,}")
+                    continue
+                print(f"[run ] {graph_name}/{backend}")
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    results.append(pool.submit(_run_one, graph_name, path, backend).result())
+
+    print()
+    print_table(results)
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "top_k": TOP_K,
+        },
+        "runs": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\nSaved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n회귀 감지 ({args.threshold:.2f}배 이상 느려짐):")
+            for line in regressions:
+                print(" -", line)
+            return 1
+        print("\n회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# File: fitted_imputer_persisted.py
+# 목적: 결측치 대체 통계를 '한 번 학습(fit) → 저장 → 매 배치에 적용(transform)'으로 분리
+# 내용:
+#   - 4-2-5.py(simple_impute_mean_mode, knn_impute, iterative_impute)와
+#     4-2-6.py(naive_impute, domain_impute)는 호출할 때마다 fit_transform을 하고 df.copy()를 2~3번 한다.
+#     → 매일 들어오는 채점 배치마다 통계를 다시 계산하고, 결측이 없는 컬럼까지 복사된다.
+#   - FittedImputer
+#       fit: 학습 데이터에서 컬럼별 평균/중앙값/최빈값(또는 Iterative/KNN 모델)을 한 번만 계산
+#       save / load: 통계와 모델을 pickle 파일로 저장/복원
+#       transform: 결측(또는 도메인 규칙상 결측인 0)이 있는 컬럼만 새로 만들어 바꿔 끼운다.
+#                  나머지 컬럼은 얕은 복사(df.copy(deep=False))로 원본 데이터를 그대로 공유.
+#   - 프리셋: mean_mode(4-2-5 단순 대체), naive / domain(4-2-6 접근 A/B), iterative, knn(4-2-5)
+# 의존성: pandas>=1.5, numpy, scikit-learn
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_iterative_imputer  # IterativeImputer 사용 가능하게 함
+from sklearn.impute import IterativeImputer, KNNImputer
+from sklearn.linear_model import BayesianRidge
+
+STRATEGIES = ("mean", "median", "most_frequent")
+MODELS = ("iterative", "knn")
+
+
+def _most_frequent(s: pd.Series):
+    """SimpleImputer(strategy='most_frequent')와 같은 규칙: 최빈값이 여럿이면 가장 작은 값"""
+    counts = s.value_counts(dropna=True)
+    if counts.empty:
+        return np.nan
+    return min(counts.index[counts.to_numpy() == counts.iloc[0]])
+
+
+class FittedImputer:
+    """
+    한 번 학습하고 여러 배치에 적용하는 대체기
+    - num_strategy: 수치형 컬럼 통계 ("mean" / "median" / "most_frequent") 또는 모델 ("iterative" / "knn")
+    - cat_strategy: 범주형(비수치형) 컬럼 통계 (보통 "most_frequent")
+    - strategies: 컬럼별 개별 지정 {컬럼: 전략} (num/cat 기본값보다 우선, 모델 전략 제외)
+    - zero_is_missing: 0을 미기록으로 보는 컬럼 (4-2-6.py 도메인 규칙)
+    - exclude: 건드리지 않을 컬럼 (예: id)
+    """
+
+    def __init__(
+        self,
+        num_strategy: str = "mean",
+        cat_strategy: str = "most_frequent",
+        strategies: dict[str, str] | None = None,
+        zero_is_missing: list[str] | None = None,
+        exclude: list[str] | None = None,
+        n_neighbors: int = 3,
+        random_state: int = 42,
+    ):
+        if num_strategy not in STRATEGIES + MODELS:
+            raise ValueError(f"지원하지 않는 num_strategy: {num_strategy}")
+        if cat_strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 cat_strategy: {cat_strategy}")
+        self.num_strategy = num_strategy
+        self.cat_strategy = cat_strategy
+        self.strategies = dict(strategies or {})
+        self.zero_is_missing = list(zero_is_missing or [])
+        self.exclude = list(exclude or [])
+        self.n_neighbors = n_neighbors
+        self.random_state = random_state
+        self.statistics_: dict[str, object] = {}
+        self.model_ = None
+        self.model_cols_: list[str] = []
+
+    # ---------- 프리셋 ----------
+    @classmethod
+    def mean_mode(cls, **kw) -> "FittedImputer":
+        """4-2-5.py simple_impute_mean_mode: 수치형=평균, 범주형=최빈값"""
+        return cls(num_strategy="mean", exclude=kw.pop("exclude", ["id"]), **kw)
+
+    @classmethod
+    def iterative(cls, **kw) -> "FittedImputer":
+        """4-2-5.py iterative_impute: BayesianRidge IterativeImputer + 범주형 최빈값"""
+        return cls(num_strategy="iterative", exclude=kw.pop("exclude", ["id"]), **kw)
+
+    @classmethod
+    def knn(cls, n_neighbors: int = 3, **kw) -> "FittedImputer":
+        """4-2-5.py knn_impute: KNNImputer + 범주형 최빈값"""
+        return cls(num_strategy="knn", n_neighbors=n_neighbors, exclude=kw.pop("exclude", ["id"]), **kw)
+
+    @classmethod
+    def naive(cls, numeric_cols: list[str], other_cols: list[str], **kw) -> "FittedImputer":
+        """4-2-6.py 접근 A: 연속형=중앙값, 이진/범주형=최빈값 (0은 값으로 간주)"""
+        strategies = {c: "median" for c in numeric_cols} | {c: "most_frequent" for c in other_cols}
+        exclude = kw.pop("exclude", None)
+        return cls(strategies=strategies, exclude=exclude, **kw)
+
+    @classmethod
+    def domain(cls, numeric_cols: list[str], other_cols: list[str], zero_is_missing: list[str], **kw) -> "FittedImputer":
+        """4-2-6.py 접근 B: zero_is_missing 컬럼의 0을 결측으로 본 뒤 중앙값/최빈값"""
+        return cls.naive(numeric_cols, other_cols, zero_is_missing=zero_is_missing, **kw)
+
+    # ---------- 학습 ----------
+    def _missing_mask(self, s: pd.Series) -> pd.Series:
+        mask = s.isna()
+        if s.name in self.zero_is_missing:
+            mask |= s == 0
+        return mask
+
+    def _plan(self, df: pd.DataFrame) -> tuple[dict[str, str], list[str]]:
+        """컬럼 → 통계 전략, 모델이 맡을 수치형 컬럼"""
+        plan: dict[str, str] = {}
+        model_cols: list[str] = []
+        explicit = bool(self.strategies)
+        for c in df.columns:
+            if c in self.exclude:
+                continue
+            if c in self.strategies:
+                plan[c] = self.strategies[c]
+            elif explicit:
+                continue  # 컬럼별 지정을 쓰면 지정된 컬럼만 대체 (4-2-6.py처럼 patient_id 등은 그대로)
+            elif pd.api.types.is_numeric_dtype(df[c]):
+                if self.num_strategy in MODELS:
+                    model_cols.append(c)
+                else:
+                    plan[c] = self.num_strategy
+            else:
+                plan[c] = self.cat_strategy
+        return plan, model_cols
+
+    def fit(self, df: pd.DataFrame) -> "FittedImputer":
+        """컬럼별 통계와(필요하면) 모델을 학습 — 원본 DataFrame은 복사하지 않는다"""
+        self._fit_statistics(df)
+        if self.model_cols_:
+            self.model_ = self._new_model().fit(self._model_block(df))
+        return self
+
+    def _fit_statistics(self, df: pd.DataFrame) -> None:
+        plan, self.model_cols_ = self._plan(df)
+        self.model_ = None
+        self.statistics_ = {}
+        for c, strategy in plan.items():
+            s = df[c]
+            valid = s[~self._missing_mask(s)]
+            if strategy == "mean":
+                self.statistics_[c] = float(valid.mean())
+            elif strategy == "median":
+                self.statistics_[c] = float(valid.median())
+            else:
+                self.statistics_[c] = _most_frequent(valid)
+
+    def _new_model(self):
+        if self.num_strategy == "iterative":
+            return IterativeImputer(
+                estimator=BayesianRidge(), max_iter=10, random_state=self.random_state, sample_posterior=True
+            )
+        return KNNImputer(n_neighbors=self.n_neighbors)
+
+    def _model_block(self, df: pd.DataFrame) -> np.ndarray:
+        block = df[self.model_cols_].to_numpy(dtype=np.float64, na_value=np.nan)
+        for j, c in enumerate(self.model_cols_):
+            if c in self.zero_is_missing:
+                block[block[:, j] == 0, j] = np.nan
+        return block
+
+    # ---------- 적용 ----------
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        학습한 통계로 결측 채우기
+        - 결측이 없는 컬럼은 새로 만들지 않는다 (얕은 복사로 원본과 공유)
+        - inplace=True면 df 자체의 컬럼을 바꿔 끼운다
+        """
+        out = self._fill_statistics(df, inplace)
+        if self.model_ is not None:
+            block = self._model_block(out)
+            rows = np.isnan(block).any(axis=1)
+            if rows.any():
+                filled = block.copy()
+                filled[rows] = self.model_.transform(block[rows])
+                self._assign_model_cols(out, block, filled)
+        return out
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        학습 데이터에는 모델의 fit_transform을 그대로 쓴다.
+        (sample_posterior=True인 IterativeImputer는 fit 후 transform을 다시 부르면 새 표본을 뽑으므로
+         4-2-5.py iterative_impute와 같은 값이 되려면 fit_transform 한 번이어야 한다)
+        """
+        self._fit_statistics(df)
+        out = self._fill_statistics(df, inplace=False)
+        if self.model_cols_:
+            block = self._model_block(out)
+            self.model_ = self._new_model()
+            filled = self.model_.fit_transform(block)
+            self._assign_model_cols(out, block, filled)
+        return out
+
+    def _fill_statistics(self, df: pd.DataFrame, inplace: bool) -> pd.DataFrame:
+        out = df if inplace else df.copy(deep=False)
+        for c, value in self.statistics_.items():
+            if c not in out.columns:
+                continue
+            s = out[c]
+            mask = self._missing_mask(s)
+            if mask.any():
+                out[c] = s.mask(mask, value)
+        return out
+
+    def _assign_model_cols(self, out: pd.DataFrame, block: np.ndarray, filled: np.ndarray) -> None:
+        """결측 행만 모델 결과로 바꾸고, 결측이 있던 컬럼만 바꿔 끼운다"""
+        rows = np.isnan(block).any(axis=1)
+        for j, c in enumerate(self.model_cols_):
+            if np.isnan(block[:, j]).any() or c in self.zero_is_missing:
+                out[c] = np.where(rows, filled[:, j], block[:, j])
+
+    # ---------- 저장 ----------
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str) -> "FittedImputer":
+        with open(path, "rb") as f:
+            imputer = pickle.load(f)
+        if not isinstance(imputer, FittedImputer):
+            raise TypeError(f"{path}: FittedImputer가 아닙니다.")
+        return imputer
+
+
+# =========================
+# 실습용 데이터 (4-2-6.py와 같은 환자 데이터)
+# =========================
+def make_dataset() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "patient_id": [101, 102, 103, 104, 105, 106, 107, 108],
+            "sbp":        [120, 0,   138, 145, np.nan, 132, 0,   118],
+            "dbp":        [80,  0,   92,  95,  88,     np.nan, 0,   76],
+            "glucose":    [98,  0,   np.nan, 115, 102, 0,     140, np.nan],
+            "symptom_present": [0, 1, 0, 1, 0, 0, 1, np.nan],
+            "diagnosis":  ["Hypertension", None, "Diabetes", "Hypertension",
+                           "None", None, "Diabetes", "None"],
+        }
+    )
+
+
+def make_batch(n: int, seed: int) -> pd.DataFrame:
+    """채점 배치: 결측은 sbp/glucose/diagnosis에만, 나머지 컬럼은 완전"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "patient_id": np.arange(n),
+        "sbp": rng.normal(130, 15, n).round(),
+        "dbp": rng.normal(85, 10, n).round(),
+        "glucose": rng.normal(110, 20, n).round(),
+        "symptom_present": rng.integers(0, 2, n).astype(float),
+        "diagnosis": rng.choice(np.array(["Hypertension", "Diabetes", "None"], dtype=object), n),
+    })
+    df.loc[rng.random(n) < 0.05, "sbp"] = 0
+    df.loc[rng.random(n) < 0.05, "glucose"] = np.nan
+    df.loc[rng.random(n) < 0.05, "diagnosis"] = None
+    return df
+
+
+def main():
+    numeric_cols = ["sbp", "dbp", "glucose"]
+    other_cols = ["symptom_present", "diagnosis"]
+    train = make_dataset()
+
+    # 1) 학습 → 저장 → 복원
+    imputer = FittedImputer.domain(numeric_cols, other_cols, zero_is_missing=numeric_cols).fit(train)
+    print("학습된 통계:", imputer.statistics_, "\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "domain_imputer.pkl")
+        imputer.save(path)
+        imputer = FittedImputer.load(path)
+
+    print("---------- 학습 데이터에 적용 (4-2-6.py domain_impute와 같은 값) ---------\n")
+    print(f"{imputer.transform(train)}\n")
+
+    # 2) 배치마다 다시 학습(fit_transform) vs 저장된 통계로 transform
+    batches = [make_batch(20_000, seed) for seed in range(30)]
+    start = time.perf_counter()
+    for b in batches:
+        FittedImputer.domain(numeric_cols, other_cols, zero_is_missing=numeric_cols).fit_transform(b.copy())
+    refit_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for b in batches:
+        out = imputer.transform(b)
+    transform_sec = time.perf_counter() - start
+    shared = np.shares_memory(out["dbp"].to_numpy(), batches[-1]["dbp"].to_numpy())
+    print(f"배치 30개 × 20,000행: 매번 fit_transform {refit_sec:.2f}s / 저장된 통계로 transform {transform_sec:.2f}s")
+    print(f"결측 없는 컬럼(dbp)은 원본과 메모리 공유: {shared}\n")
+
+    # 3) 4-2-5.py iterative_impute와 같은 결과인지 확인 (학습 데이터에는 fit_transform)
+    spec = importlib.util.spec_from_file_location("imputation_demo", os.path.join(os.path.dirname(__file__), "4-2-5.py"))
+    demo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(demo)
+    sample = demo.normalize_missing(demo.make_sample_dataframe())
+    pd.testing.assert_frame_equal(FittedImputer.iterative().fit_transform(sample), demo.iterative_impute(sample))
+    print("4-2-5.py iterative_impute와 fit_transform 결과 일치\n")
+
+    # 4) Iterative 모델도 한 번만 학습해 재사용
+    it = FittedImputer.iterative(exclude=["patient_id"]).fit(batches[0])
+    print("Iterative 모델 적용 후 결측 수:", int(it.transform(batches[1]).isna().sum().sum()))
+
+
+if __name__ == "__main__":
+    main()
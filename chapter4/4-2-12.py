@@ -0,0 +1,237 @@
+# File: domain_missing_rules.py
+# 목적: 도메인 결측 규칙(센티널 값, 불가능한 범위, 0=미기록)을 한 곳에 선언하고 한 번에 적용
+# 내용:
+#   - 4-2-6.py의 domain_mark_missing은 df.copy() 후 zero_is_missing 컬럼마다
+#     work.loc[work[col] == 0, col] = np.nan 을 하나씩 실행한다.
+#   - chapter7의 AirQuality 스크립트들은 replace(-200, np.nan)을 각자 코드에 박아 두었다.
+#   - MissingRuleEngine
+#       1) 규칙 선언: sentinel(값 목록), out_of_range(하한/상한), zero_as_missing
+#          (columns=None이면 '모든 수치형 컬럼')
+#       2) 컴파일: 같은 규칙 조합을 가진 수치형 컬럼끼리 묶어 2차원 블록 하나로 처리
+#       3) 적용: 블록마다 규칙 마스크를 OR로 합쳐 NaN을 한 번에 쓴다.
+#          값이 바뀐 컬럼만 새 배열로 바꿔 끼우고 나머지는 원본을 공유(얕은 복사) — inplace=True면 df 자체를 수정
+#       4) 리포트: 규칙 × 컬럼별로 결측 처리한 개수 (한 값이 여러 규칙에 걸리면 먼저 선언한 규칙에 센다)
+# 의존성: pandas>=1.5, numpy
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+KINDS = ("sentinel", "range", "zero")
+
+
+@dataclass(frozen=True)
+class MissingRule:
+    """
+    결측 규칙 하나
+    - kind: "sentinel"(values와 같으면 결측) / "range"(low 미만 또는 high 초과면 결측) / "zero"(0이면 결측)
+    - columns: 적용 컬럼 (None이면 모든 수치형 컬럼)
+    """
+    name: str
+    kind: str
+    columns: Optional[tuple[str, ...]] = None
+    values: tuple = ()
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    def mask(self, a: np.ndarray) -> np.ndarray:
+        """수치형 블록(2차원 float 배열) → 결측으로 볼 위치"""
+        if self.kind == "sentinel":
+            if len(self.values) > 8:
+                return np.isin(a, self.values)
+            m = a == self.values[0]  # 값이 몇 개뿐이면 비교를 OR로 잇는 편이 isin(정렬/복사)보다 빠르다
+            for v in self.values[1:]:
+                m |= a == v
+            return m
+        if self.kind == "zero":
+            return a == 0
+        m = np.zeros(a.shape, dtype=bool)
+        if self.low is not None:
+            m |= a < self.low
+        if self.high is not None:
+            m |= a > self.high
+        return m
+
+    def mask_series(self, s: pd.Series) -> np.ndarray:
+        """비수치형 컬럼: 센티널(문자열 등)만 지원"""
+        if self.kind != "sentinel":
+            raise TypeError(f"규칙 '{self.name}'({self.kind})은 수치형 컬럼에만 쓸 수 있습니다: {s.name}")
+        return s.isin(self.values).to_numpy()
+
+
+def _cols(columns) -> Optional[tuple[str, ...]]:
+    if columns is None:
+        return None
+    return (columns,) if isinstance(columns, str) else tuple(columns)
+
+
+def sentinel(columns, *values, name: str | None = None) -> MissingRule:
+    return MissingRule(name or f"sentinel{list(values)}", "sentinel", _cols(columns), values=tuple(values))
+
+
+def out_of_range(columns, low: float | None = None, high: float | None = None, name: str | None = None) -> MissingRule:
+    return MissingRule(name or f"range[{low}, {high}]", "range", _cols(columns), low=low, high=high)
+
+
+def zero_as_missing(columns, name: str = "zero_as_missing") -> MissingRule:
+    return MissingRule(name, "zero", _cols(columns))
+
+
+class MissingRuleEngine:
+    """
+    결측 규칙 묶음
+    - rules: MissingRule 목록 (선언 순서가 리포트 우선순위)
+    - apply(df, inplace=False) -> (결과 DataFrame, 규칙별 개수 리포트)
+    """
+
+    def __init__(self, rules: Iterable[MissingRule]):
+        self.rules = list(rules)
+        for r in self.rules:
+            if r.kind not in KINDS:
+                raise ValueError(f"지원하지 않는 규칙 종류: {r.kind}")
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, dict]) -> "MissingRuleEngine":
+        """
+        {컬럼: {"sentinels": [...], "range": (하한, 상한), "zero_is_missing": True}} 형태로 선언
+        - 컬럼 자리에 "*"를 쓰면 모든 수치형 컬럼
+        """
+        rules = []
+        for col, opts in spec.items():
+            columns = None if col == "*" else (col,)
+            label = "*" if columns is None else col
+            if opts.get("sentinels"):
+                rules.append(sentinel(columns, *opts["sentinels"], name=f"{label}:sentinel"))
+            if opts.get("range"):
+                low, high = opts["range"]
+                rules.append(out_of_range(columns, low, high, name=f"{label}:range"))
+            if opts.get("zero_is_missing"):
+                rules.append(zero_as_missing(columns, name=f"{label}:zero"))
+        return cls(rules)
+
+    def compile(self, df: pd.DataFrame) -> tuple[dict[tuple[int, ...], list[str]], dict[str, list[int]]]:
+        """
+        컬럼별 적용 규칙을 정리
+        반환: (수치형 블록 {규칙 번호 조합: 컬럼 목록}, 비수치형 {컬럼: 규칙 번호 목록})
+        """
+        numeric = {c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])}
+        per_col: dict[str, list[int]] = {}
+        for i, r in enumerate(self.rules):
+            targets = [c for c in df.columns if c in numeric] if r.columns is None else r.columns
+            for c in targets:
+                if c not in df.columns:
+                    raise KeyError(f"규칙 '{r.name}'의 컬럼이 없습니다: {c}")
+                per_col.setdefault(c, []).append(i)
+        blocks: dict[tuple[int, ...], list[str]] = {}
+        others: dict[str, list[int]] = {}
+        for c in df.columns:  # 원래 컬럼 순서 유지
+            if c not in per_col:
+                continue
+            if c in numeric:
+                blocks.setdefault(tuple(per_col[c]), []).append(c)
+            else:
+                others[c] = per_col[c]
+        return blocks, others
+
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> tuple[pd.DataFrame, pd.DataFrame]:
+        out = df if inplace else df.copy(deep=False)
+        blocks, others = self.compile(df)
+        records = []
+
+        for rule_ids, cols in blocks.items():
+            # 블록 하나 = 한 번의 변환. pandas 블록은 (컬럼, 행) 순서로 저장되므로 전치해 두면 C 연속 배열
+            a = df[cols].to_numpy(dtype=np.float64, na_value=np.nan).T
+            marked = np.zeros(a.shape, dtype=bool)
+            for i in rule_ids:
+                hit = self.rules[i].mask(a) & ~marked
+                marked |= hit
+                records.extend(zip([self.rules[i].name] * len(cols), cols, hit.sum(axis=1).tolist()))
+            changed = marked.any(axis=1)
+            for k in np.flatnonzero(changed):
+                # a는 원본을 가리키는 읽기 전용 뷰일 수 있으므로 바뀐 컬럼만 새로 만든다
+                col = a[k].copy()
+                col[marked[k]] = np.nan
+                out[cols[k]] = col
+
+        for c, rule_ids in others.items():
+            s = df[c]
+            marked = np.zeros(len(s), dtype=bool)
+            for i in rule_ids:
+                hit = self.rules[i].mask_series(s) & ~marked
+                marked |= hit
+                records.append((self.rules[i].name, c, int(hit.sum())))
+            if marked.any():
+                out[c] = s.mask(marked)
+
+        report = pd.DataFrame(records, columns=["rule", "column", "count"])
+        return out, report
+
+
+# =========================
+# 자주 쓰는 규칙
+# =========================
+# chapter7 AirQuality: 센서 오류값 -200 (모든 수치형 컬럼)
+AIRQUALITY_RULES = MissingRuleEngine([sentinel(None, -200, name="airquality:-200")])
+
+
+def patient_rules(zero_is_missing: list[str]) -> MissingRuleEngine:
+    """4-2-6.py 환자 데이터: 0=미기록 + 생리학적으로 불가능한 범위"""
+    return MissingRuleEngine([
+        zero_as_missing(zero_is_missing, name="vital:zero"),
+        out_of_range("sbp", 50, 260, name="sbp:range"),
+        out_of_range("dbp", 30, 160, name="dbp:range"),
+        out_of_range("glucose", 20, 700, name="glucose:range"),
+    ])
+
+
+def main():
+    # 1) 4-2-6.py 환자 데이터 (sbp 400은 입력 오류 예시로 추가)
+    df = pd.DataFrame(
+        {
+            "patient_id": [101, 102, 103, 104, 105, 106, 107, 108],
+            "sbp":        [120, 0,   138, 400, np.nan, 132, 0,   118],
+            "dbp":        [80,  0,   92,  95,  88,     np.nan, 0,   76],
+            "glucose":    [98,  0,   np.nan, 115, 102, 0,     140, np.nan],
+            "symptom_present": [0, 1, 0, 1, 0, 0, 1, np.nan],
+            "diagnosis":  ["Hypertension", None, "Diabetes", "Hypertension", "None", None, "Diabetes", "?"],
+        }
+    )
+    engine = patient_rules(["sbp", "dbp", "glucose"])
+    engine.rules.append(sentinel("diagnosis", "?", name="diagnosis:unknown"))
+    marked, report = engine.apply(df)
+    print("규칙 적용 결과\n", marked, "\n")
+    print("규칙별 결측 처리 건수\n", report[report["count"] > 0].to_string(index=False), "\n")
+    print("결측 규칙이 없는 컬럼은 원본과 메모리 공유:",
+          np.shares_memory(marked["symptom_present"].to_numpy(), df["symptom_present"].to_numpy()), "\n")
+
+    # 2) 선언형 dict + AirQuality 형태 데이터
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    air = pd.DataFrame({c: rng.uniform(0, 100, n).round(1) for c in ["CO(GT)", "NMHC(GT)", "C6H6(GT)", "NOx(GT)", "T", "RH"]})
+    for c in air.columns:
+        air.loc[rng.random(n) < 0.03, c] = -200
+    air.loc[rng.random(n) < 0.01, "RH"] = 120.0  # 습도 100% 초과: 불가능한 값
+    engine = MissingRuleEngine.from_dict({"*": {"sentinels": [-200]}, "RH": {"range": (0, 100)}})
+
+    start = time.perf_counter()
+    ref = air.copy()
+    num_cols = ref.select_dtypes(include="number").columns
+    ref[num_cols] = ref[num_cols].replace(-200, np.nan)
+    ref.loc[(ref["RH"] < 0) | (ref["RH"] > 100), "RH"] = np.nan
+    ref_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    out, report = engine.apply(air)
+    engine_sec = time.perf_counter() - start
+    pd.testing.assert_frame_equal(out, ref)
+    print(f"replace + loc (chapter7 방식): {ref_sec:.2f}s / 규칙 엔진: {engine_sec:.2f}s")
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# File: grouped_imputation.py
+# 목적: 그룹 조건부 결측치 대체 (예: Pclass × Sex별 Age 중앙값, 그룹별 Embarked 최빈값)
+# 내용:
+#   - 2-5-9.py는 Titanic Age를 전체 중앙값, Embarked를 전체 최빈값으로 채운다.
+#     4-2-5.py / 4-2-6.py 대체기도 모두 전역 통계를 쓴다 → 1등석 여성과 3등석 남성의 나이를 같은 값으로 채움.
+#   - GroupedImputer
+#       fit: groupby(sort=False) 해시 집계 한 번으로 그룹별 통계(중앙값/평균/최빈값)와 유효 개수를 계산.
+#            유효 값이 min_group_size 미만인 작은 그룹은 상위 그룹(by의 앞부분) → 전역 통계 순으로 대체값을 정한다.
+#            결과는 '그룹 키 → 최종 대체값' 조회표 하나로 저장.
+#       transform: 배치의 그룹 키를 조회표 인덱스에 매핑(get_indexer)해 결측 위치만 채운다.
+#                  학습 때 없던 그룹도 상위 그룹/전역 통계로 채운다. 결측이 없는 컬럼은 복사하지 않음.
+#       save / load: pickle (4-2-10.py와 같은 방식), iter_transform: 청크 스트림 적용
+# 의존성: pandas>=1.5, numpy
+
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+import time
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ("median", "mean", "most_frequent")
+
+
+def _group_mode(g, col: str) -> pd.Series:
+    """그룹별 최빈값 (동률이면 가장 작은 값 — Series.mode()[0]과 같은 규칙)"""
+    counts = g[col].value_counts(dropna=True)  # 인덱스: (그룹 키..., 값)
+    if counts.empty:
+        return pd.Series(dtype=object)
+    frame = counts.rename("n").reset_index()
+    keys = list(frame.columns[:-2])
+    frame = frame.sort_values(["n", col], ascending=[False, True], kind="stable")
+    return frame.drop_duplicates(keys).set_index(keys)[col]
+
+
+class GroupedImputer:
+    """
+    그룹별 통계로 결측 채우기
+    - by: 그룹 컬럼 목록 (예: ["Pclass", "Sex"])
+    - strategies: {컬럼: "median" / "mean" / "most_frequent"}
+    - min_group_size: 그룹 안 유효 값이 이보다 적으면 상위 그룹(by[:-1], by[:-2], ...) → 전역 통계로 대체
+    """
+
+    def __init__(self, by: list[str], strategies: dict[str, str], min_group_size: int = 5):
+        for col, strategy in strategies.items():
+            if strategy not in STRATEGIES:
+                raise ValueError(f"지원하지 않는 전략: {col}={strategy}")
+        self.by = list(by)
+        self.strategies = dict(strategies)
+        self.min_group_size = min_group_size
+        self.lookup_: list[pd.DataFrame] = []   # 단계별 조회표: by, by[:-1], ... (마지막은 전역)
+        self.global_: dict[str, object] = {}
+
+    def _aggregate(self, df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+        """keys 기준 해시 집계 한 번: 통계 + 유효 개수 (작은 그룹은 NaN)"""
+        g = df.groupby(keys, sort=False, dropna=False, observed=True)
+        counts = g[list(self.strategies)].count()
+        out = pd.DataFrame(index=counts.index)
+        num = [c for c, s in self.strategies.items() if s != "most_frequent"]
+        for strategy in ("median", "mean"):
+            cols = [c for c in num if self.strategies[c] == strategy]
+            if cols:
+                stats = g[cols].median() if strategy == "median" else g[cols].mean()
+                out[cols] = stats.reindex(out.index)
+        for c, s in self.strategies.items():
+            if s == "most_frequent":
+                out[c] = _group_mode(g, c).reindex(out.index)
+        small = counts < self.min_group_size
+        return out.astype(object).mask(small) if small.to_numpy().any() else out
+
+    def fit(self, df: pd.DataFrame) -> "GroupedImputer":
+        self.global_ = {}
+        for c, s in self.strategies.items():
+            valid = df[c].dropna()
+            if s == "median":
+                self.global_[c] = valid.median()
+            elif s == "mean":
+                self.global_[c] = valid.mean()
+            else:
+                self.global_[c] = valid.mode().iloc[0] if len(valid) else np.nan
+
+        # 가장 세밀한 단계부터 조회표를 만들고, 비어 있는 칸(작은 그룹)은 상위 단계 값으로 채운다
+        levels = [self.by[:k] for k in range(len(self.by), 0, -1)]
+        tables = [self._aggregate(df, keys) for keys in levels]
+        for i in range(len(tables) - 1, -1, -1):
+            table = tables[i]
+            if i + 1 < len(tables):
+                parent = tables[i + 1]
+                parent_keys = levels[i + 1]
+                pos = parent.index.get_indexer(_key_index(table.index.to_frame(index=False), parent_keys))
+                for c in self.strategies:
+                    up = np.where(pos >= 0, parent[c].to_numpy()[pos], self.global_[c])
+                    table[c] = table[c].where(table[c].notna(), up)
+            else:
+                table = table.fillna(self.global_)
+            tables[i] = table.infer_objects()
+        self.lookup_ = tables
+        return self
+
+    def _fill_values(self, batch: pd.DataFrame, col: str, rows: np.ndarray) -> np.ndarray:
+        """rows 위치의 그룹 대체값 (처음 보는 그룹은 상위 단계 → 전역)"""
+        values = np.full(len(rows), self.global_[col], dtype=object)
+        todo = np.ones(len(rows), dtype=bool)
+        keys_frame = batch[self.by].iloc[rows].reset_index(drop=True)
+        for table in self.lookup_:
+            if not todo.any():
+                break
+            keys = list(table.index.names)
+            pos = table.index.get_indexer(_key_index(keys_frame[todo], keys))
+            found = pos >= 0
+            idx = np.flatnonzero(todo)[found]
+            values[idx] = table[col].to_numpy()[pos[found]]
+            todo[idx] = False
+        return values
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        out = df if inplace else df.copy(deep=False)
+        for c in self.strategies:
+            if c not in out.columns:
+                continue
+            s = out[c]
+            missing = s.isna().to_numpy()
+            if not missing.any():
+                continue
+            fill = pd.Series(self._fill_values(out, c, np.flatnonzero(missing))).infer_objects().to_numpy()
+            other = np.empty(len(s), dtype=fill.dtype)
+            other[missing] = fill
+            out[c] = s.mask(missing, other)  # 위치 기준 대입 (인덱스 중복/비정렬이어도 안전)
+        return out
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def iter_transform(self, batches: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """청크 스트림(예: read_csv(chunksize=...))에 그대로 적용"""
+        for batch in batches:
+            yield self.transform(batch, inplace=True)
+
+    def group_table(self) -> pd.DataFrame:
+        """가장 세밀한 단계의 최종 대체값 표"""
+        return self.lookup_[0]
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str) -> "GroupedImputer":
+        with open(path, "rb") as f:
+            imputer = pickle.load(f)
+        if not isinstance(imputer, GroupedImputer):
+            raise TypeError(f"{path}: GroupedImputer가 아닙니다.")
+        return imputer
+
+
+def _key_index(frame: pd.DataFrame, keys: list[str]) -> pd.Index:
+    """그룹 키 컬럼 → 조회표 인덱스와 같은 모양(단일 키는 Index, 여러 키는 MultiIndex)"""
+    if len(keys) == 1:
+        return pd.Index(frame[keys[0]])
+    return pd.MultiIndex.from_frame(frame[keys])
+
+
+# =========================
+# 실습용 데이터
+# =========================
+def load_titanic(path: str = "train.csv", n: int = 891, seed: int = 0) -> pd.DataFrame:
+    """Kaggle Titanic train.csv (없으면 같은 컬럼 구성의 합성 데이터)"""
+    if os.path.exists(path):
+        return pd.read_csv(path)
+    rng = np.random.default_rng(seed)
+    pclass = rng.choice([1, 2, 3], n, p=[0.24, 0.21, 0.55])
+    sex = rng.choice(np.array(["male", "female"], dtype=object), n, p=[0.65, 0.35])
+    age = rng.normal(np.select([pclass == 1, pclass == 2], [38, 30], 25) - (sex == "female") * 3, 12).clip(0.5, 80).round()
+    age[rng.random(n) < 0.2] = np.nan
+    ports = np.array(["S", "C", "Q"], dtype=object)
+    embarked = np.where(pclass == 1, rng.choice(ports, n, p=[0.6, 0.38, 0.02]), rng.choice(ports, n, p=[0.75, 0.1, 0.15]))
+    embarked[rng.random(n) < 0.01] = None
+    return pd.DataFrame({"PassengerId": np.arange(1, n + 1), "Pclass": pclass, "Sex": sex, "Age": age, "Embarked": embarked})
+
+
+def main():
+    df = load_titanic()
+    print("null counts:\n", df[["Age", "Embarked"]].isnull().sum(), "\n")
+
+    # 1) 2-5-9.py 방식(전역) vs 그룹 조건부
+    global_fill = df["Age"].fillna(df["Age"].median())
+    imputer = GroupedImputer(by=["Pclass", "Sex"], strategies={"Age": "median", "Embarked": "most_frequent"})
+    grouped = imputer.fit_transform(df)
+    print("그룹별 대체값 (Pclass × Sex)\n", imputer.group_table().sort_index(), "\n")
+    summary = pd.DataFrame({
+        "전역 중앙값 대체": global_fill.groupby(df["Pclass"]).mean(),
+        "그룹 중앙값 대체": grouped["Age"].groupby(df["Pclass"]).mean(),
+    }).round(2)
+    print("Pclass별 평균 나이 비교\n", summary, "\n")
+
+    # 2) 저장 → 복원 → 큰 배치 스트림에 적용 (처음 보는 그룹 Pclass=4도 상위/전역 값으로 채움)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "grouped_imputer.pkl")
+        imputer.save(path)
+        imputer = GroupedImputer.load(path)
+
+    big = load_titanic("", n=2_000_000, seed=1)
+    big.loc[big.index[:1000], "Pclass"] = 4
+    chunks = (big.iloc[i:i + 250_000].copy() for i in range(0, len(big), 250_000))
+    start = time.perf_counter()
+    n_missing = sum(int(b[["Age", "Embarked"]].isna().sum().sum()) for b in imputer.iter_transform(chunks))
+    print(f"2,000,000행 스트림 대체: {time.perf_counter() - start:.2f}s, 남은 결측 {n_missing}")
+
+
+if __name__ == "__main__":
+    main()
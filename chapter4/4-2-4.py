@@ -20,9 +20,10 @@ def make_sample_dataframe() -> pd.DataFrame:
 def missing_report(df: pd.DataFrame) -> pd.DataFrame:
     """컬럼별 결측 개수와 결측률 리포트"""
     n = len(df)
+    missing_count = df.isna().sum()  # 불리언 프레임은 한 번만 만든다
     report = pd.DataFrame({
-        "missing_count": df.isna().sum(),
-        "missing_rate":  (df.isna().mean() * 100).round(2)
+        "missing_count": missing_count,
+        "missing_rate":  (missing_count / n * 100).round(2)
     }).sort_values("missing_rate", ascending=False)
     return report
 
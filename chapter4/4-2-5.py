@@ -43,9 +43,10 @@ def detect_dtypes(df: pd.DataFrame, exclude: list[str] | None = None) -> tuple[l
 
 def missing_report(df: pd.DataFrame) -> pd.DataFrame:
     """결측 개수와 결측률 리포트"""
+    missing_count = df.isna().sum()
     return pd.DataFrame({
-        "missing_count": df.isna().sum(),
-        "missing_rate": (df.isna().mean() * 100).round(2)
+        "missing_count": missing_count,
+        "missing_rate": (missing_count / len(df) * 100).round(2)
     }).sort_values("missing_rate", ascending=False)
 
 
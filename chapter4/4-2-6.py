@@ -67,10 +67,11 @@ class DomainImputationPractice:
         """
         각 컬럼별 결측 개수와 결측률 출력용 표 생성
         """
+        missing_count = df.isna().sum()
         return pd.DataFrame(
             {
-                "missing_count": df.isna().sum(),
-                "missing_rate": (df.isna().mean() * 100).round(2),
+                "missing_count": missing_count,
+                "missing_rate": (missing_count / len(df) * 100).round(2),
             }
         ).sort_values("missing_rate", ascending=False)
 
@@ -136,11 +137,12 @@ class DomainImputationPractice:
         - symptom_present: 0은 '증상 없음'이라는 실제 값 → 유지
         - diagnosis: "None" 문자열은 실제 값 → 유지, NaN은 미기록
         """
-        work = self.normalize_missing(df.copy())
+        work = self.normalize_missing(df)  # replace가 새 DataFrame을 돌려주므로 따로 copy하지 않음
 
-        for col in self.zero_is_missing:
-            if col in work.columns:
-                work.loc[work[col] == 0, col] = np.nan
+        # 대상 컬럼을 한 번에 마스킹 (컬럼마다 loc 대입을 반복하지 않음)
+        cols = [c for c in self.zero_is_missing if c in work.columns]
+        if cols:
+            work[cols] = work[cols].mask(work[cols] == 0)
 
         return work
 
@@ -0,0 +1,332 @@
+# File: missing_profile_chunked.py
+# 목적: 결측 프로파일링 - 한 번 읽으면서 컬럼별 결측 개수/결측률/0 개수/센티널 개수를 함께 계산
+# 내용:
+#   - 4-2-4.py, 4-2-5.py의 missing_report는 df.isna()를 두 번(sum, mean) 만들고,
+#     파일 전체를 메모리에 올린 DataFrame이 있어야 한다.
+#   - MissingCounter: 청크 하나를 받아 결측/0/센티널(-200, -999 같은 '값처럼 생긴 결측') 개수를
+#     한 번에 누적한다. 숫자형 컬럼은 2차원 float 배열 하나로 묶어 컬럼 방향으로 합산.
+#   - profile_file: CSV(read_csv chunksize) / Parquet(iter_batches)를 청크 단위로 읽고 프로세스별로 처리
+#       · CSV: 파일을 줄바꿈 경계에 맞춘 바이트 구간으로 나눠 작업자마다 자기 구간만 토큰화(행 분할),
+#              작업자 결과는 MissingCounter.merge로 합친다.
+#       · Parquet: 컬럼을 작업자 수만큼 나눠 자기 컬럼만 읽는다(열 분할).
+#     → 메모리는 '청크 행 수 × 작업자당 컬럼 수'로 고정.
+#   - 결과 표는 missing_report와 같은 형식(missing_count, missing_rate, 결측률 내림차순)에
+#     zero_count, sentinel_count, sentinel[값] 컬럼이 추가된다.
+# 주의: CSV 행 분할은 한 레코드가 한 줄이라고 가정한다(따옴표 안 줄바꿈이 있으면 n_workers=1).
+# 의존성: pandas>=1.5, numpy (선택: pyarrow — Parquet 입력)
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 측정 장비/레거시 시스템이 '미기록' 대신 넣는 값 (예: UCI AirQuality의 -200)
+DEFAULT_SENTINELS: tuple = (-200, -999)
+
+
+class MissingCounter:
+    """
+    컬럼별 결측 통계 누적기 (청크를 여러 번 update한 뒤 report)
+    - missing: NaN/None/pd.NA 개수
+    - zeros: 값이 0인 개수 (문자열 컬럼은 "0"도 포함)
+    - sentinels: 값별 개수 (문자열 컬럼은 str(값)도 같은 센티널로 센다)
+    - merge: 같은 컬럼을 다른 행 구간에서 센 결과를 합친다 (행 분할 병렬용)
+    """
+
+    def __init__(self, columns: Sequence[str], sentinels: Sequence = DEFAULT_SENTINELS):
+        self.columns = list(columns)
+        self.sentinels = tuple(sentinels)
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+        k = len(self.columns)
+        self.n_rows = 0
+        self.missing = np.zeros(k, dtype=np.int64)
+        self.zeros = np.zeros(k, dtype=np.int64)
+        self.sentinel_counts = np.zeros((k, len(self.sentinels)), dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """청크 하나를 누적 (청크마다 dtype이 달라도 컬럼 이름으로 맞춘다)"""
+        self.n_rows += len(chunk)
+        num_cols = [c for c in chunk.columns if pd.api.types.is_numeric_dtype(chunk[c])]
+        other_cols = [c for c in chunk.columns if c not in set(num_cols)]
+
+        if num_cols:
+            # 숫자형 컬럼 전체를 float 블록 하나로: isna를 컬럼마다 부르지 않고 axis=0 합산으로 끝낸다
+            idx = [self._pos[c] for c in num_cols]
+            block = chunk[num_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.missing[idx] += np.isnan(block).sum(axis=0)
+            self.zeros[idx] += (block == 0).sum(axis=0)
+            for j, v in enumerate(self.sentinels):
+                if isinstance(v, (int, float)):
+                    self.sentinel_counts[idx, j] += (block == v).sum(axis=0)
+
+        for c in other_cols:
+            i = self._pos[c]
+            s = chunk[c]
+            self.missing[i] += int(s.isna().sum())
+            self.zeros[i] += int(s.isin((0, "0")).sum())
+            for j, v in enumerate(self.sentinels):
+                self.sentinel_counts[i, j] += int(s.isin((v, str(v))).sum())
+
+    def merge(self, other: "MissingCounter") -> "MissingCounter":
+        """같은 컬럼/센티널 구성의 누적기를 더한다"""
+        if other.columns != self.columns or other.sentinels != self.sentinels:
+            raise ValueError("컬럼 또는 센티널 구성이 다른 누적기는 합칠 수 없습니다.")
+        self.n_rows += other.n_rows
+        self.missing += other.missing
+        self.zeros += other.zeros
+        self.sentinel_counts += other.sentinel_counts
+        return self
+
+    def report(self, sort: bool = True) -> pd.DataFrame:
+        """missing_report 형식 + zero_count / sentinel_count / sentinel[값]"""
+        rate = self.missing / self.n_rows * 100 if self.n_rows else np.full(len(self.columns), np.nan)
+        report = pd.DataFrame(
+            {
+                "missing_count": self.missing,
+                "missing_rate": np.round(rate, 2),
+                "zero_count": self.zeros,
+                "sentinel_count": self.sentinel_counts.sum(axis=1),
+            },
+            index=pd.Index(self.columns),
+        )
+        for j, v in enumerate(self.sentinels):
+            report[f"sentinel[{v}]"] = self.sentinel_counts[:, j]
+        if sort:
+            report = report.sort_values("missing_rate", ascending=False)
+        return report
+
+
+# =========================
+# 청크 읽기
+# =========================
+def _is_parquet(path: str) -> bool:
+    return path.endswith((".parquet", ".pq"))
+
+
+def read_columns(path: str) -> list[str]:
+    """헤더(스키마)만 읽어 컬럼 목록 반환"""
+    if _is_parquet(path):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet 입력에는 pyarrow가 필요합니다.")
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_chunks(path: str, columns: Sequence[str] | None, chunk_rows: int, **read_kw) -> Iterator[pd.DataFrame]:
+    """지정 컬럼만 chunk_rows 행씩 읽는 생성기"""
+    if _is_parquet(path):
+        if not HAS_PYARROW:
+            raise ImportError("Parquet 입력에는 pyarrow가 필요합니다.")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, **read_kw)
+
+
+def chunk_rows_for_budget(
+    path: str, n_columns: int, memory_budget_mb: float, n_workers: int, split_columns: bool = True, **read_kw
+) -> int:
+    """
+    메모리 예산 → 청크 행 수
+    - 앞쪽 1,000행으로 '컬럼 하나, 행 하나'의 평균 바이트를 추정
+    - 작업자 하나가 쓰는 양 = 청크 DataFrame + float 블록 + 불리언 임시 배열 → 여유 배수 3
+    - split_columns=False(행 분할)이면 작업자마다 컬럼 전체를 읽는다
+    """
+    columns = read_columns(path)
+    sample = next(iter_chunks(path, None, 1_000, **read_kw))
+    bytes_per_cell = max(sample.memory_usage(index=False, deep=True).sum() / max(sample.size, 1), 8.0)
+    per_worker = memory_budget_mb * 2**20 / max(n_workers, 1)
+    n_columns = min(n_columns, len(columns))
+    cols_per_worker = -(-n_columns // max(n_workers, 1)) if split_columns else n_columns
+    return max(1_000, int(per_worker / (bytes_per_cell * cols_per_worker * 3)))
+
+
+def csv_byte_ranges(path: str, n_parts: int) -> list[tuple[int, int]]:
+    """헤더 다음부터 파일 끝까지를 n_parts개의 바이트 구간으로 나누고, 경계를 다음 줄 시작으로 맞춘다"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        bounds = [f.tell()]
+        for i in range(1, n_parts):
+            f.seek(max(bounds[-1], bounds[0] + (size - bounds[0]) * i // n_parts))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class _ByteRange(io.RawIOBase):
+    """파일의 [start, end) 구간만 보이는 읽기 전용 스트림 (read_csv에 그대로 넘긴다)"""
+
+    def __init__(self, path: str, start: int, end: int):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._left = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buf) -> int:
+        n = self._f.readinto(memoryview(buf)[: min(len(buf), self._left)]) if self._left else 0
+        self._left -= n
+        return n
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+def _profile_columns(path: str, columns: list[str], sentinels: tuple, chunk_rows: int, read_kw: dict) -> MissingCounter:
+    """작업자(열 분할): 자기 컬럼만 청크로 읽으며 누적 (프로세스 풀에서 피클 가능하도록 최상위 함수)"""
+    counter = MissingCounter(columns, sentinels)
+    for chunk in iter_chunks(path, columns, chunk_rows, **read_kw):
+        counter.update(chunk)
+    return counter
+
+
+def _profile_csv_range(
+    path: str, header: list[str], columns: list[str], byte_range: tuple[int, int], sentinels: tuple, chunk_rows: int, read_kw: dict
+) -> MissingCounter:
+    """작업자(행 분할): CSV의 바이트 구간 하나만 토큰화하며 누적"""
+    counter = MissingCounter(columns, sentinels)
+    with io.BufferedReader(_ByteRange(path, *byte_range)) as f:
+        for chunk in pd.read_csv(f, header=None, names=header, usecols=columns, chunksize=chunk_rows, **read_kw):
+            counter.update(chunk[columns])
+    return counter
+
+
+def profile_file(
+    path: str,
+    columns: Sequence[str] | None = None,
+    sentinels: Sequence = DEFAULT_SENTINELS,
+    n_workers: int | None = None,
+    memory_budget_mb: float = 512,
+    chunk_rows: int | None = None,
+    **read_kw,
+) -> pd.DataFrame:
+    """
+    CSV/Parquet 파일 결측 프로파일
+    - columns: 볼 컬럼 (None이면 전체)
+    - n_workers: 프로세스 수 (None이면 CPU 수)
+        · CSV: 바이트 구간(행) 수 → 작업자 결과를 MissingCounter.merge로 합친다
+        · Parquet: 컬럼 그룹 수 (컬럼 수보다 많지 않게)
+    - memory_budget_mb: 전체 작업자가 동시에 쓰는 메모리 상한(대략). chunk_rows를 주면 그 값을 그대로 사용
+    - read_kw: read_csv에 넘길 인자 (sep, encoding, na_values ...)
+    """
+    header = read_columns(path)
+    columns = list(columns) if columns is not None else header
+    split_columns = _is_parquet(path)
+    n_workers = max(1, n_workers or os.cpu_count() or 1)
+    if split_columns:
+        n_workers = min(n_workers, len(columns))
+    if chunk_rows is None:
+        chunk_rows = chunk_rows_for_budget(path, len(columns), memory_budget_mb, n_workers, split_columns, **read_kw)
+
+    sentinels = tuple(sentinels)
+    if n_workers == 1:
+        counter = _profile_columns(path, columns, sentinels, chunk_rows, read_kw)
+        return counter.report()
+
+    if split_columns:
+        groups = [list(g) for g in np.array_split(np.array(columns, dtype=object), n_workers) if len(g)]
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            futures = [ex.submit(_profile_columns, path, g, sentinels, chunk_rows, read_kw) for g in groups]
+            counters = [f.result() for f in futures]
+        report = pd.concat([c.report(sort=False) for c in counters])
+        return report.sort_values("missing_rate", ascending=False)
+
+    ranges = csv_byte_ranges(path, n_workers)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+        futures = [
+            ex.submit(_profile_csv_range, path, header, columns, r, sentinels, chunk_rows, read_kw) for r in ranges
+        ]
+        counters = [f.result() for f in futures]
+    counter = MissingCounter(columns, sentinels)
+    for c in counters:
+        counter.merge(c)
+    return counter.report()
+
+
+def profile_frame(df: pd.DataFrame, sentinels: Sequence = DEFAULT_SENTINELS, chunk_rows: int = 100_000) -> pd.DataFrame:
+    """메모리에 있는 DataFrame도 행 청크로 나눠 임시 배열 크기를 제한"""
+    counter = MissingCounter(df.columns, sentinels)
+    for start in range(0, len(df), chunk_rows):
+        counter.update(df.iloc[start:start + chunk_rows])
+    return counter.report()
+
+
+# =========================
+# 실습용 데이터
+# =========================
+def make_wide_csv(path: str, n_rows: int = 200_000, n_cols: int = 40, seed: int = 42) -> None:
+    """NaN, 0, 센티널(-200), 문자열 '?'가 섞인 큰 CSV 생성"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for j in range(n_cols):
+        x = rng.normal(100, 20, n_rows).round(1)
+        x[rng.random(n_rows) < 0.02 * (j % 10)] = np.nan
+        x[rng.random(n_rows) < 0.01] = 0
+        x[rng.random(n_rows) < 0.005 * (j % 3)] = -200
+        data[f"x{j:03d}"] = x
+    codes = rng.choice(np.array(["A", "B", "C", "?", None], dtype=object), n_rows, p=[0.4, 0.3, 0.2, 0.05, 0.05])
+    data["grade"] = codes
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def missing_report(df: pd.DataFrame) -> pd.DataFrame:
+    """비교용: 4-2-5.py의 missing_report"""
+    missing_count = df.isna().sum()
+    return pd.DataFrame({
+        "missing_count": missing_count,
+        "missing_rate": (missing_count / len(df) * 100).round(2)
+    }).sort_values("missing_rate", ascending=False)
+
+
+def main():
+    # 1) 작은 DataFrame: 4-2-6.py 환자 데이터 (0이 '결측처럼 보이는 값')
+    df = pd.DataFrame(
+        {
+            "sbp":     [120, 0,   138, 145, np.nan, 132, 0,   118],
+            "dbp":     [80,  0,   92,  95,  88,     np.nan, 0,   76],
+            "glucose": [98,  0,   np.nan, 115, 102, 0,     140, np.nan],
+            "diagnosis": ["Hypertension", None, "Diabetes", "Hypertension", "None", None, "Diabetes", "None"],
+        }
+    )
+    print("결측 프로파일(환자 데이터)\n", profile_frame(df, sentinels=()), "\n")
+
+    # 2) 큰 CSV: 전체 로드 + missing_report vs 청크/행 분할 병렬 프로파일
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wide.csv")
+        make_wide_csv(path)
+
+        start = time.perf_counter()
+        full = pd.read_csv(path)
+        base = missing_report(full)
+        base_sec = time.perf_counter() - start
+        del full
+
+        start = time.perf_counter()
+        prof = profile_file(path, sentinels=(-200, "?"), n_workers=4, memory_budget_mb=64)
+        prof_sec = time.perf_counter() - start
+
+        same = prof["missing_count"].reindex(base.index).equals(base["missing_count"])
+        print(f"전체 로드 + missing_report: {base_sec:.2f}s / profile_file(4 작업자, 64MB): {prof_sec:.2f}s "
+              f"(결측 개수 일치: {same})")
+        print(prof.head(10))
+
+
+if __name__ == "__main__":
+    main()
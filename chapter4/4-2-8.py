@@ -0,0 +1,247 @@
+# File: deletion_planner_out_of_core.py
+# 목적: 결측치 제거법(행/열 제거)을 메모리에 다 올리지 않고 두 번의 스트리밍으로 수행
+# 내용:
+#   - 4-2-4.py의 listwise_delete / variable_delete_by_missing_ratio는 DataFrame 전체에 dropna/drop을
+#     호출하고, 파이프라인(열 제거 → 행 제거)은 중간 복사본을 만든다.
+#   - 1차 패스(plan_deletion): 청크를 읽으며 컬럼별 결측 개수와 행별 결측 비트마스크
+#     (행 하나당 ceil(컬럼 수 / 8) 바이트, 임시 파일)를 기록 → 열 제거/행 제거 결정을 한 번에 계산.
+#     남는 것은 '남길 컬럼 목록'과 '남길 행 비트마스크(행 8개당 1바이트)'뿐.
+#   - 2차 패스(DeletionPlan.apply_csv): 남길 컬럼만 읽고 남길 행만 골라 바로 파일에 쓴다.
+#   - 메모리에 있는 DataFrame에는 apply_frame으로 df.loc[행, 열] 한 번만 복사.
+# 규칙(4-2-4.py와 동일):
+#   - col_threshold: 결측률 >= threshold 인 컬럼 제거
+#   - keep_threshold가 있으면 (남은 컬럼 기준) 유효 값 개수 >= keep_threshold 인 행만 유지
+#   - 없고 subset이 있으면 subset 중 하나라도 결측인 행 삭제, 둘 다 없으면 남은 컬럼 전체 기준
+#   - 열 제거를 먼저, 행 제거를 나중에 적용 (4-2-4.py main의 파이프라인 순서)
+# 의존성: pandas>=1.5, numpy
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _iter_source(source, chunk_rows: int, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """CSV 경로 또는 DataFrame을 chunk_rows 행씩"""
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[list(columns)]
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+    else:
+        yield from pd.read_csv(source, usecols=columns, chunksize=chunk_rows)
+
+
+def _bit_slice(packed: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """비트마스크에서 [start, stop) 행만 bool 배열로 풀기"""
+    lo = start // 8
+    bits = np.unpackbits(packed[lo:(stop + 7) // 8])
+    return bits[start - lo * 8: stop - lo * 8].astype(bool)
+
+
+class DeletionPlan:
+    """
+    1차 패스 결과: 어떤 컬럼/행을 남길지
+    - keep_columns: 남길 컬럼 (원래 순서)
+    - dropped: 제거된 컬럼의 결측률 (variable_delete_by_missing_ratio의 두 번째 반환값과 같은 형태)
+    - row_mask: 남길 행 비트마스크 (np.packbits)
+    """
+
+    def __init__(self, columns: list[str], n_rows: int, keep_columns: list[str],
+                 dropped: pd.Series, row_mask: np.ndarray, n_kept_rows: int):
+        self.columns = columns
+        self.n_rows = n_rows
+        self.keep_columns = keep_columns
+        self.dropped = dropped
+        self.row_mask = row_mask
+        self.n_kept_rows = n_kept_rows
+
+    @property
+    def shape_after(self) -> tuple[int, int]:
+        return self.n_kept_rows, len(self.keep_columns)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """[start, stop) 구간의 남길 행 여부 (bool)"""
+        return _bit_slice(self.row_mask, start, self.n_rows if stop is None else stop)
+
+    def apply_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """메모리 DataFrame에 적용 (인덱스 유지, 복사는 한 번)"""
+        if len(df) != self.n_rows:
+            raise ValueError(f"계획의 행 수({self.n_rows})와 DataFrame 행 수({len(df)})가 다릅니다.")
+        return df.loc[self.rows(), self.keep_columns]
+
+    def apply_csv(self, src: str, dst: str, chunk_rows: int = 100_000, **to_csv_kw) -> int:
+        """
+        2차 패스: 남길 컬럼만 읽고 남길 행만 dst에 쓴다 (인덱스는 쓰지 않음)
+        반환: 쓴 행 수
+        """
+        written, offset = 0, 0
+        with open(dst, "w", newline="", encoding=to_csv_kw.pop("encoding", "utf-8")) as f:
+            pd.DataFrame(columns=self.keep_columns).to_csv(f, index=False, **to_csv_kw)
+            for chunk in _iter_source(src, chunk_rows, self.keep_columns):
+                keep = self.rows(offset, offset + len(chunk))
+                offset += len(chunk)
+                if keep.any():
+                    chunk.loc[keep].to_csv(f, index=False, header=False, **to_csv_kw)
+                    written += int(keep.sum())
+        return written
+
+
+def plan_deletion(
+    source,
+    col_threshold: Optional[float] = None,
+    listwise: bool = True,
+    subset: Optional[list[str]] = None,
+    keep_threshold: Optional[int] = None,
+    chunk_rows: int = 100_000,
+    workdir: Optional[str] = None,
+) -> DeletionPlan:
+    """
+    1차 패스: 결측 비트마스크를 임시 파일에 쌓고 제거 계획을 만든다
+    - source: CSV 경로 또는 DataFrame
+    - col_threshold: None이면 열 제거 안 함 (0~1)
+    - listwise: False면 행 제거 안 함 (열 제거만)
+    - subset / keep_threshold: listwise_delete와 같은 의미
+    """
+    columns: list[str] | None = None
+    missing = None
+    n_rows = 0
+    fd, bits_path = tempfile.mkstemp(suffix=".nullbits", dir=workdir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in _iter_source(source, chunk_rows):
+                if columns is None:
+                    columns = list(chunk.columns)
+                    missing = np.zeros(len(columns), dtype=np.int64)
+                nulls = chunk.isna().to_numpy()
+                missing += nulls.sum(axis=0)
+                f.write(np.packbits(nulls, axis=1).tobytes())
+                n_rows += len(chunk)
+        if columns is None:  # 빈 입력: 헤더만
+            columns = list(source.columns) if isinstance(source, pd.DataFrame) else list(pd.read_csv(source, nrows=0).columns)
+            missing = np.zeros(len(columns), dtype=np.int64)
+
+        # 열 결정
+        miss_rate = pd.Series(missing / n_rows if n_rows else np.full(len(columns), np.nan), index=columns)
+        if col_threshold is not None:
+            drop_cols = miss_rate[miss_rate >= col_threshold].index
+        else:
+            drop_cols = miss_rate.index[:0]
+        keep_columns = [c for c in columns if c not in set(drop_cols)]
+        keep_idx = np.array([columns.index(c) for c in keep_columns], dtype=np.intp)
+
+        # 행 결정 (비트마스크를 블록 단위로 풀어 남은 컬럼만 본다)
+        if listwise and keep_threshold is None and subset is not None:
+            missing_subset = [c for c in subset if c not in keep_columns]
+            if missing_subset:
+                raise KeyError(missing_subset)
+            test_idx = np.array([columns.index(c) for c in subset], dtype=np.intp)
+        else:
+            test_idx = keep_idx
+
+        row_keep = np.ones(n_rows, dtype=bool)
+        if listwise and n_rows:
+            bits = np.memmap(bits_path, dtype=np.uint8, mode="r", shape=(n_rows, (len(columns) + 7) // 8))
+            for start in range(0, n_rows, chunk_rows):
+                block = np.unpackbits(bits[start:start + chunk_rows], axis=1, count=len(columns)).astype(bool)
+                block = block[:, test_idx]
+                if keep_threshold is not None:
+                    row_keep[start:start + chunk_rows] = (len(test_idx) - block.sum(axis=1)) >= keep_threshold
+                else:
+                    row_keep[start:start + chunk_rows] = ~block.any(axis=1)
+            del bits
+    finally:
+        os.remove(bits_path)
+
+    return DeletionPlan(
+        columns=columns,
+        n_rows=n_rows,
+        keep_columns=keep_columns,
+        dropped=miss_rate[drop_cols],
+        row_mask=np.packbits(row_keep),
+        n_kept_rows=int(row_keep.sum()),
+    )
+
+
+# =========================
+# 비교용: 4-2-4.py 함수
+# =========================
+def listwise_delete(df: pd.DataFrame, subset: Optional[list[str]] = None, keep_threshold: Optional[int] = None) -> pd.DataFrame:
+    if keep_threshold is not None:
+        return df.dropna(thresh=keep_threshold)
+    if subset is not None:
+        return df.dropna(subset=subset)
+    return df.dropna()
+
+
+def variable_delete_by_missing_ratio(df: pd.DataFrame, threshold: float = 0.4):
+    miss_rate = df.isna().mean()
+    drop_cols = miss_rate[miss_rate >= threshold].index
+    return df.drop(columns=drop_cols), miss_rate[drop_cols]
+
+
+def make_sample_dataframe() -> pd.DataFrame:
+    """4-2-4.py와 같은 샘플"""
+    return pd.DataFrame({
+        "id":      [1, 2, 3, 4, 5, 6, 7],
+        "age":     [23, None, 31, 29, None, 41, 36],
+        "income":  [52000, 61000, None, 58000, 60000, None, 72000],
+        "city":    ["Seoul", "Busan", None, "Daejeon", "Seoul", "Seoul", None],
+        "hobby":   [None, None, "Run", None, "Music", None, None],
+    })
+
+
+def main():
+    # 1) 4-2-4.py의 시나리오를 계획 하나씩으로 (chunk_rows=3: 청크 경계에서도 같은 결과인지 확인)
+    df = make_sample_dataframe()
+    cases = {
+        "행 제거 - 전체 컬럼": (dict(), lambda d: listwise_delete(d)),
+        "행 제거 - subset": (dict(subset=["age", "income"]), lambda d: listwise_delete(d, subset=["age", "income"])),
+        "행 제거 - keep_threshold=4": (dict(keep_threshold=4), lambda d: listwise_delete(d, keep_threshold=4)),
+        "열 제거 40%": (dict(col_threshold=0.4, listwise=False), lambda d: variable_delete_by_missing_ratio(d, 0.4)[0]),
+        "파이프라인 (열 50% → subset 행)": (
+            dict(col_threshold=0.5, subset=["age", "income"]),
+            lambda d: listwise_delete(variable_delete_by_missing_ratio(d, 0.5)[0], subset=["age", "income"]),
+        ),
+    }
+    for name, (kw, reference) in cases.items():
+        plan = plan_deletion(df, chunk_rows=3, **kw)
+        out = plan.apply_frame(df)
+        pd.testing.assert_frame_equal(out, reference(df))
+        print(f"[{name}] shape: {df.shape} -> {plan.shape_after}, 제거된 컬럼: {list(plan.dropped.index)}")
+
+    # 2) 큰 CSV: 전체 로드 후 파이프라인 + 저장 vs 두 번의 스트리밍 (시간 대부분은 to_csv의 실수 포맷팅)
+    rng = np.random.default_rng(0)
+    n = 200_000
+    big = pd.DataFrame({f"x{j:02d}": rng.normal(size=n) for j in range(30)})
+    for j, col in enumerate(big.columns):
+        big.loc[rng.random(n) < 0.002 * (j % 4) + (0.6 if j % 10 == 9 else 0), col] = np.nan
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "big.csv"), os.path.join(tmp, "out.csv")
+        big.to_csv(src, index=False)
+
+        start = time.perf_counter()
+        full = pd.read_csv(src)
+        ref, _ = variable_delete_by_missing_ratio(full, threshold=0.5)
+        ref = listwise_delete(ref, keep_threshold=26)
+        ref.to_csv(os.path.join(tmp, "ref.csv"), index=False)
+        ref_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plan = plan_deletion(src, col_threshold=0.5, keep_threshold=26, chunk_rows=50_000)
+        written = plan.apply_csv(src, dst, chunk_rows=50_000)
+        stream_sec = time.perf_counter() - start
+
+        out = pd.read_csv(dst)
+        pd.testing.assert_frame_equal(out, ref.reset_index(drop=True), check_dtype=False)
+        print(f"\n전체 로드 + dropna + 저장: {ref_sec:.2f}s / 2-패스 스트리밍: {stream_sec:.2f}s "
+              f"(남은 shape {plan.shape_after}, 쓴 행 {written:,}, 행 마스크 {plan.row_mask.nbytes / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# File: knn_imputation_tree.py
+# 목적: KNN 대체를 큰 데이터(10만~100만 행)에서도 돌리기 - 결측 패턴별 KD-트리 + 블록 병렬 처리
+# 내용:
+#   - 4-2-5.py의 knn_impute는 KNNImputer를 쓰는데, (결측 행 × 전체 행) nan-유클리드 거리를
+#     모두 계산한다 → 행 수에 대해 제곱으로 느려지고 10만 행 근처부터 메모리/시간이 감당되지 않는다.
+#   - TreeKNNImputer (KNNImputer와 같은 이웃 정의)
+#       1) 컬럼 j를 채울 이웃 후보는 'j가 관측된 모든 행' (완전 행만이 아님).
+#       2) 학습 행을 결측 패턴별 그룹으로 나눈다. 받는 행(결측 행)과 후보 그룹이 함께 관측한 컬럼이 정해지면
+#          nan-유클리드 거리 = sqrt(전체 컬럼 수 / 공통 컬럼 수 × 공통 컬럼 제곱거리)이고, 그룹 안에서는 상수배만 다르다.
+#          → (후보 그룹, 공통 컬럼)마다 KD-트리(scipy)를 한 번 만들고, 그룹별 최근접 k개를 구해 거리 기준으로 합친다.
+#       3) 공통 컬럼이 없는 후보는 거리가 NaN: 유한 거리 후보가 하나도 없으면 컬럼 평균,
+#          k개보다 적으면 NaN 거리 후보를 행 순서대로 더한다.
+#       4) 결측 행을 결측 패턴별 block_size 행씩 잘라 프로세스에 나눠 질의하고, 이웃 n_neighbors개의 평균으로 채운다.
+#   - 결과는 4-2-5.py knn_impute(KNNImputer.fit_transform)와 같다
+#     (거리 동점, 유한 거리 후보가 k개 미만일 때 NaN 거리 후보를 고르는 순서 제외).
+#   - eps > 0 이면 근사 최근접 이웃(거리 오차 (1 + eps)배 이내)으로 더 빠르게 질의.
+# 주의: KD-트리는 특성 수가 20개를 넘어가면 효율이 떨어진다 (그 경우 eps를 키우거나 차원 축소 권장).
+#       결측 패턴 종류가 많으면 (패턴 × 후보 그룹) 트리 수가 늘어난다.
+# 의존성: numpy, pandas, scipy, scikit-learn(비교/범주형 최빈값 대체)
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import KDTree
+from sklearn.impute import SimpleImputer
+
+
+def _pattern_groups(miss: np.ndarray) -> tuple[np.ndarray, list[np.ndarray]]:
+    """결측 마스크 (행 × 컬럼) → (고유 패턴, 패턴별 행 번호)"""
+    if len(miss) == 0:
+        return np.empty((0, miss.shape[1]), dtype=bool), []
+    packed = np.packbits(miss, axis=1)
+    if packed.shape[1] <= 8:
+        # 컬럼 64개 이하: 패턴을 정수 하나로 만들어 1차원 unique (행 단위 unique보다 훨씬 빠름)
+        codes = np.zeros((len(miss), 8), dtype=np.uint8)
+        codes[:, :packed.shape[1]] = packed
+        _, first, inverse = np.unique(codes.view(np.uint64).ravel(), return_index=True, return_inverse=True)
+        patterns = miss[first]
+    else:
+        patterns, inverse = np.unique(miss, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(patterns) + 1))
+    return patterns, [order[bounds[p]:bounds[p + 1]] for p in range(len(patterns))]
+
+
+# =========================
+# 워커 프로세스 쪽 코드 (학습 행과 그룹 정보는 워커마다 한 번만 받는다)
+# =========================
+_fit_X: np.ndarray | None = None
+_groups: list[tuple[np.ndarray, np.ndarray]] = []   # (관측 마스크, 행 번호)
+_col_means: np.ndarray | None = None
+_n_neighbors = 5
+_eps = 0.0
+_leafsize = 32
+_trees: dict[tuple[int, bytes], KDTree] = {}
+_MAX_TREES = 256
+
+
+def _init_worker(fit_X: np.ndarray, groups: list, col_means: np.ndarray, n_neighbors: int, eps: float,
+                 leafsize: int) -> None:
+    global _fit_X, _groups, _col_means, _n_neighbors, _eps, _leafsize
+    _fit_X, _groups, _col_means = fit_X, groups, col_means
+    _n_neighbors, _eps, _leafsize = n_neighbors, eps, leafsize
+    _trees.clear()
+
+
+def _tree_for(g: int, common: np.ndarray) -> KDTree:
+    """(후보 그룹, 공통 컬럼)별 KD-트리 (워커 안에서 캐시)"""
+    key = (g, common.tobytes())
+    tree = _trees.get(key)
+    if tree is None:
+        if len(_trees) >= _MAX_TREES:
+            _trees.clear()
+        rows = _groups[g][1]
+        tree = _trees[key] = KDTree(_fit_X[np.ix_(rows, np.flatnonzero(common))], leafsize=_leafsize)
+    return tree
+
+
+def _impute_block(observed: np.ndarray, block: np.ndarray) -> np.ndarray:
+    """같은 결측 패턴의 행 묶음을 채워 반환"""
+    n_rows, n_features = block.shape
+    # 그룹별 최근접 후보: 제곱거리(nan-유클리드 가중치 포함)와 학습 행 번호
+    near: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    for g, (g_obs, rows) in enumerate(_groups):
+        common = observed & g_obs
+        if not common.any():
+            continue
+        k = min(_n_neighbors, len(rows))
+        dist, nn = _tree_for(g, common).query(block[:, common], k=k, eps=_eps)
+        d2 = dist.reshape(n_rows, k) ** 2 * (n_features / common.sum())
+        near[g] = (d2, rows[nn.reshape(n_rows, k)])
+
+    for j in np.flatnonzero(~observed):
+        donors = [g for g, (g_obs, _) in enumerate(_groups) if g_obs[j]]
+        finite = [g for g in donors if g in near]
+        n_donors = sum(len(_groups[g][1]) for g in donors)
+        if not finite:
+            block[:, j] = _col_means[j]  # KNNImputer: 모든 후보와 거리가 NaN이면 컬럼 평균
+            continue
+        k = min(_n_neighbors, n_donors)
+        d2 = np.concatenate([near[g][0] for g in finite], axis=1)
+        ids = np.concatenate([near[g][1] for g in finite], axis=1)
+        if d2.shape[1] > k:
+            pick = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            ids = np.take_along_axis(ids, pick, axis=1)
+        elif d2.shape[1] < k:
+            # 유한 거리 후보가 모자라면 NaN 거리 후보(공통 컬럼 없음)를 행 순서대로 채운다
+            pool = np.sort(np.concatenate([_groups[g][1] for g in donors if g not in near]))[: k - d2.shape[1]]
+            ids = np.hstack([ids, np.broadcast_to(pool, (n_rows, len(pool)))])
+        block[:, j] = _fit_X[ids, j].mean(axis=1)
+    return block
+
+
+# =========================
+# 대체기
+# =========================
+class TreeKNNImputer:
+    """
+    결측 패턴별 KD-트리 기반 KNN 대체 (수치형 2차원 배열)
+    - n_neighbors: KNNImputer와 같은 의미 (이웃 값의 단순 평균, weights="uniform")
+    - n_workers: 결측 행 블록을 나눠 처리할 프로세스 수 (1이면 현재 프로세스)
+    - block_size: 작업 하나에 담을 결측 행 수 (메모리 ≈ block_size × n_neighbors × 후보 그룹 수)
+    - eps: 0이면 정확한 최근접 이웃, 양수면 근사
+    """
+
+    def __init__(self, n_neighbors: int = 5, n_workers: int = 1, block_size: int = 20_000,
+                 eps: float = 0.0, leafsize: int = 32):
+        self.n_neighbors = n_neighbors
+        self.n_workers = n_workers
+        self.block_size = block_size
+        self.eps = eps
+        self.leafsize = leafsize
+
+    def fit(self, X: np.ndarray) -> "TreeKNNImputer":
+        X = np.array(X, dtype=np.float64)
+        miss = np.isnan(X)
+        patterns, rows = _pattern_groups(miss)
+        self.fit_X_ = X
+        self.groups_ = [(~p, r) for p, r in zip(patterns, rows) if (~p).any()]  # 전부 결측인 행은 후보가 될 수 없음
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.col_means_ = np.where(miss, 0.0, X).sum(axis=0) / (~miss).sum(axis=0)
+        return self
+
+    def _tasks(self, X: np.ndarray):
+        """(행 번호, 관측 마스크, 행 블록) — 같은 패턴끼리 연속되게 만들어 워커의 트리 캐시 적중을 높인다"""
+        miss = np.isnan(X)
+        rows = np.flatnonzero(miss.any(axis=1))
+        patterns, groups = _pattern_groups(miss[rows])
+        for pattern, members in zip(patterns, groups):
+            idx = rows[members]
+            for start in range(0, len(idx), self.block_size):
+                part = idx[start:start + self.block_size]
+                yield part, ~pattern, X[part]
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)  # 복사본을 채워 반환
+        init_args = (self.fit_X_, self.groups_, self.col_means_, self.n_neighbors, self.eps, self.leafsize)
+        tasks = list(self._tasks(X))
+        if not tasks:
+            return X
+        if self.n_workers <= 1:
+            _init_worker(*init_args)
+            for part, observed, block in tasks:
+                X[part] = _impute_block(observed, block)
+        else:
+            with ProcessPoolExecutor(self.n_workers, initializer=_init_worker, initargs=init_args) as pool:
+                filled = pool.map(_impute_block, [t[1] for t in tasks], [t[2] for t in tasks])
+                for (part, _, _), block in zip(tasks, filled):
+                    X[part] = block
+        return X
+
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        return self.fit(X).transform(X)
+
+
+def knn_impute_tree(df: pd.DataFrame, n_neighbors: int = 3, exclude: list[str] | None = None, **kw) -> pd.DataFrame:
+    """
+    4-2-5.py knn_impute와 같은 형태: 수치형=트리 KNN, 범주형=최빈값
+    - kw: TreeKNNImputer 인자 (n_workers, block_size, eps ...)
+    """
+    exclude = ["id"] if exclude is None else exclude
+    df = df.replace({None: np.nan})
+    num_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c not in exclude]
+    cat_cols = [c for c in df.select_dtypes(exclude=[np.number]).columns if c not in exclude]
+    out = df.copy()
+    if num_cols:
+        out[num_cols] = TreeKNNImputer(n_neighbors=n_neighbors, **kw).fit_transform(df[num_cols].to_numpy())
+    if cat_cols:
+        out[cat_cols] = SimpleImputer(strategy="most_frequent").fit_transform(df[cat_cols])
+    return out
+
+
+# =========================
+# 벤치마크
+# =========================
+def make_data(n_rows: int, n_features: int = 8, missing_rate: float = 0.1, seed: int = 42) -> np.ndarray:
+    """상관된 특성 + 행마다 최대 한 컬럼 결측 (결측 행 비율 missing_rate)"""
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n_rows, 2))
+    X = latent @ rng.normal(size=(2, n_features)) + rng.normal(scale=0.3, size=(n_rows, n_features))
+    rows = np.flatnonzero(rng.random(n_rows) < missing_rate)
+    X[rows, rng.integers(0, n_features, len(rows))] = np.nan
+    return X
+
+
+def _load_imputation_demo():
+    """4-2-5.py (파일 이름에 '-'가 있어 import 대신 경로로 불러온다)"""
+    spec = importlib.util.spec_from_file_location("imputation_demo", os.path.join(os.path.dirname(__file__), "4-2-5.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000), n_neighbors: int = 5, n_workers: int | None = None,
+              knn_limit: int = 20_000) -> pd.DataFrame:
+    """
+    행 수별 소요 시간
+    - 4-2-5.py knn_impute는 knn_limit 행 이하에서만 돌려 결과도 비교한다 (그 이상은 제곱 비용으로 생략)
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    demo = _load_imputation_demo()
+    rows = []
+    for n in sizes:
+        X = make_data(n)
+        start = time.perf_counter()
+        tree_out = TreeKNNImputer(n_neighbors=n_neighbors, n_workers=n_workers).fit_transform(X)
+        tree_sec = time.perf_counter() - start
+
+        knn_sec, max_diff = np.nan, np.nan
+        if n <= knn_limit:
+            df = pd.DataFrame(X, columns=[f"x{j}" for j in range(X.shape[1])])
+            start = time.perf_counter()
+            knn_out = demo.knn_impute(df, n_neighbors=n_neighbors).to_numpy()
+            knn_sec = time.perf_counter() - start
+            max_diff = float(np.abs(knn_out - tree_out).max())
+        rows.append({"rows": n, "missing_rows": int(np.isnan(X).any(axis=1).sum()),
+                     "tree_sec": round(tree_sec, 2), "knn_impute_sec": round(knn_sec, 2),
+                     "max_abs_diff": max_diff})
+        print(rows[-1])
+    return pd.DataFrame(rows)
+
+
+def main():
+    # 1) 4-2-5.py 샘플 데이터: knn_impute와 같은 결과
+    df = pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6, 7],
+        "age": [23, None, 31, 29, None, 41, 36],
+        "income": [52000, 61000, None, 58000, 60000, None, 72000],
+        "city": ["Seoul", "Busan", None, "Daejeon", "Seoul", "Seoul", None],
+    })
+    out = knn_impute_tree(df, n_neighbors=3)
+    print("---------- KD-트리 KNN 대체 ---------\n")
+    print(f"{out}\n")
+    pd.testing.assert_frame_equal(out, _load_imputation_demo().knn_impute(df, n_neighbors=3))
+    print("4-2-5.py knn_impute와 결과 일치\n")
+
+    # 2) 10k / 100k / 1M 행
+    print(benchmark().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
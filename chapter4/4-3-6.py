@@ -0,0 +1,228 @@
+# File: outlier_transform_bank.py
+# 목적: 이상치 완화 변환(로그, 제곱근, 표준화)을 여러 컬럼에 한꺼번에 적용하고 분포 지표를 한 번에 계산
+# 내용:
+#   - 4-3-5.py의 OutlierTransformationPractice는 income 한 컬럼(Series)에 변환을 하나씩 적용하고,
+#     _metrics가 변환마다 quantile(2번), skew, median, mean, std, max를 따로 호출한다 → 지표마다 데이터를 다시 훑음.
+#   - TransformBank
+#       1) 원본 2차원 배열(행 × 컬럼)에서 컬럼별 min / 평균 / 표준편차를 한 번만 구해 모든 변환이 공유
+#       2) 변환은 컬럼 방향 브로드캐스트 한 번 (log(X + c), sqrt(X + c), (X - μ) / σ)
+#       3) 모든 변환 결과를 ((변환 × 컬럼) × 행) 배열 하나로 쌓고, 지표를 컬럼 전체에 대해 한 번에 계산
+#          - 분위수/중앙값/최댓값: NaN이 없으면 np.partition(필요한 순위만 선택), 있으면 정렬 한 번
+#          - 평균/표준편차/왜도: 편차 배열 하나에서 2·3차 모멘트를 함께 계산 (pandas와 같은 공식)
+#   - 변환은 register로 추가 가능 (이름 → 함수(X, 통계))
+# 의존성: numpy, pandas
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("mean", "std", "skew", "median", "q1", "q3", "IQR", "max")
+
+
+# ------------------------------
+# 변환 (X: 행 × 컬럼, stats: 컬럼별 min/mean/std)
+# ------------------------------
+def _identity(X: np.ndarray, stats: dict) -> np.ndarray:
+    return X
+
+
+def _log(X: np.ndarray, stats: dict) -> np.ndarray:
+    """4-3-5.py log_transform: min <= 0인 컬럼만 c = 1 - min + 1e-6 시프트"""
+    mn = stats["min"]
+    c = np.where(~np.isnan(mn) & (mn <= 0), 1 - mn + 1e-6, 0.0)
+    return np.log(X + c)
+
+
+def _sqrt(X: np.ndarray, stats: dict) -> np.ndarray:
+    """4-3-5.py sqrt_transform: min < 0인 컬럼만 c = -min + 1e-6 시프트"""
+    mn = stats["min"]
+    c = np.where(~np.isnan(mn) & (mn < 0), -mn + 1e-6, 0.0)
+    return np.sqrt(X + c)
+
+
+def _standardize(X: np.ndarray, stats: dict) -> np.ndarray:
+    """4-3-5.py standardize: 표준편차가 0/NaN인 컬럼은 X * 0"""
+    sd = stats["std"]
+    bad = (sd == 0) | np.isnan(sd)
+    return np.where(bad, X * 0, (X - stats["mean"]) / np.where(bad, 1.0, sd))
+
+
+DEFAULT_TRANSFORMS: dict[str, Callable[[np.ndarray, dict], np.ndarray]] = {
+    "원본": _identity,
+    "로그 변환": _log,
+    "제곱근 변환": _sqrt,
+    "표준화": _standardize,
+}
+
+
+def column_stats(X: np.ndarray) -> dict[str, np.ndarray]:
+    """컬럼별 min / 평균 / 표준편차(ddof=1), NaN 제외 (pandas Series 메서드와 같은 기준)"""
+    valid = ~np.isnan(X)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, X, 0.0).sum(axis=0) / n
+        dev = np.where(valid, X - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=0) / (n - 1))
+    std = np.where(n > 1, std, np.nan)
+    mn = np.where(n > 0, np.min(np.where(valid, X, np.inf), axis=0), np.nan)
+    return {"n": n, "min": mn, "mean": mean, "std": std}
+
+
+def fused_metrics(Y: np.ndarray) -> np.ndarray:
+    """
+    컬럼별 지표를 한 번에: 반환 (len(METRICS), 컬럼 수)
+    - 분위수는 pandas quantile 기본(linear) 보간, 왜도는 pandas skew(편향 보정 Fisher-Pearson)와 같은 공식
+    - 내부에서는 (컬럼 × 행) 배열로 다룬다. Y가 F-순서(pandas 블록 그대로)면 전치해도 복사가 없다.
+    """
+    V = np.ascontiguousarray(Y.T)  # 컬럼 하나가 메모리에 연속 → 축소/선택이 캐시를 따라 진행
+    k, n_rows = V.shape
+    valid = ~np.isnan(V)
+    all_valid = bool(valid.all())
+    n = np.full(k, n_rows) if all_valid else valid.sum(axis=1)
+    W = V if all_valid else np.where(valid, V, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = W.sum(axis=1) / n
+        dev = V - mean[:, None]
+        if not all_valid:
+            dev[~valid] = 0.0
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=1)
+        dev2 *= dev
+        m3 = dev2.sum(axis=1)
+        std = np.sqrt(m2 / (n - 1))
+        # pandas nanskew: 부동소수 오차 수준의 모멘트는 0으로
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        skew = (n * np.sqrt(n - 1) / (n - 2)) * (m3 / m2 ** 1.5)
+    skew = np.where(m2 == 0, 0.0, skew)
+    skew = np.where(n < 3, np.nan, skew)
+    std = np.where(n > 1, std, np.nan)
+
+    # 분위수: 컬럼마다 필요한 순위(q1/중앙값/q3의 아래·위, 최댓값)만 뽑는다
+    qs = np.array([0.25, 0.5, 0.75])
+    rows = np.arange(k)[None, :]
+    if all_valid:
+        pos = qs * (n_rows - 1)
+        lo, hi = np.floor(pos).astype(int), np.ceil(pos).astype(int)
+        kth = np.unique(np.concatenate([lo, hi, [n_rows - 1]]))
+        part = np.partition(V, kth, axis=1)
+        frac = (pos - lo)[:, None]
+        quant = part[:, lo].T + (part[:, hi].T - part[:, lo].T) * frac
+        mx = part[:, n_rows - 1]
+    else:
+        srt = np.sort(V, axis=1)  # NaN은 뒤로
+        pos = qs[:, None] * (n - 1)[None, :]
+        lo = np.clip(np.floor(pos).astype(int), 0, max(n_rows - 1, 0))
+        hi = np.clip(np.ceil(pos).astype(int), 0, max(n_rows - 1, 0))
+        quant = srt[rows, lo] + (srt[rows, hi] - srt[rows, lo]) * (pos - np.floor(pos))
+        quant = np.where(n[None, :] > 0, quant, np.nan)
+        mx = np.where(n > 0, srt[np.arange(k), np.maximum(n - 1, 0)], np.nan)
+
+    q1, median, q3 = quant
+    return np.vstack([mean, std, skew, median, q1, q3, q3 - q1, mx])
+
+
+class TransformBank:
+    """
+    여러 컬럼 × 여러 변환을 한꺼번에
+    - transforms: 적용할 변환 이름 목록 (None이면 DEFAULT_TRANSFORMS 전체)
+    - register(name, fn): fn(X, stats) -> X와 같은 모양의 배열
+    """
+
+    def __init__(self, transforms: Iterable[str] | None = None):
+        self.registry = dict(DEFAULT_TRANSFORMS)
+        self.transforms = list(transforms) if transforms is not None else list(self.registry)
+
+    def register(self, name: str, fn: Callable[[np.ndarray, dict], np.ndarray]) -> "TransformBank":
+        self.registry[name] = fn
+        if name not in self.transforms:
+            self.transforms.append(name)
+        return self
+
+    def apply(self, X: np.ndarray) -> dict[str, np.ndarray]:
+        """변환 이름 → 변환된 2차원 배열"""
+        X = np.asarray(X, dtype=np.float64)
+        stats = column_stats(X)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {name: self.registry[name](X, stats) for name in self.transforms}
+
+    def transform_frame(self, df: pd.DataFrame, columns: list[str] | None = None) -> dict[str, pd.DataFrame]:
+        columns = list(columns) if columns is not None else list(df.select_dtypes(include=[np.number]).columns)
+        out = self.apply(df[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        return {name: pd.DataFrame(Y, index=df.index, columns=columns) for name, Y in out.items()}
+
+    def summary_table(self, df: pd.DataFrame, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        4-3-5.py summary_table의 여러 컬럼 버전
+        - 행: 지표, 열: (컬럼, 변환) MultiIndex
+        """
+        columns = list(columns) if columns is not None else list(df.select_dtypes(include=[np.number]).columns)
+        out = self.apply(df[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        # (변환 × 컬럼) × 행 으로 쌓는다: 변환 결과가 F-순서이므로 .T를 이어 붙이면 복사 한 번으로 끝
+        stacked = np.concatenate([out[name].T for name in self.transforms], axis=0)
+        metrics = fused_metrics(stacked.T)
+        header = pd.MultiIndex.from_product([self.transforms, columns]).swaplevel()
+        table = pd.DataFrame(metrics, index=list(METRICS), columns=header)
+        return table.reindex(columns=pd.MultiIndex.from_product([columns, self.transforms]))
+
+
+# ------------------------------
+# 비교용: 4-3-5.py 방식 (Series 하나씩)
+# ------------------------------
+def series_metrics(s: pd.Series) -> dict:
+    q1 = s.quantile(0.25)
+    q3 = s.quantile(0.75)
+    return {"mean": s.mean(), "std": s.std(ddof=1), "skew": s.skew(), "median": s.median(),
+            "q1": q1, "q3": q3, "IQR": q3 - q1, "max": s.max()}
+
+
+def make_income_frame(n: int = 500, n_outliers: int = 5, n_cols: int = 1, seed: int = 42) -> pd.DataFrame:
+    """4-3-5.py와 같은 방식의 소득 데이터 (컬럼 여러 개)"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for j in range(n_cols):
+        base = rng.lognormal(mean=10.5, sigma=0.6, size=n)
+        outliers = rng.lognormal(mean=13.0, sigma=0.4, size=n_outliers)
+        data["income" if n_cols == 1 else f"income_{j}"] = np.concatenate([base, outliers])
+    return pd.DataFrame(data)
+
+
+def main():
+    bank = TransformBank()
+
+    # 1) 4-3-5.py와 같은 income 한 컬럼
+    df = make_income_frame()
+    table = bank.summary_table(df)["income"]
+    print("========== 이상치 변환 비교 요약 (TransformBank) ==========\n")
+    print(table.round(4).to_string())
+
+    s = df["income"]
+    ref = pd.DataFrame({
+        "원본": series_metrics(s),
+        "로그 변환": series_metrics(np.log(s)),
+        "제곱근 변환": series_metrics(np.sqrt(s)),
+        "표준화": series_metrics((s - s.mean()) / s.std(ddof=1)),
+    })
+    print(f"\n4-3-5.py 방식과 최대 차이: {np.abs(table.to_numpy() - ref.to_numpy()).max():.2e}\n")
+
+    # 2) 200,000행 × 20컬럼: Series 반복 vs 한 번에
+    wide = make_income_frame(n=200_000, n_cols=20)
+    start = time.perf_counter()
+    for c in wide.columns:
+        s = wide[c]
+        for t in (s, np.log(s), np.sqrt(s), (s - s.mean()) / s.std(ddof=1)):
+            series_metrics(t)
+    loop_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bank.summary_table(wide)
+    bank_sec = time.perf_counter() - start
+    print(f"200,000행 × 20컬럼 × 변환 4종: Series 반복 {loop_sec:.2f}s / TransformBank {bank_sec:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# File: streaming_summary_sketch.py
+# 목적: describe 형태의 요약 지표(평균, 표준편차, 왜도, 분위수, IQR, 최솟값/최댓값)를
+#       정렬 없이 한 번의 스트리밍으로 계산 - 정확 모드와 분위수 스케치 모드
+# 내용:
+#   - 4-3-5.py / 4-4-5.py의 _metrics, 4-2-6.py의 numeric_summary(describe)는 quantile을 부를 때마다
+#     컬럼 전체를 정렬하고, 원본 vs 변환 비교표를 만들려면 변환마다 또 정렬한다.
+#   - StreamingSummary (컬럼 하나)
+#       1) 모멘트(개수, 평균, 2·3차 중심 모멘트)를 청크별로 계산해 병합 공식으로 합친다 (Chan/Pébay)
+#       2) 분위수: mode="exact"는 값을 모아 마지막에 한 번 정렬,
+#                  mode="sketch"는 KLL 스케치(레벨별 압축 버퍼) — 메모리 O(k·log(n/k)),
+#                  청크/작업자별 스케치를 merge로 합칠 수 있고 순위 오차는 대략 1.7/k (k=200이면 약 0.8%p 이내가 대부분)
+#       3) 비교표: Min-Max / Z-score / Robust / 표준화는 원본의 아핀 변환이라 원본 통계에서 바로 계산.
+#          로그 / 제곱근처럼 단조 증가 변환은 분위수를 원본 분위수에서 옮기고, 모멘트만 같은 패스에서 함께 누적.
+#          → 원본 + 변환 여러 개의 표를 데이터 한 번 읽기로 만든다.
+# 의존성: numpy, pandas
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# 모멘트 (병합 가능)
+# =========================
+class Moments:
+    """개수 / 평균 / M2 / M3 (중심 모멘트 합)"""
+
+    __slots__ = ("n", "mean", "m2", "m3")
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0, m3: float = 0.0):
+        self.n, self.mean, self.m2, self.m3 = n, mean, m2, m3
+
+    @classmethod
+    def of(cls, x: np.ndarray) -> "Moments":
+        n = len(x)
+        if n == 0:
+            return cls()
+        mean = float(x.mean())
+        d = x - mean
+        d2 = d * d
+        return cls(n, mean, float(d2.sum()), float((d2 * d).sum()))
+
+    def merge(self, other: "Moments") -> "Moments":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.m3 = other.n, other.mean, other.m2, other.m3
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+        self.m3 = m3
+        self.mean += delta * nb / n
+        self.n = n
+        return self
+
+    def std(self, ddof: int = 1) -> float:
+        return float(np.sqrt(self.m2 / (self.n - ddof))) if self.n > ddof else np.nan
+
+    def skew(self) -> float:
+        """pandas Series.skew와 같은 편향 보정 Fisher-Pearson 계수"""
+        n = self.n
+        if n < 3:
+            return np.nan
+        m2 = 0.0 if abs(self.m2) < 1e-14 else self.m2
+        if m2 == 0:
+            return 0.0
+        return float(n * np.sqrt(n - 1) / (n - 2) * self.m3 / m2 ** 1.5)
+
+
+# =========================
+# KLL 분위수 스케치
+# =========================
+class KLLSketch:
+    """
+    KLL 스케치 (Karnin-Lang-Liberty)
+    - 레벨 h의 값 하나는 원본 값 2^h개를 대표한다.
+    - 레벨이 용량을 넘으면 정렬 후 무작위 오프셋으로 한 칸 건너 하나씩 위 레벨로 올린다 (나머지는 버림).
+    - 용량: 가장 높은 레벨이 k, 아래로 갈수록 2/3배 (최소 2)
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buf = np.sort(buf)  # 한 번 정렬하면 위로 올린 값도 정렬 상태 → 다음 레벨은 짧은 구간 병합 수준
+                keep = buf[-1:] if len(buf) % 2 else buf[:0]
+                even = buf[: len(buf) - len(keep)]
+                promoted = even[self._rng.integers(2)::2]
+                self.levels[h] = keep.copy()
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def update(self, x: np.ndarray) -> None:
+        if len(x) == 0:
+            return
+        self.n += len(x)
+        self.levels[0] = np.concatenate([self.levels[0], x])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        if other.k != self.k:
+            raise ValueError("k가 다른 스케치는 합칠 수 없습니다.")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, buf in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs: np.ndarray) -> np.ndarray:
+        """
+        가중 누적분포에서 이웃한 값 사이를 선형 보간 (np.quantile / pandas quantile의 linear와 같은 정의)
+        - 값 하나(가중치 w)는 순위 구간의 가운데(cum - w + (w - 1) / 2)에 놓는다
+          → 압축 전(가중치가 모두 1)이면 정확한 분위수와 같다.
+        """
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(b), 2 ** h, dtype=np.int64) for h, b in enumerate(self.levels)])
+        order = np.argsort(items)
+        items, w = items[order], weights[order]
+        cum = np.cumsum(w)
+        ranks = cum - w + (w - 1) / 2
+        return np.interp(np.asarray(qs, dtype=np.float64) * (cum[-1] - 1), ranks, items)
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self.levels)
+
+
+# =========================
+# 컬럼 요약
+# =========================
+QS = np.array([0.25, 0.5, 0.75])
+
+
+class StreamingSummary:
+    """
+    컬럼 하나의 스트리밍 요약
+    - mode: "exact"(값 보관, 마지막에 정렬 한 번) / "sketch"(KLL, 고정 메모리, 병합 가능)
+    - transforms: {이름: 단조 증가 함수} — 모멘트를 같은 패스에서 함께 누적 (예: {"로그 변환": np.log})
+    """
+
+    def __init__(self, mode: str = "sketch", k: int = 200,
+                 transforms: dict[str, Callable[[np.ndarray], np.ndarray]] | None = None, seed: int | None = None):
+        if mode not in ("exact", "sketch"):
+            raise ValueError(f"지원하지 않는 mode: {mode}")
+        self.mode = mode
+        self.transforms = dict(transforms or {})
+        self.moments = Moments()
+        self.t_moments = {name: Moments() for name in self.transforms}
+        self.min, self.max = np.inf, -np.inf
+        self._chunks: list[np.ndarray] = []
+        self.sketch = KLLSketch(k, seed) if mode == "sketch" else None
+
+    def update(self, values) -> "StreamingSummary":
+        x = np.asarray(values, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+        self.moments.merge(Moments.of(x))
+        for name, f in self.transforms.items():
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.t_moments[name].merge(Moments.of(f(x)))
+        self.min, self.max = min(self.min, float(x.min())), max(self.max, float(x.max()))
+        if self.sketch is not None:
+            self.sketch.update(x)
+        else:
+            self._chunks.append(x)
+        return self
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        if other.mode != self.mode or other.transforms.keys() != self.transforms.keys():
+            raise ValueError("mode 또는 transforms 구성이 다른 요약은 합칠 수 없습니다.")
+        self.moments.merge(other.moments)
+        for name in self.transforms:
+            self.t_moments[name].merge(other.t_moments[name])
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+        else:
+            self._chunks.extend(other._chunks)
+        return self
+
+    @property
+    def n(self) -> int:
+        return self.moments.n
+
+    def quantile_points(self, qs: np.ndarray = QS) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        분위수 (아래 값, 위 값, 보간 비율) — pandas quantile(linear)과 같은 정의
+        - sketch 모드는 (근사값, 근사값, 0)
+        - 단조 증가 f에 대해 f(아래) + (f(위) - f(아래)) × 비율 이 변환된 데이터의 분위수
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            nan = np.full(len(qs), np.nan)
+            return nan, nan, np.zeros(len(qs))
+        if self.sketch is not None:
+            v = self.sketch.quantiles(qs)
+            return v, v, np.zeros(len(qs))
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        data = self._chunks[0]
+        pos = qs * (len(data) - 1)
+        lo, hi = np.floor(pos).astype(int), np.ceil(pos).astype(int)
+        part = np.partition(data, np.unique(np.concatenate([lo, hi])))
+        return part[lo], part[hi], pos - lo
+
+    def _table(self, mean, std, skew, mn, mx, lo, hi, frac) -> dict:
+        q1, median, q3 = lo + (hi - lo) * frac
+        return {"mean": mean, "std": std, "skew": skew, "min": mn, "q1": q1, "median": median,
+                "q3": q3, "IQR": q3 - q1, "max": mx}
+
+    def metrics(self) -> dict:
+        lo, hi, frac = self.quantile_points()
+        m = self.moments
+        return self._table(m.mean, m.std(), m.skew(), self.min, self.max, lo, hi, frac)
+
+    def affine_metrics(self, a: float, b: float) -> dict:
+        """y = a·x + b (a > 0) 의 지표 — 데이터를 다시 읽지 않음"""
+        lo, hi, frac = self.quantile_points()
+        m = self.moments
+        return self._table(a * m.mean + b, a * m.std(), m.skew(), a * self.min + b, a * self.max + b,
+                           a * lo + b, a * hi + b, frac)
+
+    def transform_metrics(self, name: str) -> dict:
+        """등록한 단조 증가 변환의 지표 (모멘트는 누적값, 분위수/최솟값/최댓값은 원본에서 옮김)"""
+        f = self.transforms[name]
+        lo, hi, frac = self.quantile_points()
+        m = self.t_moments[name]
+        mn, mx = f(np.array([self.min, self.max]))
+        return self._table(m.mean, m.std(), m.skew(), mn, mx, f(lo), f(hi), frac)
+
+
+# =========================
+# 비교표 (4-3-5.py / 4-4-5.py 형식)
+# =========================
+SCALER_ROWS = ["mean", "std", "min", "q1", "median", "q3", "IQR", "max"]
+TRANSFORM_ROWS = ["mean", "std", "skew", "median", "q1", "q3", "IQR", "max"]
+
+
+def scaler_table(summary: StreamingSummary) -> pd.DataFrame:
+    """4-4-5.py _summary_by_column: 원본 | Min-Max | Z-score(모표준편차) | Robust(중앙값, IQR)"""
+    base = summary.metrics()
+    span = summary.max - summary.min
+    sd0 = summary.moments.std(ddof=0)
+    cols = {
+        "원본": base,
+        "Min-Max": summary.affine_metrics(1 / span, -summary.min / span) if span > 0 else None,
+        "Z-score": summary.affine_metrics(1 / sd0, -summary.moments.mean / sd0) if sd0 > 0 else None,
+        "Robust": summary.affine_metrics(1 / base["IQR"], -base["median"] / base["IQR"]) if base["IQR"] > 0 else None,
+    }
+    return pd.DataFrame({k: v for k, v in cols.items() if v is not None}).loc[SCALER_ROWS]
+
+
+def transform_table(summary: StreamingSummary) -> pd.DataFrame:
+    """4-3-5.py summary_table: 원본 | (등록한 단조 변환들) | 표준화"""
+    base = summary.metrics()
+    cols = {"원본": base}
+    for name in summary.transforms:
+        cols[name] = summary.transform_metrics(name)
+    sd = summary.moments.std()
+    if sd > 0:
+        cols["표준화"] = summary.affine_metrics(1 / sd, -summary.moments.mean / sd)
+    return pd.DataFrame(cols).loc[TRANSFORM_ROWS]
+
+
+def describe(summaries: dict[str, StreamingSummary]) -> pd.DataFrame:
+    """4-2-6.py numeric_summary(describe().T)와 같은 모양"""
+    rows = {}
+    for col, s in summaries.items():
+        m = s.metrics()
+        rows[col] = {"count": float(s.n), "mean": m["mean"], "std": m["std"], "min": m["min"],
+                     "25%": m["q1"], "50%": m["median"], "75%": m["q3"], "max": m["max"]}
+    return pd.DataFrame(rows).T
+
+
+def summarize(chunks: Iterable[pd.DataFrame], columns: list[str] | None = None, **kw) -> dict[str, StreamingSummary]:
+    """DataFrame 청크 스트림 → 컬럼별 StreamingSummary (kw: mode, k, transforms, seed)"""
+    out: dict[str, StreamingSummary] = {}
+    for chunk in chunks:
+        cols = columns if columns is not None else list(chunk.select_dtypes(include=[np.number]).columns)
+        for c in cols:
+            if c not in out:
+                out[c] = StreamingSummary(**kw)
+            out[c].update(chunk[c].to_numpy(dtype=np.float64, na_value=np.nan))
+    return out
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    # 1) 4-4-5.py / 4-3-5.py 형식 비교표 (정확 모드 = pandas 결과와 같음)
+    income = np.concatenate([rng.lognormal(2.8, 0.5, 300) * 100, rng.lognormal(4.2, 0.25, 5) * 100])
+    exact = StreamingSummary("exact", transforms={"로그 변환": np.log, "제곱근 변환": np.sqrt})
+    for chunk in np.array_split(income, 7):
+        exact.update(chunk)
+    print("---------- 변수: income_m (스케일러 비교, 정확 모드) ----------\n")
+    print(scaler_table(exact).round(4).to_string(), "\n")
+    print("---------- 변수: income_m (변환 비교, 정확 모드) ----------\n")
+    print(transform_table(exact).round(4).to_string(), "\n")
+
+    # 2) 1,000만 행 비교표: 4-4-5.py 방식(원본 + 스케일 결과 3개에 _metrics) vs 청크 10개 스케치 → merge
+    n, n_chunks = 10_000_000, 10
+    big = rng.lognormal(10.5, 0.6, n)
+    start = time.perf_counter()
+    s = pd.Series(big)
+    scaled = [s, (s - s.min()) / (s.max() - s.min()), (s - s.mean()) / s.std(ddof=0),
+              (s - s.median()) / (s.quantile(0.75) - s.quantile(0.25))]
+    for t in scaled:
+        t.mean(), t.std(ddof=1), t.min(), t.quantile(0.25), t.median(), t.quantile(0.75), t.max()
+    pandas_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parts = [StreamingSummary("sketch", k=200, seed=i).update(c) for i, c in enumerate(np.array_split(big, n_chunks))]
+    sketch = parts[0]
+    for p in parts[1:]:
+        sketch.merge(p)
+    scaler_table(sketch)
+    sketch_sec = time.perf_counter() - start
+
+    exact_q = s.quantile(QS).to_numpy()
+    approx_q = sketch.quantile_points()[0]
+    rank_err = np.abs(np.searchsorted(np.sort(big), approx_q) / n - QS)
+    print(f"1,000만 행 스케일러 비교표: pandas _metrics 방식 {pandas_sec:.2f}s / KLL 스케치(청크 {n_chunks}개 병합) {sketch_sec:.2f}s")
+    print(f"  Q1/중앙값/Q3 정확값 {np.round(exact_q, 1)} / 근사값 {np.round(approx_q, 1)}")
+    print(f"  순위 오차 최대 {rank_err.max():.4%}, 스케치 보관 값 {len(sketch.sketch):,}개")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# File: streaming_scalers.py
+# 목적: Min-Max / Z-score(Standard) / Robust 스케일러를 청크 단위로 학습(partial_fit)하고,
+#       작업자별 결과를 병합하고, 저장한 뒤 메모리 맵 배열에 제자리(in-place)로 적용
+# 내용:
+#   - 4-4-5.py의 NormalizationPractice._fit_transform은 scaler.fit_transform(self.df[num_cols])로
+#     전체 데이터를 메모리에 올리고, RobustScaler는 컬럼마다 정확한 분위수(정렬)가 필요하다.
+#   - StreamingMinMaxScaler  : 컬럼별 누적 min / max
+#   - StreamingStandardScaler: 컬럼별 개수 / 평균 / M2 — 청크 통계를 Chan 병합 공식으로 합침 (Welford와 같은 결과)
+#   - StreamingRobustScaler  : 컬럼별 KLL 분위수 스케치 (4-3-7.py의 KLLSketch) → 중앙값 / IQR 근사
+#   - 공통: partial_fit(청크) / merge(다른 작업자 결과) / save·load(pickle)
+#           transform: X·scale_ + min_ 형태의 아핀 변환 하나 → out=에 바로 쓰기, dtype=np.float32 출력 선택
+#           transform_memmap: np.memmap을 행 블록 단위로 읽어 제자리 변환(또는 float32 memmap에 기록)
+#   - NaN은 sklearn과 같이 학습에서 제외하고 변환 후에도 NaN으로 둔다.
+# 의존성: numpy, pandas, scikit-learn(비교용), 같은 폴더의 4-3-7.py(KLLSketch)
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import pickle
+import sys
+import tempfile
+import time
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+
+# =========================
+# KLL 분위수 스케치: 4-3-7.py의 KLLSketch를 그대로 쓴다
+# =========================
+def _load_summary_sketch():
+    """
+    4-3-7.py (파일 이름에 '-'가 있어 import 대신 경로로 불러온다)
+    - sys.modules에 등록해 두어야 KLLSketch가 든 스케일러를 pickle로 저장/복원할 수 있다
+    """
+    name = "streaming_summary_sketch"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(os.path.dirname(__file__), "4-3-7.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+KLLSketch = _load_summary_sketch().KLLSketch
+
+
+# =========================
+# 공통 부분
+# =========================
+def _as_2d(X) -> np.ndarray:
+    a = X.to_numpy(dtype=np.float64, na_value=np.nan) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=np.float64)
+    return a.reshape(-1, 1) if a.ndim == 1 else a
+
+
+class StreamingScaler:
+    """
+    청크 학습 스케일러 공통 기반
+    - 하위 클래스는 _update(X) / _merge(other) / _params() -> (scale_, min_) 를 구현
+    - 변환은 X * scale_ + min_ (sklearn MinMaxScaler와 같은 표기)
+    """
+
+    def __init__(self):
+        self.n_features_in_: int | None = None
+        self.n_samples_seen_ = 0
+        self._fitted: tuple[np.ndarray, np.ndarray] | None = None
+
+    def partial_fit(self, X) -> "StreamingScaler":
+        X = _as_2d(X)
+        if self.n_features_in_ is None:
+            self.n_features_in_ = X.shape[1]
+            self._init(X.shape[1])
+        elif X.shape[1] != self.n_features_in_:
+            raise ValueError(f"컬럼 수가 다릅니다: {X.shape[1]} != {self.n_features_in_}")
+        if len(X):
+            self._update(X)
+            self.n_samples_seen_ += len(X)
+        self._fitted = None
+        return self
+
+    def fit_chunks(self, chunks: Iterable) -> "StreamingScaler":
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def merge(self, other: "StreamingScaler") -> "StreamingScaler":
+        """다른 작업자가 학습한 같은 종류의 스케일러를 합친다"""
+        if type(other) is not type(self):
+            raise TypeError(f"{type(self).__name__}와 {type(other).__name__}는 합칠 수 없습니다.")
+        if other.n_features_in_ is None:
+            return self
+        if self.n_features_in_ is None:
+            self.n_features_in_ = other.n_features_in_
+            self._init(other.n_features_in_)
+        self._merge(other)
+        self.n_samples_seen_ += other.n_samples_seen_
+        self._fitted = None
+        return self
+
+    @property
+    def params_(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.n_features_in_ is None:
+            raise RuntimeError("partial_fit을 먼저 호출하세요.")
+        if self._fitted is None:
+            self._fitted = self._params()
+        return self._fitted
+
+    @property
+    def scale_(self) -> np.ndarray:
+        return self.params_[0]
+
+    @property
+    def min_(self) -> np.ndarray:
+        return self.params_[1]
+
+    def transform(self, X, out: np.ndarray | None = None, dtype=np.float64) -> np.ndarray:
+        """
+        X * scale_ + min_
+        - out: 결과를 쓸 배열 (X 자신을 주면 제자리 변환)
+        - dtype: out이 없을 때 새로 만들 배열의 dtype (np.float32면 메모리 절반)
+        """
+        X = X if isinstance(X, np.ndarray) and X.ndim == 2 else _as_2d(X)
+        scale, shift = self.params_
+        if out is None:
+            out = np.empty(X.shape, dtype=dtype)
+        np.multiply(X, scale.astype(out.dtype), out=out, casting="same_kind")
+        out += shift.astype(out.dtype)
+        return out
+
+    def transform_memmap(self, src: np.ndarray, out: np.ndarray | None = None, chunk_rows: int = 1_000_000) -> np.ndarray:
+        """
+        메모리 맵 배열을 행 블록 단위로 변환
+        - out=None이면 src에 제자리로 쓴다 (src는 r+ 모드)
+        - out에 float32 memmap을 주면 변환 결과만 float32로 기록
+        """
+        dst = src if out is None else out
+        if dst.shape != src.shape:
+            raise ValueError(f"출력 모양이 다릅니다: {dst.shape} != {src.shape}")
+        for start in range(0, len(src), chunk_rows):
+            block = slice(start, start + chunk_rows)
+            self.transform(src[block], out=dst[block])
+        if isinstance(dst, np.memmap):
+            dst.flush()
+        return dst
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str) -> "StreamingScaler":
+        with open(path, "rb") as f:
+            scaler = pickle.load(f)
+        if not isinstance(scaler, StreamingScaler):
+            raise TypeError(f"{path}: StreamingScaler가 아닙니다.")
+        return scaler
+
+
+def _safe_scale(scale: np.ndarray) -> np.ndarray:
+    """sklearn과 같이 0(상수 컬럼)인 스케일은 1로"""
+    return np.where((scale == 0) | ~np.isfinite(scale), 1.0, scale)
+
+
+# =========================
+# 스케일러 3종
+# =========================
+class StreamingMinMaxScaler(StreamingScaler):
+    """컬럼별 누적 min / max → feature_range로 선형 변환"""
+
+    def __init__(self, feature_range: tuple[float, float] = (0.0, 1.0)):
+        super().__init__()
+        self.feature_range = feature_range
+
+    def _init(self, d: int) -> None:
+        self.data_min_ = np.full(d, np.inf)
+        self.data_max_ = np.full(d, -np.inf)
+
+    def _update(self, X: np.ndarray) -> None:
+        np.fmin(self.data_min_, np.fmin.reduce(X, axis=0), out=self.data_min_)  # fmin/fmax: NaN 무시
+        np.fmax(self.data_max_, np.fmax.reduce(X, axis=0), out=self.data_max_)
+
+    def _merge(self, other: "StreamingMinMaxScaler") -> None:
+        np.fmin(self.data_min_, other.data_min_, out=self.data_min_)
+        np.fmax(self.data_max_, other.data_max_, out=self.data_max_)
+
+    def _params(self) -> tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.feature_range
+        scale = (hi - lo) / _safe_scale(self.data_max_ - self.data_min_)
+        return scale, lo - self.data_min_ * scale
+
+
+class StreamingStandardScaler(StreamingScaler):
+    """컬럼별 개수 / 평균 / M2 (편차 제곱합) → (X - 평균) / 모표준편차"""
+
+    def _init(self, d: int) -> None:
+        self.count_ = np.zeros(d, dtype=np.int64)
+        self.mean_ = np.zeros(d)
+        self.m2_ = np.zeros(d)
+
+    def _combine(self, nb: np.ndarray, mb: np.ndarray, m2b: np.ndarray) -> None:
+        na = self.count_
+        n = na + nb
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mb - self.mean_
+            w = np.where(n > 0, nb / n, 0.0)
+            self.m2_ = self.m2_ + np.where(nb > 0, m2b, 0.0) + np.where(nb > 0, delta * delta * na * w, 0.0)
+            self.mean_ = np.where(nb > 0, self.mean_ + delta * w, self.mean_)
+        self.count_ = n
+
+    def _update(self, X: np.ndarray) -> None:
+        valid = ~np.isnan(X)
+        nb = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mb = np.where(valid, X, 0.0).sum(axis=0) / nb
+            dev = np.where(valid, X - mb, 0.0)
+        self._combine(nb, mb, (dev * dev).sum(axis=0))
+
+    def _merge(self, other: "StreamingStandardScaler") -> None:
+        self._combine(other.count_, other.mean_, other.m2_)
+
+    @property
+    def var_(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.m2_ / self.count_
+
+    def _params(self) -> tuple[np.ndarray, np.ndarray]:
+        scale = 1 / _safe_scale(np.sqrt(self.var_))
+        return scale, -self.mean_ * scale
+
+
+class StreamingRobustScaler(StreamingScaler):
+    """
+    컬럼별 KLL 스케치 → (X - 중앙값) / (Q3 - Q1)
+    - k가 클수록 정확(순위 오차 대략 1.7/k), 스케치 크기는 컬럼당 O(k·log(n/k))
+    """
+
+    def __init__(self, quantile_range: tuple[float, float] = (25.0, 75.0), k: int = 200, seed: int | None = None):
+        super().__init__()
+        self.quantile_range = quantile_range
+        self.k = k
+        self.seed = seed
+
+    def _init(self, d: int) -> None:
+        seeds = np.random.SeedSequence(self.seed).spawn(d)
+        self.sketches_ = [KLLSketch(self.k, s) for s in seeds]
+
+    def _update(self, X: np.ndarray) -> None:
+        for j, sketch in enumerate(self.sketches_):
+            x = X[:, j]
+            sketch.update(x[~np.isnan(x)])
+
+    def _merge(self, other: "StreamingRobustScaler") -> None:
+        for a, b in zip(self.sketches_, other.sketches_):
+            a.merge(b)
+
+    def _params(self) -> tuple[np.ndarray, np.ndarray]:
+        q_lo, q_hi = self.quantile_range
+        qs = np.array([q_lo / 100, 0.5, q_hi / 100])
+        table = np.array([s.quantiles(qs) for s in self.sketches_])  # (컬럼, 3)
+        self._center = table[:, 1]
+        scale = 1 / _safe_scale(table[:, 2] - table[:, 0])
+        return scale, -self._center * scale
+
+    @property
+    def center_(self) -> np.ndarray:
+        """중앙값 (sklearn RobustScaler.center_)"""
+        self.params_
+        return self._center
+
+
+# =========================
+# 실습용 데이터 (4-4-5.py와 같은 분포)
+# =========================
+NUM_COLS = ["height_cm", "weight_kg", "income_m"]
+
+
+def make_dataset(n: int = 300, n_outliers: int = 5, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    height = np.concatenate([rng.normal(170, 7, n), rng.normal(170, 7, n_outliers)])
+    weight = np.concatenate([rng.normal(70, 12, n), rng.normal(70, 12, n_outliers)])
+    income = np.concatenate([rng.lognormal(2.8, 0.5, n) * 100, rng.lognormal(4.2, 0.25, n_outliers) * 100])
+    return pd.DataFrame({"height_cm": height, "weight_kg": weight, "income_m": income})
+
+
+def write_memmap(path: str, n: int, chunk_rows: int = 1_000_000, seed: int = 0) -> np.memmap:
+    """n행 × 3컬럼 float64 memmap 파일을 청크 단위로 생성"""
+    mm = np.memmap(path, dtype=np.float64, mode="w+", shape=(n, len(NUM_COLS)))
+    for i, start in enumerate(range(0, n, chunk_rows)):
+        rows = min(chunk_rows, n - start)
+        mm[start:start + rows] = make_dataset(rows, 0, seed + i).to_numpy()
+    mm.flush()
+    return mm
+
+
+def main():
+    # 1) 4-4-5.py 데이터: 청크 학습 결과 vs sklearn fit_transform
+    #    (n <= k면 Robust 스케치는 압축 전 — 가중치가 모두 1이라 보간 분위수가 sklearn과 같다)
+    df = make_dataset()
+    X = df[NUM_COLS].to_numpy()
+    pairs = {
+        "Min-Max": (StreamingMinMaxScaler(), MinMaxScaler()),
+        "Z-score": (StreamingStandardScaler(), StandardScaler()),
+        "Robust": (StreamingRobustScaler(k=400, seed=0), RobustScaler()),
+    }
+    print("========== 청크(50행) 학습 vs sklearn (컬럼별 최대 차이) ==========\n")
+    diffs = {}
+    for name, (stream, ref) in pairs.items():
+        stream.fit_chunks(X[i:i + 50] for i in range(0, len(X), 50))
+        diffs[name] = np.abs(stream.transform(X) - ref.fit_transform(X)).max(axis=0)
+    print(pd.DataFrame(diffs, index=NUM_COLS).map(lambda x: f"{x:.2e}").to_string(), "\n")
+
+    # 2) 1,000만 행 memmap: 작업자 4개 분량으로 나눠 학습 → merge → 저장/복원 → 제자리 변환 / float32 출력
+    n, chunk_rows = 10_000_000, 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        src_path = os.path.join(tmp, "data.f64")
+        mm = write_memmap(src_path, n, chunk_rows)
+
+        start = time.perf_counter()
+        bounds = np.linspace(0, n, 5).astype(int)
+        merged = {}
+        for name, make in (("Min-Max", StreamingMinMaxScaler),
+                           ("Z-score", StreamingStandardScaler),
+                           ("Robust", lambda: StreamingRobustScaler(seed=0))):
+            parts = [make().fit_chunks(mm[s:e][i:i + chunk_rows] for i in range(0, e - s, chunk_rows))
+                     for s, e in zip(bounds[:-1], bounds[1:])]
+            merged[name] = parts[0]
+            for p in parts[1:]:
+                merged[name].merge(p)
+        fit_sec = time.perf_counter() - start
+
+        path = os.path.join(tmp, "robust.pkl")
+        merged["Robust"].save(path)
+        robust = StreamingScaler.load(path)
+
+        start = time.perf_counter()
+        out32 = np.memmap(os.path.join(tmp, "robust.f32"), dtype=np.float32, mode="w+", shape=mm.shape)
+        robust.transform_memmap(mm, out=out32, chunk_rows=chunk_rows)
+        f32_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        merged["Z-score"].transform_memmap(mm, chunk_rows=chunk_rows)  # 원본 파일을 제자리 변환
+        inplace_sec = time.perf_counter() - start
+
+        z = merged["Z-score"]
+        print(f"1,000만 행 × {len(NUM_COLS)}컬럼: 스케일러 3종 학습(4분할 + merge) {fit_sec:.2f}s, "
+              f"Robust → float32 memmap {f32_sec:.2f}s, Z-score 제자리 변환 {inplace_sec:.2f}s")
+        print(f"  Z-score 변환 후 평균 {np.round(mm[:].mean(axis=0), 6)} / 표준편차 {np.round(mm[:].std(axis=0), 6)}")
+        print(f"  Robust 중앙값 근사 {np.round(robust.center_, 3)} / float32 결과 중앙값 {np.round(np.median(out32, axis=0), 4)}")
+        print(f"  Robust 스케일러 pickle 크기 {os.path.getsize(path):,} bytes, 학습 행 {z.n_samples_seen_:,}")
+        del mm, out32
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# ============================================
+# 🇰🇷 Okt 형태소 분석 병렬화: 워커 풀 기반 토큰화 서비스
+# ============================================
+# - 9-3-3.py, 9-4-2.py, 9-6-5.py는 Okt() 하나(JVM 하나)로 문서 전체를 한 번에 분석한다.
+# - 리뷰 수백만 건을 처리하려면 문서를 문장/문단 단위 묶음(batch)으로 나눠
+#   여러 프로세스(프로세스마다 JVM + Okt 하나)에서 동시에 분석해야 한다.
+# - 이 스크립트는
+#   1) 문서를 문장/문단으로 나누고, 글자 수 기준으로 묶음을 만든다.
+#   2) ProcessPoolExecutor의 initializer에서 워커마다 Okt()를 한 번만 만든다.
+#   3) 결과를 문서 순서대로 다시 모아 (문서 번호, 토큰 목록)을 스트리밍으로 돌려준다.
+#   4) 워커별 처리량(글자/초, 토큰/초)을 기록한다.
+# 의존성: konlpy (+ Java), Python 3.10+
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+# 문장 경계: 마침표/물음표/느낌표 뒤 공백, 또는 줄바꿈
+SENTENCE_SPLIT = re.compile(r"(?<=[.?!])\s+|\n+")
+# 문단 경계: 빈 줄
+PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+# =========================
+# 워커 프로세스 쪽 코드
+# =========================
+_analyzer = None        # 워커 프로세스마다 하나씩 생성되는 형태소 분석기 (JVM 하나)
+_analyze = None         # (분석기, 텍스트) -> 토큰 목록
+
+
+def make_okt():
+    """기본 분석기 생성 함수 (워커 프로세스 안에서 호출된다)"""
+    from konlpy.tag import Okt
+    return Okt()
+
+
+def _init_worker(factory: Callable, mode: str, norm: bool, stem: bool) -> None:
+    """
+    프로세스 풀 initializer
+    - 워커가 뜰 때 한 번만 Okt()를 만들어 전역에 보관 → 묶음마다 JVM을 새로 띄우지 않는다.
+    """
+    global _analyzer, _analyze
+    _analyzer = factory()
+    if mode == "nouns":
+        _analyze = lambda a, t: a.nouns(t)
+    elif mode == "morphs":
+        _analyze = lambda a, t: a.morphs(t, norm=norm, stem=stem)
+    elif mode == "pos":
+        _analyze = lambda a, t: a.pos(t, norm=norm, stem=stem)
+    else:
+        raise ValueError(f"지원하지 않는 mode: {mode}")
+
+
+def _tokenize_batch(batch_id: int, segments: list[tuple[int, str]]) -> tuple[int, int, list[tuple[int, list]], float, int]:
+    """
+    묶음 하나를 분석한다.
+    반환: (묶음 번호, 워커 pid, [(문서 번호, 토큰 목록)], 소요 시간, 글자 수)
+    """
+    start = time.perf_counter()
+    out = [(doc_id, _analyze(_analyzer, text) if text else []) for doc_id, text in segments]
+    n_chars = sum(len(text) for _, text in segments)
+    return batch_id, os.getpid(), out, time.perf_counter() - start, n_chars
+
+
+# =========================
+# 메인 프로세스 쪽 코드
+# =========================
+def split_document(text: str, unit: str = "sentence") -> list[str]:
+    """문서를 문장 또는 문단으로 나눈다 (빈 조각은 버림)"""
+    pattern = SENTENCE_SPLIT if unit == "sentence" else PARAGRAPH_SPLIT
+    return [seg.strip() for seg in pattern.split(text) if seg and seg.strip()]
+
+
+@dataclass
+class WorkerStats:
+    """워커(프로세스) 하나의 누적 처리량"""
+    batches: int = 0
+    chars: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chars_per_sec(self) -> float:
+        return self.chars / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+
+class OktTokenizerPool:
+    """
+    Okt 워커 풀 토큰화 서비스
+    - with 문으로 열고 닫는다 (워커 프로세스와 JVM 정리).
+    - iter_tokens(docs): 문서 순서를 지키며 (문서 번호, 토큰 목록)을 하나씩 돌려준다.
+    - max_pending: 동시에 제출해 두는 묶음 수 상한 → 입력이 수백만 건이어도 메모리가 일정하다.
+    """
+
+    def __init__(
+        self,
+        n_workers: int | None = None,
+        mode: str = "nouns",
+        unit: str = "sentence",
+        batch_chars: int = 20_000,
+        max_pending: int | None = None,
+        norm: bool = False,
+        stem: bool = False,
+        factory: Callable = make_okt,
+    ):
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.unit = unit
+        self.batch_chars = batch_chars
+        self.max_pending = max_pending or self.n_workers * 2
+        self._init_args = (factory, mode, norm, stem)
+        self.stats: dict[int, WorkerStats] = defaultdict(WorkerStats)
+        self.wall_seconds = 0.0
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "OktTokenizerPool":
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=self._init_args,
+        )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _batches(self, docs: Iterable[str]) -> Iterator[list[tuple[int, str]]]:
+        """
+        (문서 번호, 조각) 목록을 batch_chars 글자 단위로 묶는다.
+        - 빈 문서도 ("", 문서 번호) 조각 하나를 넣어 결과에서 빠지지 않게 한다.
+        """
+        batch, size = [], 0
+        for doc_id, doc in enumerate(docs):
+            segments = split_document(doc, self.unit) or [""]
+            for seg in segments:
+                batch.append((doc_id, seg))
+                size += len(seg)
+                if size >= self.batch_chars:
+                    yield batch
+                    batch, size = [], 0
+        if batch:
+            yield batch
+
+    def iter_tokens(self, docs: Iterable[str]) -> Iterator[tuple[int, list]]:
+        """
+        문서 순서를 보존하는 스트리밍 토큰화
+        - 묶음은 제출 순서대로 결과를 꺼내므로(deque의 앞에서부터 대기) 순서가 유지된다.
+        - 한 문서가 여러 묶음에 걸쳐 있으면 토큰을 이어 붙인 뒤, 다음 문서가 시작될 때 내보낸다.
+        """
+        if self._pool is None:
+            raise RuntimeError("with OktTokenizerPool(...) as pool: 형태로 사용하세요.")
+
+        start = time.perf_counter()
+        pending: deque = deque()
+        current_doc, current_tokens = None, []
+
+        def drain_one():
+            nonlocal current_doc, current_tokens
+            _, pid, out, seconds, n_chars = pending.popleft().result()
+            st = self.stats[pid]
+            st.batches += 1
+            st.chars += n_chars
+            st.seconds += seconds
+            for doc_id, tokens in out:
+                st.tokens += len(tokens)
+                if doc_id != current_doc:
+                    if current_doc is not None:
+                        yield current_doc, current_tokens
+                    current_doc, current_tokens = doc_id, []
+                current_tokens.extend(tokens)
+
+        for batch_id, batch in enumerate(self._batches(docs)):
+            pending.append(self._pool.submit(_tokenize_batch, batch_id, batch))
+            if len(pending) >= self.max_pending:
+                yield from drain_one()
+        while pending:
+            yield from drain_one()
+        if current_doc is not None:
+            yield current_doc, current_tokens
+
+        self.wall_seconds += time.perf_counter() - start
+
+    def tokenize(self, docs: Iterable[str]) -> list[list]:
+        """문서별 토큰 목록을 한꺼번에 돌려주는 편의 함수 (작은 입력용)"""
+        return [tokens for _, tokens in self.iter_tokens(docs)]
+
+    def report(self) -> str:
+        """워커별 처리량 표"""
+        lines = [f"{'worker(pid)':>12} | {'batches':>7} | {'chars':>10} | {'tokens':>9} | {'chars/s':>10} | {'tokens/s':>9}"]
+        for pid, st in sorted(self.stats.items()):
+            lines.append(
+                f"{pid:>12} | {st.batches:>7} | {st.chars:>10,} | {st.tokens:>9,} | "
+                f"{st.chars_per_sec:>10,.0f} | {st.tokens_per_sec:>9,.0f}"
+            )
+        total_chars = sum(st.chars for st in self.stats.values())
+        if self.wall_seconds:
+            lines.append(f"전체 처리량: {total_chars / self.wall_seconds:,.0f} chars/s (wall {self.wall_seconds:.2f}s)")
+        return "\n".join(lines)
+
+
+def main():
+    # 1) 연설문을 문단 단위 '문서'로 나누고, 대용량 코퍼스를 흉내 내기 위해 여러 번 복제
+    with open("president_speech.txt", encoding="utf-8") as f:
+        paragraphs = split_document(f.read(), unit="paragraph")
+    docs = paragraphs * 20
+    print(f"문서 수: {len(docs):,}, 전체 글자 수: {sum(map(len, docs)):,}")
+
+    # 2) 워커 수를 바꿔 가며 처리량 비교
+    stopwords = {"국민", "정부", "대한민국", "대통령", "우리", "것", "수"}
+    for n_workers in (1, 4):
+        counter = Counter()
+        with OktTokenizerPool(n_workers=n_workers, mode="nouns", batch_chars=5_000) as pool:
+            # 스트리밍: 문서 하나씩 받아 바로 집계 (전체 토큰 리스트를 만들지 않음)
+            for doc_id, tokens in pool.iter_tokens(docs):
+                counter.update(w for w in tokens if len(w) > 1 and w not in stopwords)
+            print(f"\n---------- 워커 {n_workers}개 ----------")
+            print(pool.report())
+        print("상위 10개 명사:", counter.most_common(10))
+
+
+if __name__ == "__main__":
+    main()
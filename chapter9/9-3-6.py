@@ -0,0 +1,299 @@
+# ============================================
+# 🧠 토큰화 결과 캐시: 반복 문장은 한 번만 분석하기
+# ============================================
+# - 리뷰/상담 코퍼스에는 템플릿 문장("주문해 주셔서 감사합니다." 등)이 아주 많이 반복된다.
+# - okt.nouns, nltk.word_tokenize 는 같은 문장을 만날 때마다 처음부터 다시 분석한다.
+# - 이 스크립트는
+#   1) 문장을 정규화(유니코드 NFC, 공백 정리)한 뒤 해시를 키로 쓰는 LRU 캐시를 둔다.
+#   2) 메모리에서 밀려난(evict) 결과는 선택적으로 SQLite 파일에 보관해 다음 실행에서도 재사용한다.
+#   3) 단어 단위 어간/표제어(stem/lemma)는 별도의 메모 테이블에 저장한다.
+#   4) 캐시 적중률(hit rate)을 계층별로 보고한다.
+# 의존성: nltk (선택: konlpy)
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+WHITESPACE = re.compile(r"\s+")
+SENTENCE_SPLIT = re.compile(r"(?<=[.?!])\s+|\n+")
+
+
+def normalize_sentence(text: str) -> str:
+    """캐시 키용 정규화: NFC 통일 + 연속 공백을 하나로 + 앞뒤 공백 제거"""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def sentence_key(namespace: str, sentence: str) -> bytes:
+    """
+    (분석기 이름, 정규화된 문장) → 16바이트 해시
+    - 문장 원문 대신 고정 길이 해시를 키로 써서 메모리를 아낀다.
+    """
+    return hashlib.blake2b(f"{namespace}\x00{sentence}".encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class CacheStats:
+    """캐시 계층 하나의 적중 통계"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    OrderedDict 기반 LRU 캐시
+    - get 시 맨 뒤로 이동, put 시 maxsize를 넘으면 맨 앞(가장 오래 안 쓴 항목)을 제거
+    - on_evict 콜백으로 밀려난 항목을 디스크에 넘길 수 있다.
+    """
+
+    def __init__(self, maxsize: int = 100_000, on_evict: Callable[[bytes, tuple], None] | None = None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.stats = CacheStats()
+        self._data: OrderedDict[bytes, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: bytes) -> tuple | None:
+        value = self._data.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: bytes, value: tuple) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            old_key, old_value = self._data.popitem(last=False)
+            self.stats.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
+    def items(self):
+        return self._data.items()
+
+
+class DiskStore:
+    """
+    SQLite 기반 영구 저장소 (key BLOB → 토큰 튜플 pickle BLOB)
+    - JSON은 (단어, 품사) 튜플을 리스트로 바꾸므로 pickle로 저장해 메모리 결과와 같은 모양으로 복원한다.
+    - 쓰기는 모아 두었다가 commit_every건마다 한 번에 커밋한다.
+    """
+
+    def __init__(self, path: str, commit_every: int = 1_000):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, value BLOB NOT NULL)")
+        self.commit_every = commit_every
+        self.stats = CacheStats()
+        self._dirty = 0
+
+    def get(self, key: bytes) -> tuple | None:
+        row = self.conn.execute("SELECT value FROM tokens WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: bytes, value: tuple) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO tokens (key, value) VALUES (?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self._dirty += 1
+        if self._dirty >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self.conn.commit()
+        self._dirty = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+class CachedTokenizer:
+    """
+    문장 단위 캐시를 씌운 토크나이저
+    - tokenize_fn: 문장 하나를 받아 토큰 목록을 돌려주는 함수 (okt.nouns, nltk.word_tokenize 등)
+    - namespace: 분석기/옵션이 다르면 결과도 다르므로 키에 함께 넣는다 (예: "okt.nouns")
+    - persist_path: 주면 새로 분석한 결과를 메모리에서 밀려날 때와 close() 시점에 SQLite에 저장
+      (디스크에서 읽어 온 결과는 다시 쓰지 않는다)
+    조회 순서: 메모리 LRU → 디스크 → 실제 분석
+    """
+
+    def __init__(
+        self,
+        tokenize_fn: Callable[[str], list],
+        namespace: str,
+        maxsize: int = 100_000,
+        persist_path: str | None = None,
+    ):
+        self.tokenize_fn = tokenize_fn
+        self.namespace = namespace
+        self.disk = DiskStore(persist_path) if persist_path else None
+        self.memory = LRUCache(maxsize, on_evict=self._spill if self.disk else None)
+        self.analyze_seconds = 0.0
+        self._unsaved: set[bytes] = set()  # 메모리에만 있고 디스크에는 아직 없는 키
+
+    def tokenize_sentence(self, sentence: str) -> tuple:
+        """
+        문장 하나의 토큰 (캐시에 든 객체를 그대로 돌려주므로 바꿀 수 없는 튜플)
+        """
+        norm = normalize_sentence(sentence)
+        if not norm:
+            return ()
+        key = sentence_key(self.namespace, norm)
+
+        tokens = self.memory.get(key)
+        if tokens is not None:
+            return tokens
+        if self.disk is not None:
+            tokens = self.disk.get(key)
+        if tokens is None:
+            start = time.perf_counter()
+            tokens = tuple(self.tokenize_fn(norm))
+            self.analyze_seconds += time.perf_counter() - start
+            if self.disk is not None:
+                self._unsaved.add(key)
+        self.memory.put(key, tokens)
+        return tokens
+
+    def _spill(self, key: bytes, tokens: tuple) -> None:
+        """메모리에서 밀려난 항목 중 새로 분석한 것만 디스크에 쓴다"""
+        if key in self._unsaved:
+            self._unsaved.discard(key)
+            self.disk.put(key, tokens)
+
+    def tokenize(self, text: str) -> list:
+        """문서를 문장으로 나눠 문장별 캐시를 거친 뒤 토큰을 이어 붙인다"""
+        tokens = []
+        for sentence in SENTENCE_SPLIT.split(text):
+            tokens.extend(self.tokenize_sentence(sentence))
+        return tokens
+
+    def close(self) -> None:
+        """메모리에 남은 새 결과까지 디스크에 저장 (persist_path를 준 경우)"""
+        if self.disk is not None:
+            for key, value in self.memory.items():
+                if key in self._unsaved:
+                    self.disk.put(key, value)
+            self._unsaved.clear()
+            self.disk.close()
+            self.disk = None
+            self.memory.on_evict = None
+
+    def __enter__(self) -> "CachedTokenizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class WordMemo:
+    """
+    단어 단위 어간/표제어 메모 테이블
+    - 어휘 수는 문장 수보다 훨씬 작으므로 크기 제한 없는 functools.lru_cache를 사용
+    - cache_info()의 hits/misses로 적중률을 본다.
+    """
+
+    def __init__(self, stemmer=None, lemmatizer=None):
+        self.stem = lru_cache(maxsize=None)(stemmer.stem) if stemmer else None
+        self.lemmatize = lru_cache(maxsize=None)(lemmatizer.lemmatize) if lemmatizer else None
+
+    def stats(self) -> dict[str, CacheStats]:
+        out = {}
+        for name, fn in (("stem", self.stem), ("lemma", self.lemmatize)):
+            if fn is not None:
+                info = fn.cache_info()
+                out[name] = CacheStats(hits=info.hits, misses=info.misses)
+        return out
+
+
+def report(layers: dict[str, CacheStats]) -> str:
+    """계층별 적중률 표"""
+    lines = [f"{'layer':<18} | {'hits':>9} | {'misses':>8} | {'evict':>7} | {'hit rate':>8}"]
+    for name, st in layers.items():
+        lines.append(f"{name:<18} | {st.hits:>9,} | {st.misses:>8,} | {st.evictions:>7,} | {st.hit_rate:>8.1%}")
+    return "\n".join(lines)
+
+
+def main():
+    import nltk
+    from nltk.corpus import wordnet
+    from nltk.stem import PorterStemmer, WordNetLemmatizer
+
+    # nltk.download('punkt'); nltk.download('punkt_tab'); nltk.download('wordnet')  # 최초 1회
+
+    # 1) 템플릿 문장이 많이 반복되는 리뷰 코퍼스 흉내
+    templates = [
+        "Thank you for your order.",
+        "The delivery was fast and the packaging was great.",
+        "I will never buy this product again.",
+        "Customer service answered all of my questions.",
+    ]
+    reviews = [
+        f"{templates[i % 4]} {templates[(i * 7) % 4]} Order number {i % 50} arrived on time."
+        for i in range(20_000)
+    ]
+
+    # 2) 캐시 없이
+    start = time.perf_counter()
+    plain = [nltk.word_tokenize(r) for r in reviews]
+    plain_sec = time.perf_counter() - start
+
+    # 3) 문장 캐시 + 디스크 영속화 → 새 토크나이저(다음 실행 역할)는 디스크 계층에서 바로 적중
+    with tempfile.TemporaryDirectory() as tmp:
+        persist_path = os.path.join(tmp, "token_cache.sqlite")
+        with CachedTokenizer(nltk.word_tokenize, "nltk.word_tokenize", maxsize=10_000,
+                             persist_path=persist_path) as tok:
+            start = time.perf_counter()
+            cached = [tok.tokenize(r) for r in reviews]
+            cached_sec = time.perf_counter() - start
+            layers = {"sentence(memory)": tok.memory.stats, "sentence(disk)": tok.disk.stats}
+
+        with CachedTokenizer(nltk.word_tokenize, "nltk.word_tokenize", maxsize=10_000,
+                             persist_path=persist_path) as warm_tok:
+            warm = [warm_tok.tokenize(r) for r in reviews]
+            layers["warm(disk)"] = warm_tok.disk.stats
+
+    # 문장 단위로 나눠 분석해도, 디스크에서 다시 읽어도 토큰 결과는 같다
+    assert [t for doc in cached for t in doc] == [t for doc in plain for t in doc]
+    assert warm == cached
+
+    # 4) 단어 단위 stem/lemma 메모
+    memo = WordMemo(PorterStemmer(), WordNetLemmatizer())
+    for doc in cached:
+        for w in doc:
+            if w.isalpha():
+                memo.stem(w.lower())
+                memo.lemmatize(w.lower(), pos=wordnet.VERB)
+    layers.update({f"word({k})": v for k, v in memo.stats().items()})
+
+    print(f"캐시 없음: {plain_sec:.2f}s / 문장 캐시: {cached_sec:.2f}s ({plain_sec / cached_sec:.1f}배)\n")
+    print(report(layers))
+
+
+if __name__ == "__main__":
+    main()
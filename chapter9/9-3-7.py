@@ -0,0 +1,192 @@
+# ============================================
+# 🧹 불용어/품사/길이 필터를 하나로: 컴파일된 토큰 필터 단계
+# ============================================
+# - 9-3-2.py: set(stopwords.words('english')) - whitelist 를 매번 만들고 for문으로 거른다.
+# - 9-3-3.py: ban_pos 집합과 custom_sw 로 (단어, 품사) 목록을 거른다.
+# - 9-4-2.py / 9-6-5.py: 각자 다른 불용어 목록과 len(w) > 1 규칙을 코드에 박아 두었다.
+# - 이 스크립트는 이 규칙들을 TokenFilter 하나로 모은다.
+#   1) 불용어 - 화이트리스트, 금지 품사/허용 품사, 길이, 문자 종류 규칙을 생성 시점에 한 번만 정리한다.
+#   2) 토큰(또는 (단어, 품사))마다 "남길 단어 / 버림" 판정을 처음 볼 때 한 번만 계산해 표(dict)에 저장한다.
+#      → 이후 같은 토큰은 dict 조회 한 번으로 끝난다 (규칙 수와 무관, 속성 조회 없음).
+#   3) 문서 묶음을 한 번에 거르는 filter_batch 를 제공한다.
+# 의존성: 없음 (영어 기본 불용어는 nltk stopwords, 한국어 품사는 konlpy 결과를 입력으로 받는다)
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Hashable, Iterable, Iterator
+
+# 9-4-2.py / 9-6-5.py / 9-3-3.py에 흩어져 있던 불용어 목록
+KO_SPEECH_STOPWORDS = frozenset({"국민", "정부", "대한민국", "대통령", "우리", "것", "수"})
+KO_WORDCLOUD_STOPWORDS = frozenset({"것", "수", "등", "들", "그", "그리고", "이", "저", "제", "우리", "대한"})
+KO_POLICY_STOPWORDS = frozenset({"것", "수", "정책", "위해"})
+KO_BAN_POS = frozenset({"Josa", "Eomi", "Punctuation"})
+EN_WHITELIST = frozenset({"not", "no", "never"})
+
+HANGUL_ONLY = re.compile(r"[가-힣]+")
+
+
+class _DecisionTable(dict):
+    """토큰 → 남길 단어(str) 또는 None. 처음 보는 토큰만 규칙을 평가한다."""
+
+    def __init__(self, decide, max_entries: int):
+        super().__init__()
+        self._decide = decide
+        self._max_entries = max_entries
+
+    def __missing__(self, token):
+        if len(self) >= self._max_entries:  # 어휘가 끝없이 늘어나는 입력에서 메모리 상한
+            self.clear()
+        out = self[token] = self._decide(token)
+        return out
+
+
+class TokenFilter:
+    """
+    불용어 + 품사 + 길이 규칙을 묶은 토큰 필터
+    - 입력 토큰은 단어(str) 또는 (단어, 품사) 튜플. 출력은 남은 단어 목록.
+    - stopwords - whitelist 를 실제 제거 집합으로 쓴다.
+    - ban_pos: 버릴 품사 / keep_pos: 이 품사만 남김 (둘 다 주면 둘 다 적용)
+    - min_len / max_len: 글자 수 규칙 (9-4-2.py의 len(w) > 1 → min_len=2)
+    - alpha_only: str.isalpha() 인 단어만 (9-3-2.py)
+    - hangul_only: 한글로만 이루어진 단어만
+    - lowercase: 비교와 출력 모두 소문자로
+    """
+
+    def __init__(
+        self,
+        stopwords: Iterable[str] = (),
+        whitelist: Iterable[str] = (),
+        ban_pos: Iterable[str] = (),
+        keep_pos: Iterable[str] | None = None,
+        min_len: int = 1,
+        max_len: int | None = None,
+        alpha_only: bool = False,
+        hangul_only: bool = False,
+        lowercase: bool = False,
+        max_entries: int = 1_000_000,
+    ):
+        self.stop_set = frozenset(stopwords) - frozenset(whitelist)
+        self.ban_pos = frozenset(ban_pos)
+        self.keep_pos = frozenset(keep_pos) if keep_pos is not None else None
+        self.min_len = min_len
+        self.max_len = max_len
+        self.alpha_only = alpha_only
+        self.hangul_only = hangul_only
+        self.lowercase = lowercase
+        self._table = _DecisionTable(self._decide, max_entries)
+        self._lookup = self._table.__getitem__
+
+    # ---------- 규칙 (토큰마다 한 번만 실행) ----------
+    def _decide(self, token: Hashable) -> str | None:
+        if isinstance(token, tuple):
+            word, pos = token
+            if pos in self.ban_pos or (self.keep_pos is not None and pos not in self.keep_pos):
+                return None
+        else:
+            word = token
+        if self.lowercase:
+            word = word.lower()
+        if len(word) < self.min_len or (self.max_len is not None and len(word) > self.max_len):
+            return None
+        if self.alpha_only and not word.isalpha():
+            return None
+        if self.hangul_only and HANGUL_ONLY.fullmatch(word) is None:
+            return None
+        if word in self.stop_set:
+            return None
+        return word
+
+    # ---------- 적용 ----------
+    def __call__(self, tokens: Iterable) -> list[str]:
+        """문서 하나"""
+        return [w for w in map(self._lookup, tokens) if w is not None]
+
+    def filter_batch(self, docs: Iterable[Iterable]) -> list[list[str]]:
+        """문서 묶음을 한 번에 거른다"""
+        lookup = self._lookup
+        return [[w for w in map(lookup, doc) if w is not None] for doc in docs]
+
+    def iter_filter(self, tokens: Iterable) -> Iterator[str]:
+        """토큰 스트림(생성기)을 그대로 거르는 생성기 — 9-4-3.py 같은 스트리밍 처리용"""
+        for w in map(self._lookup, tokens):
+            if w is not None:
+                yield w
+
+    def __len__(self) -> int:
+        """지금까지 판정해 둔 서로 다른 토큰 수"""
+        return len(self._table)
+
+    # ---------- 자주 쓰는 설정 ----------
+    @classmethod
+    def english(cls, whitelist: Iterable[str] = EN_WHITELIST, **kw) -> "TokenFilter":
+        """9-3-2.py 규칙: 소문자 + 알파벳만 + NLTK 불용어(부정어는 남김)"""
+        from nltk.corpus import stopwords
+
+        kw.setdefault("lowercase", True)
+        kw.setdefault("alpha_only", True)
+        return cls(stopwords.words("english"), whitelist, **kw)
+
+    @classmethod
+    def korean_pos(cls, stopwords: Iterable[str] = KO_POLICY_STOPWORDS, **kw) -> "TokenFilter":
+        """9-3-3.py 규칙: okt.pos 결과에서 조사/어미/구두점과 도메인 불용어 제거"""
+        kw.setdefault("ban_pos", KO_BAN_POS)
+        return cls(stopwords, **kw)
+
+    @classmethod
+    def korean_nouns(cls, stopwords: Iterable[str] = KO_SPEECH_STOPWORDS, **kw) -> "TokenFilter":
+        """9-4-2.py 규칙: 명사 목록에서 1글자 단어와 연설문 불용어 제거"""
+        kw.setdefault("min_len", 2)
+        return cls(stopwords, **kw)
+
+    @classmethod
+    def korean_wordcloud(cls, stopwords: Iterable[str] = KO_WORDCLOUD_STOPWORDS, **kw) -> "TokenFilter":
+        """9-6-5.py / 9-6-6.py 규칙: 워드클라우드용 명사에서 1글자 단어와 불용어 제거"""
+        kw.setdefault("min_len", 2)
+        return cls(stopwords, **kw)
+
+
+def main():
+    # 1) 영어 (9-3-2.py와 같은 결과)
+    try:
+        en = TokenFilter.english()
+        text = "This is not only a simple example, but also a very useful one."
+        print(en(text.split()))
+        # ['not', 'simple', 'also', 'useful']  ("example," "one."은 구두점이 붙어 isalpha() 규칙에서 빠진다)
+    except LookupError:
+        print("nltk.download('stopwords') 후 다시 실행하세요.")
+
+    # 2) 한국어 품사 기반 (9-3-3.py의 okt.pos(text, norm=True, stem=True) 결과)
+    pos = [("이", "Determiner"), ("정책", "Noun"), ("은", "Josa"), ("결코", "Adverb"),
+           ("쉽다", "Adjective"), ("결정", "Noun"), ("이", "Josa"), ("아니다", "Adjective"),
+           ("지만", "Eomi"), ("국민", "Noun"), ("의", "Josa"), ("안전", "Noun"),
+           ("을", "Josa"), ("위해", "PreEomi"), ("반드시", "Adverb"), ("필요", "Noun"),
+           ("하다", "Verb"), (".", "Punctuation")]
+    ko = TokenFilter.korean_pos()
+    print(ko(pos))
+
+    # 3) 명사 목록 묶음 처리 + 속도 비교 (9-4-2.py의 두 단계 리스트 컴프리헨션과 비교)
+    nouns = ["국민", "경제", "것", "성장", "일자리", "수", "정부", "미래", "평화", "우리", "혁신", "안전"]
+    docs = [[nouns[(i * 7 + j) % len(nouns)] for j in range(200)] for i in range(20_000)]
+    stopwords = set(KO_SPEECH_STOPWORDS)
+
+    start = time.perf_counter()
+    plain = []
+    for doc in docs:
+        tokens = [w for w in doc if len(w) > 1]
+        plain.append([w for w in tokens if w not in stopwords])
+    plain_sec = time.perf_counter() - start
+
+    noun_filter = TokenFilter.korean_nouns()
+    start = time.perf_counter()
+    fast = noun_filter.filter_batch(docs)
+    fast_sec = time.perf_counter() - start
+
+    assert fast == plain
+    print(f"리스트 컴프리헨션 2단계: {plain_sec:.2f}s / TokenFilter: {fast_sec:.2f}s "
+          f"(판정표 크기 {len(noun_filter)})")
+
+
+if __name__ == "__main__":
+    main()
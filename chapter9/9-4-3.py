@@ -0,0 +1,145 @@
+# ==========================================
+# 📚 스트리밍 단어 빈도 계산: 메모리에 다 올리지 않고 세기
+# ==========================================
+# - 9-4-2.py / 9-6-5.py는 f.read()로 파일 전체를 읽고, 전체 문자열에 정규식을 돌리고,
+#   전체 tokens 리스트를 만든 뒤 Counter(filtered)를 만든다 → 수 GB 코퍼스에서는 메모리 부족.
+# - 이 스크립트는
+#   1) 파일을 일정 글자 수 블록으로 읽되, 단어가 잘리지 않도록 마지막 공백에서 끊는다.
+#   2) 미리 컴파일한 정규식으로 블록을 정제한다.
+#   3) 블록을 워커 프로세스에 보내 워커마다 Counter를 만들고, 메인 프로세스에서 합친다.
+#   4) 동시에 처리 중인 블록 수를 제한해, 파일 크기와 상관없이 메모리가 일정하다.
+# 의존성: konlpy(+ Java) — tokenizer="whitespace"로 바꾸면 표준 라이브러리만으로 동작
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator
+
+# 9-4-2.py와 같은 정제 규칙을 한 번만 컴파일
+NON_HANGUL = re.compile(r"[^가-힣\s]")
+MULTI_SPACE = re.compile(r"\s+")
+LAST_SPACE = re.compile(r"\s(?=\S*\Z)")
+
+DEFAULT_STOPWORDS = frozenset({"국민", "정부", "대한민국", "대통령", "우리", "것", "수"})
+
+
+def clean_text(text: str) -> str:
+    """한글과 공백만 남기고 연속 공백을 하나로 줄인다"""
+    return MULTI_SPACE.sub(" ", NON_HANGUL.sub(" ", text)).strip()
+
+
+def iter_blocks(paths: Iterable[str], block_chars: int = 1 << 20, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    여러 파일을 block_chars 글자 단위로 읽는 생성기
+    - 블록 끝이 단어 중간이면 마지막 공백 이후 부분을 다음 블록으로 넘긴다.
+    - 줄 단위로 읽으면 줄바꿈 없는 거대한 파일에서 한 줄이 통째로 메모리에 올라오므로 블록 단위를 쓴다.
+    """
+    for path in paths:
+        carry = ""
+        with open(path, encoding=encoding) as f:
+            while True:
+                block = f.read(block_chars)
+                if not block:
+                    break
+                block = carry + block
+                cut = LAST_SPACE.search(block)
+                if cut is None:
+                    carry = block      # 공백이 없으면 다음 블록과 이어 붙인다
+                    continue
+                carry = block[cut.end():]
+                yield block[:cut.start()]
+        if carry:
+            yield carry
+
+
+# =========================
+# 워커 프로세스 쪽 코드
+# =========================
+_tokenize = None
+_stopwords: frozenset = frozenset()
+_min_len = 2
+
+
+def _init_worker(tokenizer: str, stopwords: frozenset, min_len: int) -> None:
+    """워커마다 형태소 분석기를 한 번만 만든다 (Okt는 JVM을 띄우므로 비싸다)"""
+    global _tokenize, _stopwords, _min_len
+    if tokenizer == "okt_nouns":
+        from konlpy.tag import Okt
+        _tokenize = Okt().nouns
+    elif tokenizer == "whitespace":
+        _tokenize = str.split
+    else:
+        raise ValueError(f"지원하지 않는 tokenizer: {tokenizer}")
+    _stopwords, _min_len = stopwords, min_len
+
+
+def _iter_tokens(text: str) -> Iterator[str]:
+    """정제 → 토큰화 → 길이/불용어 필터를 생성기로 연결 (중간 리스트를 따로 만들지 않음)"""
+    stop, min_len = _stopwords, _min_len
+    for w in _tokenize(clean_text(text)):
+        if len(w) >= min_len and w not in stop:
+            yield w
+
+
+def _count_block(text: str) -> Counter:
+    return Counter(_iter_tokens(text))
+
+
+# =========================
+# 메인 프로세스 쪽 코드
+# =========================
+def streaming_word_count(
+    paths: Iterable[str],
+    tokenizer: str = "okt_nouns",
+    stopwords: Iterable[str] = DEFAULT_STOPWORDS,
+    min_len: int = 2,
+    n_workers: int | None = None,
+    block_chars: int = 1 << 20,
+    max_pending: int | None = None,
+) -> Counter:
+    """
+    파일들을 스트리밍으로 읽어 단어 빈도 Counter를 돌려준다.
+    - n_workers=1이면 프로세스 풀 없이 현재 프로세스에서 처리
+    - 워커가 돌려준 블록별 Counter는 끝나는 순서대로 하나의 Counter에 더한다.
+      (메모리에는 '어휘 크기'의 Counter 하나와 처리 중인 블록 max_pending개만 남는다)
+    """
+    init_args = (tokenizer, frozenset(stopwords), min_len)
+    n_workers = n_workers or os.cpu_count() or 1
+    total = Counter()
+
+    if n_workers == 1:
+        _init_worker(*init_args)
+        for block in iter_blocks(paths, block_chars):
+            total.update(_iter_tokens(block))
+        return total
+
+    max_pending = max_pending or n_workers * 2
+    with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=init_args) as pool:
+        pending = set()
+        for block in iter_blocks(paths, block_chars):
+            pending.add(pool.submit(_count_block, block))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    total.update(fut.result())
+        for fut in pending:
+            total.update(fut.result())
+    return total
+
+
+def main():
+    # 1) 연설문 빈도 계산 (9-4-2.py와 같은 정제/불용어/1글자 제거 규칙)
+    start = time.perf_counter()
+    counter = streaming_word_count(["president_speech.txt"], tokenizer="okt_nouns", block_chars=4_096)
+    print(f"처리 시간: {time.perf_counter() - start:.2f}s, 고유 단어 수: {len(counter):,}")
+
+    # 2) 상위 10개 단어
+    print("상위 10개 명사:", counter.most_common(10))
+
+
+if __name__ == "__main__":
+    main()
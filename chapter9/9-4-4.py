@@ -0,0 +1,280 @@
+# ==========================================
+# 🔝 근사 상위 k 단어(heavy hitters): 메모리를 고정하고 빈도 세기
+# ==========================================
+# - Counter.most_common(10)은 모든 고유 단어의 정확한 dict가 필요하다.
+#   어휘가 수천만 개면 이 dict가 메모리를 대부분 차지한다.
+# - 이 스크립트는 Counter와 같은 사용법(update / most_common / [단어])의 근사 카운터 두 가지를 제공한다.
+#   1) SpaceSaving(capacity): 단어 capacity개만 유지. 과대추정 오차 <= N / capacity
+#      → 빈도가 N / capacity 보다 큰 단어는 반드시 결과에 포함된다.
+#   2) CountMinTopK(epsilon, delta): 깊이×너비 정수 표 + 상위 k 후보
+#      → 확률 1 - delta 이상으로 오차 <= epsilon * N
+# - 둘 다 샤드(파일/프로세스)별로 따로 센 뒤 merge()로 합칠 수 있다.
+#   (해시는 프로세스마다 달라지는 hash() 대신 blake2b를 써서 샤드 간에 같은 칸을 가리키게 한다)
+# 의존성: numpy
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import sys
+import time
+from collections import Counter
+from collections.abc import Mapping
+from typing import Hashable, Iterable
+
+import numpy as np
+
+
+def _as_counts(items: Iterable | Mapping) -> Mapping:
+    """update()에 들어온 입력을 {단어: 개수}로 통일 (묶음 단위로 미리 합쳐 해시 계산 횟수를 줄인다)"""
+    return items if isinstance(items, Mapping) else Counter(items)
+
+
+# =========================
+# 1) Space-Saving
+# =========================
+class SpaceSaving:
+    """
+    Space-Saving 알고리즘 (Metwally et al., 2005)
+    - 최대 capacity개 단어의 (추정 빈도, 오차)만 유지한다.
+    - 새 단어가 들어왔는데 자리가 없으면, 가장 작은 빈도의 단어를 내보내고
+      그 빈도 + 1로 새 단어를 기록한다 (내보낸 빈도만큼이 새 단어의 오차).
+    - 최솟값은 힙으로 찾되, 빈도가 바뀐 항목은 힙에 남겨 두었다가 꺼낼 때 걸러낸다(lazy deletion).
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        self.capacity = capacity
+        self.counts: dict[Hashable, int] = {}
+        self.errors: dict[Hashable, int] = {}
+        self.total = 0
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._tick = 0      # 힙에서 같은 빈도끼리 비교할 때 단어 자체를 비교하지 않도록 쓰는 순번
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> "SpaceSaving":
+        """오차 상한 epsilon * N을 보장하는 크기로 생성 (capacity = ceil(1 / epsilon))"""
+        return cls(capacity=math.ceil(1.0 / epsilon))
+
+    def _push(self, item: Hashable) -> None:
+        self._tick += 1
+        heapq.heappush(self._heap, (self.counts[item], self._tick, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i, w) for i, (w, c) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[Hashable, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+    def update(self, items: Iterable | Mapping) -> None:
+        for item, n in _as_counts(items).items():
+            self.total += n
+            if item in self.counts:
+                self.counts[item] += n
+            elif len(self.counts) < self.capacity:
+                self.counts[item] = n
+                self.errors[item] = 0
+            else:
+                old, floor = self._pop_min()
+                del self.counts[old], self.errors[old]
+                self.counts[item] = floor + n
+                self.errors[item] = floor
+            self._push(item)
+
+    def __getitem__(self, item: Hashable) -> int:
+        """추정 빈도 (실제 빈도 <= 추정 빈도 <= 실제 빈도 + 오차)"""
+        if item in self.counts:
+            return self.counts[item]
+        return self.min_count() if len(self.counts) >= self.capacity else 0
+
+    def min_count(self) -> int:
+        return min(self.counts.values()) if self.counts else 0
+
+    def most_common(self, n: int | None = None) -> list[tuple[Hashable, int]]:
+        items = self.counts.items()
+        if n is None:
+            return sorted(items, key=lambda kv: kv[1], reverse=True)
+        return heapq.nlargest(n, items, key=lambda kv: kv[1])
+
+    def guaranteed(self, n: int | None = None) -> list[tuple[Hashable, int]]:
+        """추정 빈도 - 오차(= 보장된 최소 빈도)와 함께 상위 n개를 돌려준다"""
+        return [(w, c - self.errors[w]) for w, c in self.most_common(n)]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        두 요약을 합친다 (Agarwal et al., Mergeable Summaries)
+        - 한쪽에만 있는 단어는 상대 요약의 최솟값만큼(상대가 가득 찼을 때) 빈도/오차를 더한다.
+        - 합친 뒤 빈도 상위 capacity개만 남긴다.
+        """
+        out = SpaceSaving(max(self.capacity, other.capacity))
+        floor_a = self.min_count() if len(self.counts) >= self.capacity else 0
+        floor_b = other.min_count() if len(other.counts) >= other.capacity else 0
+        merged = {}
+        for w in self.counts.keys() | other.counts.keys():
+            c = self.counts.get(w, floor_a) + other.counts.get(w, floor_b)
+            e = self.errors.get(w, floor_a) + other.errors.get(w, floor_b)
+            merged[w] = (c, e)
+        for w, (c, e) in heapq.nlargest(out.capacity, merged.items(), key=lambda kv: kv[1][0]):
+            out.counts[w], out.errors[w] = c, e
+        out.total = self.total + other.total
+        out._heap = [(c, i, w) for i, (w, c) in enumerate(out.counts.items())]
+        heapq.heapify(out._heap)
+        out._tick = len(out._heap)
+        return out
+
+    __add__ = merge
+
+    def error_bound(self) -> float:
+        """이론상 최대 과대추정량 N / capacity"""
+        return self.total / self.capacity
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.counts) + sys.getsizeof(self.errors) + sys.getsizeof(self._heap)
+
+
+# =========================
+# 2) Count-Min Sketch + 상위 k 후보
+# =========================
+class CountMinTopK:
+    """
+    Count-Min Sketch(Cormode & Muthukrishnan, 2005) + 상위 k 후보 테이블
+    - width = ceil(e / epsilon), depth = ceil(ln(1 / delta))
+    - 추정 빈도 = depth개 행에서 해당 칸 값의 최솟값 (항상 과대추정)
+    - 묶음 단위 update에서 고유 단어만 해시하고, np.add.at으로 표를 한 번에 갱신한다.
+    - 같은 (width, depth, seed)로 만든 스케치끼리는 표를 더하기만 하면 병합된다.
+    """
+
+    def __init__(self, k: int = 100, epsilon: float = 1e-4, delta: float = 1e-3, seed: int = 0):
+        self.k = k
+        self.epsilon, self.delta, self.seed = epsilon, delta, seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1.0 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+        self.candidates: dict[Hashable, int] = {}
+        self._salt = seed.to_bytes(8, "little")
+        self._rows = np.arange(self.depth)[:, None]
+
+    def _columns(self, items: list) -> np.ndarray:
+        """
+        단어별 depth개 열 번호 (double hashing: h1 + i * h2)
+        - blake2b 16바이트를 64비트 정수 두 개로 쪼개 사용
+        """
+        digests = b"".join(
+            hashlib.blake2b(str(w).encode("utf-8"), digest_size=16, salt=self._salt).digest() for w in items
+        )
+        h = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+        i = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h[:, 0][None, :] + i * (h[:, 1][None, :] | np.uint64(1))) % np.uint64(self.width)).astype(np.int64)
+
+    def _estimate_cols(self, cols: np.ndarray) -> np.ndarray:
+        return self.table[self._rows, cols].min(axis=0)
+
+    def update(self, items: Iterable | Mapping) -> None:
+        counts = _as_counts(items)
+        if not counts:
+            return
+        words = list(counts)
+        n = np.fromiter(counts.values(), dtype=np.int64, count=len(words))
+        cols = self._columns(words)
+        np.add.at(self.table, (np.broadcast_to(self._rows, cols.shape), cols), n[None, :])
+        self.total += int(n.sum())
+        self._refresh_candidates(words, self._estimate_cols(cols))
+
+    def _refresh_candidates(self, words: list, estimates: np.ndarray) -> None:
+        """이번 묶음 단어의 추정치를 후보에 반영하고 상위 k개만 남긴다"""
+        for w, est in zip(words, estimates.tolist()):
+            self.candidates[w] = est
+        if len(self.candidates) > 2 * self.k:
+            self.candidates = dict(heapq.nlargest(self.k, self.candidates.items(), key=lambda kv: kv[1]))
+
+    def __getitem__(self, item: Hashable) -> int:
+        return int(self._estimate_cols(self._columns([item]))[0])
+
+    def most_common(self, n: int | None = None) -> list[tuple[Hashable, int]]:
+        n = self.k if n is None else min(n, self.k)
+        return heapq.nlargest(n, self.candidates.items(), key=lambda kv: kv[1])
+
+    def merge(self, other: "CountMinTopK") -> "CountMinTopK":
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("width/depth/seed가 같은 스케치끼리만 병합할 수 있습니다.")
+        out = CountMinTopK(max(self.k, other.k), self.epsilon, self.delta, self.seed)
+        out.table = self.table + other.table
+        out.total = self.total + other.total
+        words = list(self.candidates.keys() | other.candidates.keys())
+        if words:
+            out._refresh_candidates(words, out._estimate_cols(out._columns(words)))
+            out.candidates = dict(heapq.nlargest(out.k, out.candidates.items(), key=lambda kv: kv[1]))
+        return out
+
+    __add__ = merge
+
+    def error_bound(self) -> float:
+        """확률 1 - delta 이상으로 보장되는 최대 과대추정량 epsilon * N"""
+        return self.epsilon * self.total
+
+    def memory_bytes(self) -> int:
+        return self.table.nbytes + sys.getsizeof(self.candidates)
+
+
+def make_topk_counter(kind: str = "exact", **kwargs):
+    """
+    빈도 카운터 생성기 — 기존 코드의 Counter()를 이 함수로 바꾸면 된다.
+    - "exact": collections.Counter (기존 방식)
+    - "spacesaving": SpaceSaving(capacity=...) 또는 epsilon=...
+    - "countmin": CountMinTopK(k=..., epsilon=..., delta=...)
+    """
+    if kind == "exact":
+        return Counter()
+    if kind == "spacesaving":
+        if "epsilon" in kwargs:
+            return SpaceSaving.from_error(kwargs["epsilon"])
+        return SpaceSaving(**kwargs)
+    if kind == "countmin":
+        return CountMinTopK(**kwargs)
+    raise ValueError(f"지원하지 않는 kind: {kind}")
+
+
+def main():
+    # 1) Zipf 분포(자연어 단어 빈도와 비슷)의 토큰 약 200만 개, 어휘 50만 개
+    rng = np.random.default_rng(42)
+    vocab = [f"w{i}" for i in range(500_000)]
+    ids = rng.zipf(1.2, size=2_000_000) - 1
+    ids = ids[ids < len(vocab)]
+    tokens = [vocab[i] for i in ids]
+    shards = [tokens[i::4] for i in range(4)]     # 4개 파일/프로세스로 나뉘었다고 가정
+
+    # 2) 정확한 Counter (기준)
+    exact = Counter(tokens)
+    truth = [w for w, _ in exact.most_common(10)]
+
+    # 3) 샤드별 근사 카운터 → 병합
+    print(f"{'kind':<12} | {'memory(MB)':>10} | {'error bound':>11} | {'top10 recall':>12} | {'max abs err':>11} | {'sec':>5}")
+    print(f"{'exact':<12} | {sys.getsizeof(exact) / 2**20:>10.1f} | {0:>11} | {1.0:>12.0%} | {0:>11} | {'-':>5}")
+    for kind, kwargs in [("spacesaving", {"capacity": 2_000}), ("countmin", {"k": 100, "epsilon": 1e-4})]:
+        start = time.perf_counter()
+        parts = []
+        for shard in shards:
+            counter = make_topk_counter(kind, **kwargs)
+            for i in range(0, len(shard), 50_000):    # 묶음 단위 update
+                counter.update(shard[i:i + 50_000])
+            parts.append(counter)
+        merged = parts[0]
+        for p in parts[1:]:
+            merged = merged + p
+        elapsed = time.perf_counter() - start
+
+        top = merged.most_common(10)
+        recall = len({w for w, _ in top} & set(truth)) / 10
+        max_err = max(c - exact[w] for w, c in top)
+        print(f"{kind:<12} | {merged.memory_bytes() / 2**20:>10.1f} | {merged.error_bound():>11,.0f} | "
+              f"{recall:>12.0%} | {max_err:>11,} | {elapsed:>5.2f}")
+
+    print("\n정확한 상위 10개:", exact.most_common(10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# ==========================================
+# 🧮 희소 문서-단어 행렬(DTM) + TF-IDF 만들기
+# ==========================================
+# - 9-4-2.py / 9-4-3.py는 Counter에서 멈춘다. 토픽 모델링·검색에는 '문서 × 단어' 행렬이 필요하다.
+# - 이 스크립트는
+#   1) 토큰 스트림을 한 번만 훑으며 단어 번호를 매긴다.
+#      - Vocabulary: 처음 보는 단어에 다음 번호를 붙이는 증분 사전 (단어 목록을 알 수 있음)
+#      - HashingVocabulary: crc32(단어) % n_features (사전이 필요 없어 메모리 고정, 단어 복원 불가)
+#   2) (행 포인터, 열 번호) 배열을 모아 scipy.sparse.csr_matrix를 바로 만든다 (중복은 sum_duplicates로 합침).
+#   3) TF-IDF 가중치와 행 정규화를 희소 행렬 그대로 계산한다 (scikit-learn TfidfTransformer와 같은 식).
+#   4) 문서 빈도(df)로 너무 드물거나 흔한 단어 열을 잘라 낸다.
+#   5) 문서를 샤드로 나눠 워커 프로세스에서 샤드별 행렬을 만들고, 마지막에 단어 번호를 맞춰 세로로 합친다.
+# 의존성: numpy, scipy (선택: konlpy, nltk)
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+import numpy as np
+import scipy.sparse as sp
+
+NON_HANGUL = re.compile(r"[^가-힣\s]")
+MULTI_SPACE = re.compile(r"\s+")
+
+DEFAULT_STOPWORDS = frozenset({"국민", "정부", "대한민국", "대통령", "우리", "것", "수"})
+
+
+# =========================
+# 단어 번호 매기기
+# =========================
+class Vocabulary:
+    """단어 → 번호 (처음 보는 단어는 다음 번호)"""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._ids: dict[str, int] = {}
+        for t in terms:
+            self.add(t)
+
+    def add(self, term: str) -> int:
+        ids = self._ids
+        return ids.setdefault(term, len(ids))
+
+    def ids(self, tokens: Iterable[str]) -> list[int]:
+        ids = self._ids
+        return [ids.setdefault(t, len(ids)) for t in tokens]
+
+    @property
+    def terms(self) -> list[str]:
+        return list(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class HashingVocabulary:
+    """
+    crc32 해시로 번호를 정하는 고정 크기 사전
+    - 프로세스/실행이 달라도 같은 단어는 같은 번호 (파이썬 hash()는 실행마다 달라서 쓰지 않는다)
+    - 서로 다른 단어가 같은 열에 겹칠 수 있다 (n_features를 어휘 수보다 충분히 크게)
+    """
+
+    def __init__(self, n_features: int = 1 << 20):
+        self.n_features = n_features
+
+    def add(self, term: str) -> int:
+        return zlib.crc32(term.encode("utf-8")) % self.n_features
+
+    def ids(self, tokens: Iterable[str]) -> list[int]:
+        n = self.n_features
+        return [zlib.crc32(t.encode("utf-8")) % n for t in tokens]
+
+    @property
+    def terms(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return self.n_features
+
+
+# =========================
+# 행렬 만들기
+# =========================
+def build_dtm(token_docs: Iterable[Iterable[str]], vocab: Vocabulary | HashingVocabulary) -> sp.csr_matrix:
+    """
+    토큰 목록들을 한 번 훑어 단어 빈도 CSR 행렬(문서 × 단어)을 만든다.
+    - 문서마다 Counter를 만들지 않고 열 번호만 이어 붙인 뒤, 같은 (행, 열)은 sum_duplicates가 합친다.
+    """
+    indices: list[int] = []
+    indptr = [0]
+    for tokens in token_docs:
+        indices.extend(vocab.ids(tokens))
+        indptr.append(len(indices))
+    indices_arr = np.asarray(indices, dtype=np.int32)
+    dtm = sp.csr_matrix(
+        (np.ones(len(indices_arr), dtype=np.int64), indices_arr, np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocab)),
+    )
+    dtm.sum_duplicates()
+    return dtm
+
+
+def document_frequency(dtm: sp.csr_matrix) -> np.ndarray:
+    """단어(열)별로 등장한 문서 수"""
+    return np.bincount(dtm.indices, minlength=dtm.shape[1])
+
+
+def prune_by_df(
+    dtm: sp.csr_matrix,
+    terms: list[str] | None = None,
+    min_df: int | float = 1,
+    max_df: int | float = 1.0,
+) -> tuple[sp.csr_matrix, list[str] | None, np.ndarray]:
+    """
+    문서 빈도로 열을 자른다 (scikit-learn CountVectorizer의 min_df/max_df와 같은 규칙)
+    - 정수면 문서 수, 실수면 전체 문서 대비 비율
+    - 반환: (잘린 행렬, 남은 단어 목록, 남은 원래 열 번호)
+    """
+    n_docs = dtm.shape[0]
+    lo = min_df if isinstance(min_df, int) else min_df * n_docs
+    hi = max_df if isinstance(max_df, int) else max_df * n_docs
+    df = document_frequency(dtm)
+    keep = np.flatnonzero((df >= lo) & (df <= hi))
+    pruned = dtm[:, keep]
+    kept_terms = [terms[k] for k in keep] if terms is not None else None
+    return pruned.tocsr(), kept_terms, keep
+
+
+def tfidf(
+    dtm: sp.csr_matrix,
+    smooth_idf: bool = True,
+    sublinear_tf: bool = False,
+    norm: str | None = "l2",
+) -> tuple[sp.csr_matrix, np.ndarray]:
+    """
+    희소 TF-IDF (scikit-learn TfidfTransformer와 같은 식)
+    - idf = ln((1 + n) / (1 + df)) + 1   (smooth_idf=False면 ln(n / df) + 1)
+    - sublinear_tf: tf → 1 + ln(tf)
+    - norm: 행마다 l2 또는 l1 정규화
+    값이 있는 칸(data)만 계산하므로 0칸은 끝까지 0으로 남는다.
+    """
+    n_docs = dtm.shape[0]
+    df = document_frequency(dtm).astype(np.float64)
+    if smooth_idf:
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+    else:
+        with np.errstate(divide="ignore"):
+            idf = np.log(n_docs / df) + 1
+
+    out = dtm.astype(np.float64, copy=True)
+    if sublinear_tf:
+        np.log(out.data, out=out.data)
+        out.data += 1
+    out.data *= idf[out.indices]
+
+    if norm is not None:
+        if norm == "l2":
+            row_norm = np.sqrt(np.asarray(out.multiply(out).sum(axis=1)).ravel())
+        elif norm == "l1":
+            row_norm = np.asarray(abs(out).sum(axis=1)).ravel()
+        else:
+            raise ValueError(f"지원하지 않는 norm: {norm}")
+        row_norm[row_norm == 0] = 1.0  # 빈 문서
+        out.data /= np.repeat(row_norm, np.diff(out.indptr))
+    return out, idf
+
+
+# =========================
+# 워커 프로세스 쪽 코드 (9-4-3.py와 같은 구조)
+# =========================
+_tokenize = None
+_stopwords: frozenset = frozenset()
+_min_len = 2
+_n_features: int | None = None
+
+
+def _init_worker(tokenizer: str, stopwords: frozenset, min_len: int, n_features: int | None) -> None:
+    """워커마다 분석기를 한 번만 만든다"""
+    global _tokenize, _stopwords, _min_len, _n_features
+    if tokenizer == "okt_nouns":
+        from konlpy.tag import Okt
+        nouns = Okt().nouns
+        _tokenize = lambda text: nouns(MULTI_SPACE.sub(" ", NON_HANGUL.sub(" ", text)).strip())
+    elif tokenizer == "nltk":
+        from nltk.tokenize import TreebankWordTokenizer
+        split = TreebankWordTokenizer().tokenize
+        _tokenize = lambda text: [w.lower() for w in split(text) if w.isalpha()]
+    elif tokenizer == "whitespace":
+        _tokenize = lambda text: NON_HANGUL.sub(" ", text).split()
+    else:
+        raise ValueError(f"지원하지 않는 tokenizer: {tokenizer}")
+    _stopwords, _min_len, _n_features = stopwords, min_len, n_features
+
+
+def _iter_token_docs(texts: Iterable[str]) -> Iterator[list[str]]:
+    stop, min_len = _stopwords, _min_len
+    for text in texts:
+        yield [w for w in _tokenize(text) if len(w) >= min_len and w not in stop]
+
+
+def _build_shard(texts: list[str]) -> tuple[list[str] | None, sp.csr_matrix]:
+    """
+    샤드 하나 → (샤드 안의 단어 목록, 샤드 행렬)
+    - 증분 사전이면 열 번호는 샤드 안에서만 유효하므로 메인에서 전역 번호로 바꾼다.
+    """
+    vocab = HashingVocabulary(_n_features) if _n_features else Vocabulary()
+    dtm = build_dtm(_iter_token_docs(texts), vocab)
+    return vocab.terms, dtm
+
+
+# =========================
+# 메인 프로세스 쪽 코드
+# =========================
+def _iter_shards(texts: Iterable[str], shard_size: int) -> Iterator[list[str]]:
+    it = iter(texts)
+    while True:
+        shard = list(islice(it, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def build_dtm_parallel(
+    texts: Iterable[str],
+    tokenizer: str = "okt_nouns",
+    stopwords: Iterable[str] = DEFAULT_STOPWORDS,
+    min_len: int = 2,
+    n_features: int | None = None,
+    n_workers: int | None = None,
+    shard_size: int = 1_000,
+    max_pending: int | None = None,
+) -> tuple[sp.csr_matrix, list[str] | None]:
+    """
+    문서들을 shard_size개씩 나눠 워커에서 샤드 행렬을 만들고 순서대로 세로로 합친다.
+    - n_features를 주면 해시 사전 (샤드 행렬을 그대로 쌓으면 끝)
+    - 아니면 증분 사전: 샤드 단어 목록을 전역 사전에 차례로 넣어 '샤드 번호 → 전역 번호' 배열로 열을 바꾼다.
+      샤드 순서대로 합치므로 결과는 단일 프로세스로 만든 행렬과 같다.
+    - 동시에 처리 중인 샤드는 max_pending개까지만 (결과는 제출 순서대로 꺼낸다)
+    """
+    init_args = (tokenizer, frozenset(stopwords), min_len, n_features)
+    n_workers = n_workers or os.cpu_count() or 1
+    max_pending = max_pending or n_workers * 2
+    vocab = HashingVocabulary(n_features) if n_features else Vocabulary()
+    parts: list[tuple[np.ndarray, np.ndarray, np.ndarray, int]] = []
+
+    def merge(terms: list[str] | None, shard: sp.csr_matrix) -> None:
+        indices = shard.indices
+        if terms is not None:
+            remap = np.fromiter((vocab.add(t) for t in terms), dtype=np.int32, count=len(terms))
+            indices = remap[indices]
+        parts.append((shard.data, indices, shard.indptr, shard.shape[0]))
+
+    if n_workers == 1:
+        _init_worker(*init_args)
+        for shard in _iter_shards(texts, shard_size):
+            merge(*_build_shard(shard))
+    else:
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=init_args) as pool:
+            pending: deque = deque()
+            for shard in _iter_shards(texts, shard_size):
+                pending.append(pool.submit(_build_shard, shard))
+                if len(pending) >= max_pending:
+                    merge(*pending.popleft().result())
+            while pending:
+                merge(*pending.popleft().result())
+
+    # 모든 샤드의 열 번호가 전역 번호가 된 뒤 한 번에 이어 붙인다 (vstack 반복보다 빠름)
+    n_cols = len(vocab)
+    data = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+    indices = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0, dtype=np.int32)
+    offsets = np.cumsum([0] + [len(p[0]) for p in parts])
+    indptr = np.concatenate([[0]] + [p[2][1:] + off for p, off in zip(parts, offsets)])
+    dtm = sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_cols))
+    dtm.sort_indices()
+    return dtm, vocab.terms
+
+
+def main():
+    # 1) 연설문 한 줄 = 문서 하나
+    with open("president_speech.txt", encoding="utf-8") as f:
+        docs = [line.strip() for line in f if line.strip()]
+
+    try:
+        import konlpy  # noqa: F401
+        tokenizer = "okt_nouns"
+    except ImportError:
+        tokenizer = "whitespace"
+
+    # 2) 샤드 병렬 구성 (문서가 적으므로 샤드 크기를 작게)
+    start = time.perf_counter()
+    counts, terms = build_dtm_parallel(docs, tokenizer=tokenizer, n_workers=2, shard_size=10)
+    print(f"[{tokenizer}] DTM {counts.shape}, nnz={counts.nnz:,}, "
+          f"밀도 {counts.nnz / (counts.shape[0] * counts.shape[1]):.2%}, {time.perf_counter() - start:.2f}s")
+
+    # 3) 2개 문서 이상, 전체 문서의 80% 이하에 나온 단어만
+    counts, terms, _ = prune_by_df(counts, terms, min_df=2, max_df=0.8)
+    print(f"df 가지치기 후: {counts.shape}")
+
+    # 4) TF-IDF
+    weights, idf = tfidf(counts)
+    order = np.argsort(idf)
+    print("가장 흔한 단어(idf 낮음):", [terms[k] for k in order[:10]])
+    row = weights.getrow(0)
+    top = row.indices[np.argsort(row.data)[::-1][:5]]
+    print("첫 문서의 TF-IDF 상위 단어:", [terms[k] for k in top])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+# ==========================================
+# 🔎 연설문 역색인(inverted index)과 구절 검색
+# ==========================================
+# - 지금은 단어/구절을 찾으려면 연설문을 다시 읽고 다시 형태소 분석해야 한다.
+# - 이 스크립트는 한 번 분석한 결과로 역색인을 만들어 디스크에 저장하고, mmap으로 열어 바로 검색한다.
+#   1) 단어(형태소)마다 '나온 문서 번호, 문서 안 빈도, 문서 안 위치' 목록(postings)을 만든다.
+#   2) 문서 번호와 위치는 앞 값과의 차이(delta)로 바꾸고, varint(7비트씩, 작은 수는 1바이트)로 압축한다.
+#   3) postings.bin은 mmap으로 열어, 질의에 필요한 단어 구간만 읽어 numpy로 한 번에 복원한다.
+#   4) 질의: 단어 / AND / OR / 구절(단어가 연속으로 나오는 위치) → (문서, 토큰 위치, 글자 위치) 결과
+# 파일 구성 (index_dir/)
+#   meta.json        : 토크나이저 이름, 문서 수
+#   lexicon.json     : 단어 → [postings 시작 바이트, 문서 구간 길이, 위치 구간 길이, 문서 빈도]
+#   postings.bin     : 단어별 [문서 수 | 문서 번호 차이... | 빈도... | 위치 차이...] varint
+#   tok_offsets.u32  : 전체 토큰의 '문서 안 글자 위치' (문서 순서대로 이어 붙임)
+#   doc_tok_start.i64: 문서별 첫 토큰 번호 (n_docs + 1개)
+#   docs.bin / doc_byte_start.i64 : 원문 (결과 주변 문맥 출력용)
+# 의존성: numpy (선택: konlpy — 없으면 정규식 단어 토큰)
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+WORD = re.compile(r"[가-힣A-Za-z0-9]+")
+
+
+# =========================
+# varint / delta 부호화
+# =========================
+def varint_encode(values: np.ndarray) -> bytes:
+    """
+    0 이상 정수 배열 → varint 바이트 (하위 7비트부터, 마지막 바이트만 최상위 비트 0)
+    - 값마다 필요한 바이트 수를 먼저 구하고, k번째 바이트를 한꺼번에 채운다 (값 단위 파이썬 반복 없음)
+    """
+    v = np.asarray(values, dtype=np.uint64)
+    if v.size == 0:
+        return b""
+    nbytes = np.ones(v.size, dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += v >= (np.uint64(1) << np.uint64(7 * k))
+    starts = np.concatenate([[0], np.cumsum(nbytes)[:-1]])
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max())):
+        has = nbytes > k
+        byte = (v[has] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (nbytes[has] - 1 > k).astype(np.uint64) << np.uint64(7)
+        out[starts[has] + k] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def varint_decode(buf) -> np.ndarray:
+    """varint 바이트 → uint64 배열 (값 경계 = 최상위 비트가 0인 바이트)"""
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if b.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    ends = np.flatnonzero(b < 0x80)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    group_start = np.repeat(starts, ends - starts + 1)
+    shift = (7 * (np.arange(b.size) - group_start)).astype(np.uint64)
+    parts = (b & 0x7F).astype(np.uint64) << shift
+    return np.add.reduceat(parts, starts)
+
+
+def _segment_cumsum(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """구간마다 따로 누적합 (문서가 바뀌면 위치 차이 누적을 0부터 다시)"""
+    total = np.cumsum(values)
+    seg_end = np.cumsum(lengths)
+    before = np.concatenate([[0], total[seg_end[:-1] - 1]]) if len(lengths) else np.zeros(0, values.dtype)
+    return total - np.repeat(before, lengths)
+
+
+# =========================
+# 토큰화 (토큰 + 원문 글자 위치)
+# =========================
+def make_tokenizer(name: str) -> Callable[[str], list]:
+    """
+    문장 → [(토큰, 글자 위치), ...]
+    - okt_morphs: 형태소 전체 (구절 검색이 자연스럽다)
+    - okt_nouns : 명사만 (9-4-2.py와 같은 단위, 구절 = 이어서 나온 명사)
+    - regex     : 한글/영문/숫자 연속 구간
+    형태소 분석기는 위치를 돌려주지 않으므로 원문에서 앞에서부터 차례로 찾아 맞춘다.
+    """
+    if name == "regex":
+        return lambda text: [(m.group(), m.start()) for m in WORD.finditer(text)]
+    if name in ("okt_morphs", "okt_nouns"):
+        from konlpy.tag import Okt
+        okt = Okt()
+        analyze = okt.morphs if name == "okt_morphs" else okt.nouns
+
+        def tokenize(text: str) -> list:
+            out, cursor = [], 0
+            for tok in analyze(text):
+                found = text.find(tok, cursor)
+                if found < 0:            # 정규화로 모양이 바뀐 토큰은 현재 위치로 둔다
+                    found = cursor
+                else:
+                    cursor = found + len(tok)
+                out.append((tok, found))
+            return [(t, o) for t, o in out if WORD.search(t)]
+
+        return tokenize
+    raise ValueError(f"지원하지 않는 tokenizer: {name}")
+
+
+# =========================
+# 색인 만들기
+# =========================
+def build_index(docs: Iterable[str], index_dir: str, tokenizer: str = "regex") -> dict:
+    """
+    문서들을 읽어 index_dir에 역색인을 쓴다.
+    - 메모리에는 단어별 (문서, 위치) 목록만 모으고, 부호화는 단어 단위로 numpy에서 한 번에 한다.
+    """
+    tokenize = make_tokenizer(tokenizer)
+    postings: dict[str, list] = defaultdict(list)   # 단어 → [(문서, [위치...]), ...]
+    tok_offsets: list[int] = []
+    doc_tok_start = [0]
+    doc_bytes: list[bytes] = []
+
+    for doc_id, text in enumerate(docs):
+        positions: dict[str, list[int]] = defaultdict(list)
+        for pos, (tok, offset) in enumerate(tokenize(text)):
+            positions[tok.lower()].append(pos)
+            tok_offsets.append(offset)
+        for term, pos_list in positions.items():
+            postings[term].append((doc_id, pos_list))
+        doc_tok_start.append(len(tok_offsets))
+        doc_bytes.append(text.encode("utf-8"))
+
+    os.makedirs(index_dir, exist_ok=True)
+    lexicon = {}
+    with open(os.path.join(index_dir, "postings.bin"), "wb") as f:
+        offset = 0
+        for term in sorted(postings):
+            plist = postings[term]
+            doc_ids = np.fromiter((d for d, _ in plist), dtype=np.int64, count=len(plist))
+            tfs = np.fromiter((len(p) for _, p in plist), dtype=np.int64, count=len(plist))
+            pos = np.concatenate([np.diff(p, prepend=0) for _, p in plist])   # 문서마다 첫 위치는 그대로
+            doc_part = varint_encode(np.concatenate([[len(plist)], np.diff(doc_ids, prepend=0), tfs]))
+            pos_part = varint_encode(pos)
+            f.write(doc_part)
+            f.write(pos_part)
+            lexicon[term] = [offset, len(doc_part), len(pos_part), len(plist)]
+            offset += len(doc_part) + len(pos_part)
+
+    np.asarray(tok_offsets, dtype=np.uint32).tofile(os.path.join(index_dir, "tok_offsets.u32"))
+    np.asarray(doc_tok_start, dtype=np.int64).tofile(os.path.join(index_dir, "doc_tok_start.i64"))
+    with open(os.path.join(index_dir, "docs.bin"), "wb") as f:
+        for b in doc_bytes:
+            f.write(b)
+    np.concatenate([[0], np.cumsum([len(b) for b in doc_bytes])]).astype(np.int64).tofile(
+        os.path.join(index_dir, "doc_byte_start.i64"))
+    with open(os.path.join(index_dir, "lexicon.json"), "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False)
+    meta = {"tokenizer": tokenizer, "n_docs": len(doc_bytes), "n_terms": len(lexicon), "n_tokens": len(tok_offsets)}
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+
+# =========================
+# 검색
+# =========================
+@dataclass
+class Hits:
+    """검색 결과: 같은 길이의 배열 세 개 (문서 번호, 문서 안 토큰 위치, 문서 안 글자 위치)"""
+    doc: np.ndarray
+    pos: np.ndarray
+    offset: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.doc)
+
+
+class InvertedIndex:
+    """
+    mmap으로 연 역색인
+    - term(t): 단어가 나온 모든 위치
+    - and_(*terms) / or_(*terms): 조건을 만족하는 문서 번호 배열
+    - phrase(text): 구절이 연속으로 나온 위치 (질의도 색인과 같은 토크나이저로 자른다)
+    """
+
+    def __init__(self, index_dir: str):
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(index_dir, "lexicon.json"), encoding="utf-8") as f:
+            self.lexicon = json.load(f)
+        self._file = open(os.path.join(index_dir, "postings.bin"), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._postings = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._tok_offsets = self._memmap(index_dir, "tok_offsets.u32", np.uint32)
+        self._doc_tok_start = np.fromfile(os.path.join(index_dir, "doc_tok_start.i64"), dtype=np.int64)
+        self._docs = self._memmap(index_dir, "docs.bin", np.uint8)
+        self._doc_byte_start = np.fromfile(os.path.join(index_dir, "doc_byte_start.i64"), dtype=np.int64)
+        self._tokenize = None
+
+    @staticmethod
+    def _memmap(index_dir: str, name: str, dtype) -> np.ndarray:
+        path = os.path.join(index_dir, name)
+        return np.memmap(path, dtype=dtype, mode="r") if os.path.getsize(path) else np.zeros(0, dtype=dtype)
+
+    def close(self) -> None:
+        if isinstance(self._postings, mmap.mmap):
+            self._postings.close()
+        self._file.close()
+
+    def __enter__(self) -> "InvertedIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- postings 복원 ----------
+    def _docs_and_tfs(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        entry = self.lexicon.get(term.lower())
+        if entry is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        start, doc_len, _, df = entry
+        vals = varint_decode(self._postings[start:start + doc_len]).astype(np.int64)
+        return np.cumsum(vals[1:1 + df]), vals[1 + df:1 + 2 * df]
+
+    def _positions(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """단어의 모든 (문서, 위치) 쌍"""
+        docs, tfs = self._docs_and_tfs(term)
+        if len(docs) == 0:
+            return docs, docs
+        start, doc_len, pos_len, _ = self.lexicon[term.lower()]
+        deltas = varint_decode(self._postings[start + doc_len:start + doc_len + pos_len]).astype(np.int64)
+        return np.repeat(docs, tfs), _segment_cumsum(deltas, tfs)
+
+    def _hits(self, doc: np.ndarray, pos: np.ndarray) -> Hits:
+        offset = self._tok_offsets[self._doc_tok_start[doc] + pos].astype(np.int64) if len(doc) else doc
+        return Hits(doc, pos, offset)
+
+    # ---------- 질의 ----------
+    def df(self, term: str) -> int:
+        entry = self.lexicon.get(term.lower())
+        return entry[3] if entry else 0
+
+    def term(self, term: str) -> Hits:
+        return self._hits(*self._positions(term))
+
+    def and_(self, *terms: str) -> np.ndarray:
+        """모든 단어가 나온 문서 (문서 빈도가 작은 단어부터 교집합)"""
+        result = None
+        for t in sorted(terms, key=self.df):
+            docs = self._docs_and_tfs(t)[0]
+            result = docs if result is None else np.intersect1d(result, docs, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result if result is not None else np.zeros(0, dtype=np.int64)
+
+    def or_(self, *terms: str) -> np.ndarray:
+        """하나라도 나온 문서"""
+        parts = [self._docs_and_tfs(t)[0] for t in terms]
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def phrase(self, text: str | list[str]) -> Hits:
+        """
+        구절 검색: i번째 단어의 위치에서 i를 뺀 (문서, 시작 위치)가 모든 단어에서 겹치는 곳
+        - (문서, 위치)를 int64 하나(문서 << 32 | 위치)로 묶어 np.intersect1d로 교집합
+        """
+        if isinstance(text, str):
+            if self._tokenize is None:
+                self._tokenize = make_tokenizer(self.meta["tokenizer"])
+            terms = [t for t, _ in self._tokenize(text)]
+        else:
+            terms = list(text)
+        if not terms:
+            return self._hits(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+        # 문서 후보를 먼저 AND로 줄이고, 그 문서의 위치만 비교한다
+        candidates = self.and_(*terms)
+        keys = None
+        for i, t in enumerate(terms):
+            doc, pos = self._positions(t)
+            keep = np.isin(doc, candidates, assume_unique=False)
+            k = (doc[keep] << 32) | (pos[keep] - i)
+            k = k[pos[keep] >= i]
+            keys = k if keys is None else np.intersect1d(keys, k)
+            if len(keys) == 0:
+                break
+        return self._hits(keys >> 32, keys & 0xFFFFFFFF)
+
+    # ---------- 결과 보기 ----------
+    def document(self, doc: int) -> str:
+        lo, hi = self._doc_byte_start[doc], self._doc_byte_start[doc + 1]
+        return bytes(self._docs[lo:hi]).decode("utf-8")
+
+    def snippets(self, hits: Hits, width: int = 20, limit: int = 5) -> Iterator[str]:
+        for d, o in zip(hits.doc[:limit], hits.offset[:limit]):
+            text = self.document(int(d))
+            lo, hi = max(0, int(o) - width), min(len(text), int(o) + width)
+            yield f"[문서 {int(d)} @{int(o)}] …{text[lo:hi]}…"
+
+
+def main():
+    with open("president_speech.txt", encoding="utf-8") as f:
+        docs = [line.strip() for line in f if line.strip()]
+
+    try:
+        import konlpy  # noqa: F401
+        tokenizer = "okt_morphs"
+    except ImportError:
+        tokenizer = "regex"
+
+    start = time.perf_counter()
+    meta = build_index(docs, "speech_index", tokenizer=tokenizer)
+    size = sum(os.path.getsize(os.path.join("speech_index", n)) for n in ("postings.bin", "lexicon.json"))
+    print(f"색인 {time.perf_counter() - start:.2f}s: {meta}, postings+사전 {size / 1024:.1f} KB")
+
+    with InvertedIndex("speech_index") as index:
+        queries = [
+            ("term", lambda: index.term("평화")),
+            ("AND", lambda: index.and_("국민", "여러분")),
+            ("OR", lambda: index.or_("독립", "광복")),
+            ("phrase", lambda: index.phrase("해외 동포 여러분")),
+        ]
+        for name, q in queries:
+            start = time.perf_counter()
+            result = q()
+            ms = (time.perf_counter() - start) * 1000
+            if isinstance(result, Hits):
+                print(f"\n{name:<6} {len(result)}건 ({ms:.2f} ms)")
+                for line in index.snippets(result, limit=3):
+                    print("  ", line)
+            else:
+                print(f"\n{name:<6} 문서 {result.tolist()} ({ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# ============================================
+# 🚀 트랜스포머 감성 분석 배치 추론: 길이 버킷 + 동적 패딩
+# ============================================
+# - 9-5-2.py는 문장마다 nlp(text)를 한 번씩 호출한다 → CPU에서 매우 느림.
+# - 이 스크립트는
+#   1) 입력을 창(window) 단위로 받아, 창 안에서 토큰 길이 순으로 정렬한다.
+#   2) 비슷한 길이끼리 batch_size개씩 묶어(bucket) pipeline에 한 번에 넣는다.
+#      → pipeline은 묶음 안에서 가장 긴 문장에 맞춰 패딩하므로(동적 패딩) 낭비되는 패딩이 거의 없다.
+#   3) 결과는 원래 입력 순서대로 하나씩 돌려준다(스트리밍).
+#   4) 배치 크기별 처리량(texts/sec)을 측정한다.
+# 의존성: transformers, torch, numpy
+
+from __future__ import annotations
+
+import time
+from itertools import islice
+from typing import Iterable, Iterator
+
+import numpy as np
+import torch
+from transformers import pipeline
+
+MODEL = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+
+
+class BatchSentimentClassifier:
+    """
+    길이 버킷 기반 배치 감성 분류기
+    - batch_size: 한 번에 모델에 넣는 문장 수
+    - num_threads: torch CPU 연산 스레드 수 (None이면 torch 기본값)
+    - window_batches: 정렬 창 크기 = batch_size * window_batches
+      (창이 클수록 길이가 더 잘 맞지만, 첫 결과가 나오기까지 기다리는 시간과 메모리가 늘어난다)
+    """
+
+    def __init__(
+        self,
+        model: str = MODEL,
+        batch_size: int = 32,
+        num_threads: int | None = None,
+        max_length: int = 128,
+        window_batches: int = 16,
+        device: int = -1,
+    ):
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        self.nlp = pipeline(
+            "text-classification",
+            model=model,
+            tokenizer=model,
+            device=device,      # CPU. GPU는 0 이상
+        )
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.window_batches = window_batches
+
+    def _token_lengths(self, texts: list[str]) -> np.ndarray:
+        """fast tokenizer로 창 전체를 한 번에 토큰화해 길이만 구한다 (잘림 포함)"""
+        enc = self.nlp.tokenizer(texts, truncation=True, max_length=self.max_length)
+        return np.fromiter((len(ids) for ids in enc["input_ids"]), dtype=np.int64, count=len(texts))
+
+    def _buckets(self, lengths: np.ndarray) -> list[np.ndarray]:
+        """길이 순 정렬 후 batch_size개씩 자른 인덱스 묶음"""
+        order = np.argsort(lengths, kind="stable")
+        return [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+    def _predict_window(self, texts: list[str]) -> list[dict]:
+        results: list[dict | None] = [None] * len(texts)
+        for idx in self._buckets(self._token_lengths(texts)):
+            outs = self.nlp(
+                [texts[i] for i in idx],
+                batch_size=len(idx),
+                truncation=True,
+                max_length=self.max_length,
+            )
+            for i, out in zip(idx, outs):
+                results[i] = out
+        return results
+
+    def iter_predict(self, texts: Iterable[str]) -> Iterator[dict]:
+        """
+        입력 순서대로 {'label', 'score'}를 하나씩 돌려준다.
+        - 입력을 창 단위로 끊어 읽으므로 수백만 건의 생성기도 그대로 넣을 수 있다.
+        """
+        it = iter(texts)
+        window = self.batch_size * self.window_batches
+        while True:
+            chunk = list(islice(it, window))
+            if not chunk:
+                return
+            yield from self._predict_window(chunk)
+
+    def predict(self, texts: Iterable[str]) -> list[dict]:
+        return list(self.iter_predict(texts))
+
+    def padding_ratio(self, texts: list[str]) -> tuple[float, float]:
+        """
+        패딩 토큰 비율 비교 (입력 순서 그대로 묶을 때 vs 길이 버킷)
+        - 비율이 낮을수록 모델이 쓸모없는 패딩을 덜 계산한다.
+        """
+        lengths = self._token_lengths(texts)
+        total = lengths.sum()
+
+        def padded(batches):
+            return sum(len(b) * lengths[b].max() for b in batches)
+
+        naive = [np.arange(i, min(i + self.batch_size, len(texts))) for i in range(0, len(texts), self.batch_size)]
+        return 1 - total / padded(naive), 1 - total / padded(self._buckets(lengths))
+
+
+def benchmark(clf: BatchSentimentClassifier, texts: list[str], batch_sizes: Iterable[int]) -> list[tuple[str, float]]:
+    """
+    처리량 비교
+    - 'loop': 9-5-2.py처럼 문장마다 한 번씩 호출
+    - 그 외: 배치 크기별 버킷 배치 추론
+    """
+    rows = []
+    start = time.perf_counter()
+    for text in texts:
+        clf.nlp(text, truncation=True, max_length=clf.max_length)
+    rows.append(("loop", len(texts) / (time.perf_counter() - start)))
+
+    original = clf.batch_size
+    try:
+        for bs in batch_sizes:
+            clf.batch_size = bs
+            start = time.perf_counter()
+            clf.predict(texts)
+            rows.append((f"batch={bs}", len(texts) / (time.perf_counter() - start)))
+    finally:
+        clf.batch_size = original  # 호출한 쪽의 설정은 그대로 돌려 둔다
+    return rows
+
+
+def main():
+    texts = [
+        "The service was very unfriendly. I will never use it again.",
+        "서비스가 너무 불친절했어요. 다시는 이용 안 할 거예요.",
+        "I had a really satisfying experience and I recommend it!",
+        "정말 만족스러운 경험이었고 추천합니다!",
+        "It was decent for the price.",
+        "가격 대비 괜찮았어요.",
+    ]
+
+    clf = BatchSentimentClassifier(batch_size=32, num_threads=4)
+
+    # 1) 결과는 입력 순서 그대로
+    for text, out in zip(texts, clf.iter_predict(texts)):
+        print(f"문장: {text}")
+        print(f" → 긍부정 판단: {out['label']} (확률: {out['score'] * 100:.1f}%)")
+
+    # 2) 길이가 제각각인 리뷰 1,000건으로 처리량 측정
+    rng = np.random.default_rng(42)
+    corpus = [" ".join(rng.choice(texts, size=rng.integers(1, 8))) for _ in range(1_000)]
+    naive_pad, bucket_pad = clf.padding_ratio(corpus)
+    print(f"\n패딩 비율: 입력 순서 {naive_pad:.1%} → 길이 버킷 {bucket_pad:.1%}")
+
+    print("\n방식         | texts/sec")
+    for name, tps in benchmark(clf, corpus, batch_sizes=(8, 32, 64)):
+        print(f"{name:<12} | {tps:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
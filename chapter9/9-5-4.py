@@ -0,0 +1,199 @@
+# ============================================
+# ⚡ 감성 분석 CPU 추론 가속: ONNX 내보내기 / int8 동적 양자화
+# ============================================
+# - 9-5-2.py의 XLM-RoBERTa(약 2.8억 파라미터)는 CPU에서 문장당 수십~수백 ms가 걸린다.
+# - 이 스크립트는 같은 pipeline 인터페이스를 유지한 채 추론 백엔드만 바꿔 끼운다.
+#     torch       : 원본 (9-5-2.py와 동일)
+#     torch-int8  : torch 동적 양자화 (Linear 가중치를 int8로)
+#     onnx        : ONNX Runtime으로 내보낸 모델
+#     onnx-int8   : ONNX 모델을 다시 int8 동적 양자화
+# - ONNX로 내보낸/양자화한 모델은 model_cache/ 아래에 저장해 두고, 다음 실행부터는 바로 불러온다.
+#   (torch-int8은 불러올 때마다 양자화한다 — 수 초면 끝나고, 양자화 모듈을 pickle로 저장/복원하지 않기 위함)
+# - 고정 평가 문장으로 원본 대비 라벨 일치율과 확률 차이(drift)를 확인하고, 처리 속도를 비교한다.
+# 의존성: transformers, torch, numpy (선택: optimum[onnxruntime] — 없으면 onnx 백엔드는 건너뜀)
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+MODEL = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+CACHE_DIR = "model_cache"
+MAX_LENGTH = 128
+
+# 라벨/점수 drift 확인용 고정 평가 문장 (영어 + 한국어, 긍정/부정/중립, 길이 다양)
+EVAL_TEXTS = [
+    "The service was very unfriendly. I will never use it again.",
+    "서비스가 너무 불친절했어요. 다시는 이용 안 할 거예요.",
+    "I had a really satisfying experience and I recommend it!",
+    "정말 만족스러운 경험이었고 추천합니다!",
+    "It was decent for the price.",
+    "가격 대비 괜찮았어요.",
+    "Terrible.",
+    "최악이에요.",
+    "Absolutely loved it, the staff were wonderful and the food was amazing.",
+    "직원분들이 친절하고 음식도 맛있어서 또 오고 싶어요.",
+    "The package arrived on Tuesday.",
+    "택배는 화요일에 도착했습니다.",
+    "Not bad, but not great either.",
+    "나쁘진 않은데 그렇다고 좋지도 않네요.",
+    "I waited an hour and nobody answered the phone, which was really frustrating.",
+    "한 시간을 기다렸는데 아무도 전화를 안 받아서 정말 답답했어요.",
+    "The update fixed the crash, thanks!",
+    "업데이트 후에 오류가 사라졌어요, 감사합니다!",
+    "It's okay.",
+    "그냥 그래요.",
+]
+
+
+def _cache_path(cache_dir: str, model: str, suffix: str) -> str:
+    """'org/name' 모델 이름을 폴더 이름으로 바꿔 백엔드별 캐시 경로를 만든다"""
+    return os.path.join(cache_dir, f"{model.replace('/', '--')}-{suffix}")
+
+
+def load_torch(model: str = MODEL, cache_dir: str = CACHE_DIR):
+    """원본 pipeline (9-5-2.py와 동일)"""
+    return pipeline("text-classification", model=model, tokenizer=model, device=-1)
+
+
+def load_torch_int8(model: str = MODEL, cache_dir: str = CACHE_DIR):
+    """
+    torch 동적 양자화: nn.Linear의 가중치를 int8로 바꾸고, 활성값은 실행 시점에 양자화한다.
+    - 캐시 없음: fp32 모델을 불러와 매번 양자화 (cache_dir는 다른 백엔드와 인터페이스를 맞추기 위한 인자)
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    fp32 = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    qmodel = torch.ao.quantization.quantize_dynamic(fp32, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("text-classification", model=qmodel, tokenizer=tokenizer, device=-1)
+
+
+def _export_onnx(model: str, cache_dir: str) -> str:
+    """ONNX로 한 번만 내보내고 폴더 경로를 돌려준다"""
+    out_dir = _cache_path(cache_dir, model, "onnx")
+    if not os.path.exists(os.path.join(out_dir, "model.onnx")):
+        ORTModelForSequenceClassification.from_pretrained(model, export=True).save_pretrained(out_dir)
+        AutoTokenizer.from_pretrained(model).save_pretrained(out_dir)
+    return out_dir
+
+
+def load_onnx(model: str = MODEL, cache_dir: str = CACHE_DIR):
+    """ONNX Runtime 백엔드 (fp32)"""
+    if not HAS_ORT:
+        raise ImportError("onnx 백엔드에는 optimum[onnxruntime]이 필요합니다: pip install optimum[onnxruntime]")
+    out_dir = _export_onnx(model, cache_dir)
+    ort_model = ORTModelForSequenceClassification.from_pretrained(out_dir)
+    return pipeline("text-classification", model=ort_model, tokenizer=AutoTokenizer.from_pretrained(out_dir))
+
+
+def load_onnx_int8(model: str = MODEL, cache_dir: str = CACHE_DIR):
+    """ONNX 모델을 int8 동적 양자화 (CPU 명령어 세트에 맞춘 설정은 avx2: 대부분의 x86 CPU에서 동작)"""
+    if not HAS_ORT:
+        raise ImportError("onnx 백엔드에는 optimum[onnxruntime]이 필요합니다: pip install optimum[onnxruntime]")
+    onnx_dir = _export_onnx(model, cache_dir)
+    q_dir = _cache_path(cache_dir, model, "onnx-int8")
+    if not os.path.exists(os.path.join(q_dir, "model_quantized.onnx")):
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        ORTQuantizer.from_pretrained(onnx_dir).quantize(save_dir=q_dir, quantization_config=qconfig)
+        AutoTokenizer.from_pretrained(onnx_dir).save_pretrained(q_dir)
+    ort_model = ORTModelForSequenceClassification.from_pretrained(q_dir, file_name="model_quantized.onnx")
+    return pipeline("text-classification", model=ort_model, tokenizer=AutoTokenizer.from_pretrained(q_dir))
+
+
+BACKENDS = {
+    "torch": load_torch,
+    "torch-int8": load_torch_int8,
+    "onnx": load_onnx,
+    "onnx-int8": load_onnx_int8,
+}
+
+
+def load_backend(name: str, model: str = MODEL, cache_dir: str = CACHE_DIR):
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 백엔드: {name} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](model, cache_dir)
+
+
+def class_probs(nlp, texts: list[str], batch_size: int = 8) -> tuple[list[str], np.ndarray]:
+    """
+    모든 라벨의 확률을 (문장 수, 라벨 수) 배열로 돌려준다.
+    - 라벨 순서는 이름순으로 고정해, 백엔드가 달라도 열이 같은 라벨을 가리키게 한다.
+    """
+    outs = nlp(texts, top_k=None, truncation=True, max_length=MAX_LENGTH, batch_size=batch_size)
+    labels = sorted(d["label"] for d in outs[0])
+    probs = np.array([[{d["label"]: d["score"] for d in row}[lab] for lab in labels] for row in outs])
+    return labels, probs
+
+
+def drift_check(reference, candidate, texts: list[str] = EVAL_TEXTS) -> dict:
+    """
+    원본(reference) 대비 후보(candidate) 백엔드의 정확도 drift
+    - label_agreement: 최상위 라벨이 같은 비율
+    - max_abs_diff / mean_abs_diff: 라벨별 확률 차이의 최댓값 / 평균
+    """
+    ref_labels, ref = class_probs(reference, texts)
+    cand_labels, cand = class_probs(candidate, texts)
+    if ref_labels != cand_labels:
+        raise ValueError(f"라벨 집합이 다릅니다: {ref_labels} vs {cand_labels}")
+    diff = np.abs(ref - cand)
+    return {
+        "label_agreement": float((ref.argmax(1) == cand.argmax(1)).mean()),
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+    }
+
+
+def benchmark(nlp, texts: list[str], batch_size: int = 8, repeats: int = 3) -> float:
+    """처리량(texts/sec). 첫 호출(워밍업)은 측정에서 뺀다."""
+    nlp(texts[:batch_size], truncation=True, max_length=MAX_LENGTH, batch_size=batch_size)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        nlp(texts, truncation=True, max_length=MAX_LENGTH, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    torch.set_num_threads(os.cpu_count() or 1)
+    names = ["torch", "torch-int8"] + (["onnx", "onnx-int8"] if HAS_ORT else [])
+    if not HAS_ORT:
+        print("optimum[onnxruntime]이 없어 onnx 백엔드는 건너뜁니다.\n")
+
+    reference = load_backend("torch")
+    bench_texts = EVAL_TEXTS * 10
+
+    print(f"{'backend':<11} | {'load(s)':>7} | {'texts/sec':>9} | {'label 일치':>9} | {'max |Δp|':>8} | {'mean |Δp|':>9}")
+    fast, fast_name, fast_tps = None, None, 0.0
+    for name in names:
+        start = time.perf_counter()
+        nlp = load_backend(name)  # torch도 새로 불러와 모든 백엔드의 load 시간을 같은 조건으로 잰다
+        load_sec = time.perf_counter() - start
+        drift = drift_check(reference, nlp)
+        tps = benchmark(nlp, bench_texts)
+        print(f"{name:<11} | {load_sec:>7.2f} | {tps:>9.1f} | {drift['label_agreement']:>9.1%} | "
+              f"{drift['max_abs_diff']:>8.4f} | {drift['mean_abs_diff']:>9.4f}")
+        if tps > fast_tps:
+            fast, fast_name, fast_tps = nlp, name, tps
+        del nlp
+
+    # 측정한 처리량이 가장 높은 백엔드로 9-5-2.py와 같은 출력
+    print(f"\n가장 빠른 백엔드: {fast_name} ({fast_tps:.1f} texts/sec)")
+    for text in EVAL_TEXTS[:6]:
+        out = fast(text, truncation=True, max_length=MAX_LENGTH)[0]
+        print(f"\n문장: {text}")
+        print(f" → 긍부정 판단: {out['label']} (확률: {out['score'] * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
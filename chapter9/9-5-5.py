@@ -0,0 +1,344 @@
+# ============================================
+# 🔥 상주형(warm) 감성 분석 서버: 모델은 한 번만 올리고 요청을 묶어서 추론
+# ============================================
+# - 9-5-2.py는 실행할 때마다 토크나이저와 가중치를 다시 읽어 첫 결과까지 수 초가 걸린다.
+# - 이 스크립트는 pipeline을 한 번만 올려 두는 asyncio HTTP 서버다.
+#   1) 짧은 시간(max_wait_ms) 동안 들어온 요청을 모아 한 번에 추론한다(마이크로 배칭).
+#   2) 정규화된 문장의 해시를 키로 결과를 LRU 캐시에 저장한다. 같은 문장이 동시에 들어오면 추론은 한 번만 한다.
+#   3) 요청별 지연 시간을 모아 p50/p95/p99를 /stats로 보여 준다.
+# - 사용법
+#     python 9-5-5.py serve --port 8765                 # 실제 모델
+#     curl -s -XPOST localhost:8765/predict -d '{"texts": ["정말 만족스러워요!"]}'
+#     curl -s localhost:8765/stats
+#     python 9-5-5.py demo                              # 인터넷 없이: 작은 로컬 모델로 서버 + 동시 요청 시험
+# 의존성: transformers, torch (demo/serve 모두) — 서버 코드 자체는 표준 라이브러리만 사용
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+MODEL = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+WHITESPACE = re.compile(r"\s+")
+
+
+def text_key(text: str) -> bytes:
+    """NFC 통일 + 공백 정리 후 16바이트 해시 (캐시 키)"""
+    norm = WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=16).digest()
+
+
+def percentile(values, q: float) -> float:
+    """정렬 후 선형 보간 백분위수 (numpy.percentile 기본값과 같음)"""
+    xs = sorted(values)
+    if not xs:
+        return 0.0
+    pos = (len(xs) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+
+def make_pipeline_predict(model: str = MODEL, max_length: int = 128, num_threads: int | None = None) -> Callable:
+    """
+    pipeline을 한 번만 올리고, '문장 목록 → [{'label', 'score'}, ...]' 함수를 돌려준다.
+    - model에는 허브 이름이나 로컬 폴더 경로를 줄 수 있다.
+    """
+    import torch
+    from transformers import pipeline
+
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+    nlp = pipeline("text-classification", model=model, tokenizer=model, device=-1)
+
+    def predict(texts: list[str]) -> list[dict]:
+        return nlp(texts, batch_size=len(texts), truncation=True, max_length=max_length)
+
+    return predict
+
+
+def make_tiny_model(path: str) -> str:
+    """
+    오프라인 시험용 작은 BERT 분류 모델(무작위 가중치)을 path에 만든다.
+    - 어휘 파일까지 직접 써서 허브에 접속하지 않는다. 라벨은 실제 모델과 같은 3개.
+    """
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    if os.path.exists(os.path.join(path, "config.json")):
+        return path
+    os.makedirs(path, exist_ok=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcdefghijklmnopqrstuvwxyz.,!?") + [
+        "service", "good", "bad", "great", "never", "again", "price", "서비스", "만족", "추천", "가격",
+    ]
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    labels = ["negative", "neutral", "positive"]
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=128, num_labels=3,
+        id2label=dict(enumerate(labels)), label2id={lab: i for i, lab in enumerate(labels)},
+    )
+    BertForSequenceClassification(config).save_pretrained(path)
+    BertTokenizerFast(vocab_file=vocab_file).save_pretrained(path)
+    return path
+
+
+def _request_texts(data) -> list[str]:
+    """요청 본문 → 문장 목록 ({"texts": [str, ...]} 또는 {"text": str}, 그 밖의 모양은 ValueError → 400)"""
+    if not isinstance(data, dict):
+        raise ValueError("본문은 JSON 객체여야 합니다.")
+    if "texts" in data:
+        texts = data["texts"]
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise ValueError('"texts"는 문자열 리스트여야 합니다.')
+        return texts
+    if "text" in data:
+        if not isinstance(data["text"], str):
+            raise ValueError('"text"는 문자열이어야 합니다.')
+        return [data["text"]]
+    raise ValueError('"texts" 또는 "text"가 필요합니다.')
+
+
+class SentimentServer:
+    """
+    마이크로 배칭 + 결과 캐시를 갖춘 추론 서버
+    - predict_fn: 문장 목록을 받아 결과 목록을 돌려주는 동기 함수 (make_pipeline_predict 결과 등)
+      전용 스레드 하나에서 실행하므로 추론 중에도 이벤트 루프는 새 요청을 계속 받는다.
+    - max_batch: 한 번에 추론하는 최대 문장 수
+    - max_wait_ms: 첫 요청이 들어온 뒤 배치를 채우려고 기다리는 최대 시간
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[list[str]], list[dict]],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        cache_size: int = 100_000,
+        latency_window: int = 10_000,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, dict] = OrderedDict()
+        self._inflight: dict[bytes, asyncio.Future] = {}
+        self._queue: asyncio.Queue | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._batcher: asyncio.Task | None = None
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._batch_sizes: deque[int] = deque(maxlen=latency_window)
+        self.requests = 0
+        self.cache_hits = 0
+
+    # ---------- 추론 ----------
+    async def predict(self, text: str) -> dict:
+        start = time.perf_counter()
+        self.requests += 1
+        key = text_key(text)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            result = self._cache[key]
+        elif key in self._inflight:
+            # 같은 문장이 이미 배치 대기/추론 중이면 그 결과를 같이 기다린다
+            result = await asyncio.shield(self._inflight[key])
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            self._inflight[key] = fut
+            await self._queue.put((text, key, fut))
+            result = await asyncio.shield(fut)
+
+        self._latencies.append(time.perf_counter() - start)
+        return result
+
+    async def predict_many(self, texts: list[str]) -> list[dict]:
+        return list(await asyncio.gather(*(self.predict(t) for t in texts)))
+
+    async def _collect_batch(self) -> list[tuple]:
+        """첫 항목이 들어오면 max_wait 동안 또는 max_batch개가 찰 때까지 더 모은다"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _, _ in batch]
+            self._batch_sizes.append(len(batch))
+            try:
+                outs = await loop.run_in_executor(self._executor, self.predict_fn, texts)
+            except Exception as e:  # 한 배치가 실패해도 서버는 계속 돈다
+                for _, key, fut in batch:
+                    self._inflight.pop(key, None)
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, key, fut), out in zip(batch, outs):
+                self._cache_put(key, out)
+                self._inflight.pop(key, None)
+                if not fut.done():
+                    fut.set_result(out)
+
+    def _cache_put(self, key: bytes, value: dict) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ---------- 통계 ----------
+    def stats(self) -> dict:
+        lat_ms = [x * 1000 for x in self._latencies]
+        return {
+            "requests": self.requests,
+            "cache_hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+            "cache_size": len(self._cache),
+            "batches": len(self._batch_sizes),
+            "mean_batch_size": sum(self._batch_sizes) / len(self._batch_sizes) if self._batch_sizes else 0.0,
+            "latency_ms": {f"p{q}": round(percentile(lat_ms, q), 3) for q in (50, 95, 99)},
+        }
+
+    # ---------- HTTP ----------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """최소한의 HTTP/1.1: POST /predict, GET /stats, GET /health (요청 하나 처리 후 연결 종료)"""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "bad request"}
+            elif request_line[:2] == ["POST", "/predict"]:
+                texts = _request_texts(json.loads(body or b"{}"))
+                status, payload = 200, {"results": await self.predict_many(texts)}
+            elif request_line[:2] == ["GET", "/stats"]:
+                status, payload = 200, self.stats()
+            elif request_line[:2] == ["GET", "/health"]:
+                status, payload = 200, {"status": "ok"}
+            else:
+                status, payload = 404, {"error": "not found"}
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(raw)}\r\nConnection: close\r\n\r\n".encode("latin-1") + raw
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str | None = None) -> asyncio.AbstractServer:
+        """배처 태스크를 띄우고 TCP(또는 Unix 소켓) 서버를 연다"""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if unix_path:
+            return await asyncio.start_unix_server(self._handle, path=unix_path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+
+async def http_request(host: str, port: int, method: str, path: str, payload: dict | None = None) -> dict:
+    """시험용 최소 HTTP 클라이언트"""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    return json.loads(raw.split(b"\r\n\r\n", 1)[1])
+
+
+async def serve(args) -> None:
+    start = time.perf_counter()
+    predict_fn = make_pipeline_predict(args.model, num_threads=args.threads)
+    print(f"모델 로딩: {time.perf_counter() - start:.1f}s (이후 요청부터는 다시 읽지 않음)")
+    server = SentimentServer(predict_fn, args.max_batch, args.max_wait_ms, args.cache_size)
+    srv = await server.start(args.host, args.port, args.unix)
+    print(f"listening on {args.unix or f'http://{args.host}:{args.port}'}")
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        await server.close()
+
+
+async def demo(args) -> None:
+    """작은 로컬 모델로 서버를 띄우고 동시 요청 300개(중복 문장 포함)를 보낸다"""
+    predict_fn = make_pipeline_predict(make_tiny_model(args.tiny_dir))
+    server = SentimentServer(predict_fn, args.max_batch, args.max_wait_ms, args.cache_size)
+    srv = await server.start(args.host, 0)
+    port = srv.sockets[0].getsockname()[1]
+
+    texts = [f"service was good {i % 100}" for i in range(300)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(http_request(args.host, port, "POST", "/predict", {"text": t}) for t in texts))
+    elapsed = time.perf_counter() - start
+
+    print(f"요청 {len(results)}개 / {elapsed:.2f}s → {len(results) / elapsed:.0f} req/s")
+    print("예시 응답:", results[0])
+    print("stats:", json.dumps(await http_request(args.host, port, "GET", "/stats"), indent=2))
+
+    srv.close()
+    await srv.wait_closed()
+    await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상주형 감성 분석 서버")
+    parser.add_argument("mode", choices=["serve", "demo"])
+    parser.add_argument("--model", default=MODEL, help="허브 모델 이름 또는 로컬 폴더")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="TCP 대신 Unix 소켓 경로")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--cache-size", type=int, default=100_000)
+    parser.add_argument("--tiny-dir", default="tiny_sentiment_model", help="demo용 작은 모델 저장 폴더")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args) if args.mode == "serve" else demo(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 # 🎆 워드클라우드 실습: 명사 기반 시각화
 # ============================================
 
+from collections import Counter
+
 from konlpy.tag import Okt
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
@@ -24,8 +26,10 @@ nouns = okt.nouns(text)
 stopwords = ["것", "수", "등", "들", "그", "그리고", "이", "저", "제", "우리", "대한"]
 filtered_nouns = [word for word in nouns if word not in stopwords and len(word) > 1]
 
-# 5️⃣ 워드클라우드를 위한 문자열 결합
-text_for_wc = " ".join(filtered_nouns)
+# 5️⃣ 워드클라우드를 위한 빈도표
+# 명사는 이미 뽑아 두었으므로 문자열로 다시 합쳐 generate(text)에 넘기지 않는다.
+# (generate는 문자열을 다시 토큰화하고 다시 세므로 같은 일을 두 번 한다)
+freq_dict = Counter(filtered_nouns)
 
 # 6️⃣ 한글 폰트 경로 설정 (운영체제별 경로 예시)
 # Windows: C:/Windows/Fonts/malgun.ttf
@@ -94,7 +98,7 @@ wc = WordCloud(
     scale=1.0,                    # 렌더링 스케일(선명도)
     random_state=42               # 재현성(결과 고정)
     # mask=mask                   # (선택) 마스킹 이미지 사용 시 주석 해제
-).generate(text_for_wc)           # 또는 .generate_from_frequencies(freq_dict)
+).generate_from_frequencies(freq_dict)  # 빈도표를 바로 사용 (레이아웃 캐시는 9-6-6.py)
 
 
 # 8️⃣ 시각화
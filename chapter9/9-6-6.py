@@ -0,0 +1,203 @@
+# ============================================
+# 🎨 워드클라우드 레이아웃 캐시: 배치는 한 번, 색만 바꿔 다시 그리기
+# ============================================
+# - 9-6-5.py는 빈도표로 워드클라우드를 만든다. 하지만 색상표(colormap)만 바꿔 다시 그려도
+#   WordCloud는 단어 배치(나선형 탐색 + 충돌 검사)를 처음부터 다시 한다 → 가장 느린 단계.
+# - 이 스크립트는
+#   1) 연설문을 줄 단위로 읽으며 명사 빈도를 센다 (전체 문자열을 합쳐 generate(text)에 넘기지 않음).
+#   2) 빈도표를 generate_from_frequencies에 바로 넘긴다.
+#   3) 계산된 배치(layout_: 단어, 글자 크기, 위치, 방향)와 정규화된 빈도(words_)를
+#      '빈도표 + 배치에 영향을 주는 설정(크기, 마스크, 폰트, 시드 ...)'의 해시를 키로 메모리/디스크에 저장한다.
+#   4) 같은 키로 다시 그리면 배치를 건너뛰고 recolor로 색만 새로 입힌다.
+# 의존성: wordcloud, matplotlib, numpy, 같은 폴더의 9-3-7.py(TokenFilter) (선택: konlpy — 없으면 공백 기준 토큰)
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import re
+import time
+from collections import Counter
+from typing import Iterable
+
+import matplotlib.pyplot as plt
+import numpy as np
+from wordcloud import WordCloud
+
+# 배치 결과를 바꾸는 WordCloud 설정 (색상/배경색/scale은 그리기 단계에서만 쓰이므로 키에 넣지 않는다)
+LAYOUT_PARAMS = (
+    "width", "height", "margin", "prefer_horizontal", "min_font_size", "max_font_size",
+    "font_step", "relative_scaling", "max_words", "repeat", "random_state", "font_path",
+)
+
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "/System/Library/Fonts/AppleGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+]
+
+NON_HANGUL = re.compile(r"[^가-힣\s]")
+
+
+def layout_key(frequencies: dict, settings: dict, mask: np.ndarray | None) -> str:
+    """
+    배치 캐시 키
+    - 빈도표: 단어순 정렬 후 직렬화 (dict 순서가 달라도 같은 키)
+    - 폰트: 경로 + 파일 크기/수정 시각 (같은 경로의 폰트 파일이 바뀌면 다른 키)
+    - 마스크: 배열 모양과 바이트의 해시
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(sorted((str(w), float(f)) for w, f in frequencies.items()), ensure_ascii=False).encode("utf-8"))
+    h.update(json.dumps({k: settings.get(k) for k in LAYOUT_PARAMS}, sort_keys=True, default=str).encode("utf-8"))
+    font_path = settings.get("font_path")
+    if font_path and os.path.exists(font_path):
+        st = os.stat(font_path)
+        h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    if mask is not None:
+        h.update(str(mask.shape).encode())
+        h.update(np.ascontiguousarray(mask).tobytes())
+    return h.hexdigest()
+
+
+class CachedWordCloud:
+    """
+    배치 캐시를 가진 워드클라우드 렌더러
+    - **settings: WordCloud 생성자 인자 (font_path, width, height, max_words, random_state, mask ...)
+    - cache_dir: 주면 배치를 pickle 파일로도 저장해 다음 실행에서 재사용
+    - random_state가 정수일 때만 캐시한다 (배치가 재현 가능할 때만 재사용이 의미 있음)
+    """
+
+    def __init__(self, cache_dir: str | None = None, **settings):
+        self.settings = settings
+        self.cache_dir = cache_dir
+        self._memory: dict[str, tuple[dict, list]] = {}
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _load(self, key: str) -> tuple[dict, list] | None:
+        """(words_, layout_) 또는 None"""
+        if key in self._memory:
+            return self._memory[key]
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.pkl")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    entry = pickle.load(f)
+                if not isinstance(entry, tuple):
+                    # words_ 없이 배치만 저장하던 이전 형식 → 다시 계산
+                    return None
+                self._memory[key] = entry
+                return entry
+        return None
+
+    def _store(self, key: str, words: dict, layout: list) -> None:
+        # words_: generate_from_frequencies가 남긴 상위 max_words개, 최댓값 1로 정규화된 빈도
+        # layout_: 색은 다시 입힐 것이므로 빼고 저장
+        entry = (dict(words), [(wf, size, pos, orient, None) for wf, size, pos, orient, _ in layout])
+        self._memory[key] = entry
+        if self.cache_dir:
+            with open(os.path.join(self.cache_dir, f"{key}.pkl"), "wb") as f:
+                pickle.dump(entry, f)
+
+    def render(self, frequencies: dict, colormap: str | None = None, color_func=None, **overrides) -> WordCloud:
+        """
+        빈도표 → 워드클라우드
+        - 캐시 적중: 배치를 그대로 쓰고 recolor로 색만 입힌다.
+        - 캐시 실패: generate_from_frequencies로 배치 후 캐시에 저장하고, 적중 때와 같은 recolor로 색을 입힌다.
+        - overrides: 이번 그림에만 쓸 설정 (배치 관련 설정을 바꾸면 자동으로 다른 키가 된다)
+        """
+        settings = {**self.settings, **overrides}
+        if colormap is not None:
+            settings["colormap"] = colormap
+        wc = WordCloud(**settings)
+        seed = settings.get("random_state")
+        if not isinstance(seed, int):
+            # 시드가 없으면 매번 다른 배치가 의도이므로 캐시하지 않는다
+            self.misses += 1
+            return wc.generate_from_frequencies(frequencies)
+
+        # WordCloud는 random_state를 Random 객체로 바꿔 두므로 키에는 원래 정수 시드를 쓴다
+        key_settings = {k: getattr(wc, k, None) for k in LAYOUT_PARAMS}
+        key_settings["random_state"] = seed
+        key = layout_key(frequencies, key_settings, wc.mask)
+
+        entry = self._load(key)
+        if entry is not None:
+            self.hits += 1
+            words, wc.layout_ = entry
+            wc.words_ = dict(words)
+        else:
+            self.misses += 1
+            wc.generate_from_frequencies(frequencies)
+            self._store(key, wc.words_, wc.layout_)
+        # 적중/실패 모두 같은 recolor로 색을 입혀야 첫 그림과 이후 그림이 같다
+        return wc.recolor(random_state=seed, color_func=color_func, colormap=colormap)
+
+
+def _load_token_filter():
+    """9-3-7.py의 TokenFilter (파일 이름에 '-'가 있어 import 대신 경로로 불러온다)"""
+    spec = importlib.util.spec_from_file_location("token_filter", os.path.join(os.path.dirname(__file__), "9-3-7.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.TokenFilter
+
+
+def count_nouns(lines: Iterable[str], stopwords: Iterable[str] | None = None) -> Counter:
+    """
+    줄 단위로 명사 빈도를 센다
+    - 거르기: 9-3-7.py TokenFilter.korean_wordcloud (9-6-5.py와 같은 불용어, 1글자 제거)
+    - stopwords: 주면 기본 워드클라우드 불용어 대신 사용
+    """
+    try:
+        from konlpy.tag import Okt
+        tokenize = Okt().nouns
+    except ImportError:
+        tokenize = str.split
+    TokenFilter = _load_token_filter()
+    keep = TokenFilter.korean_wordcloud() if stopwords is None else TokenFilter.korean_wordcloud(stopwords)
+    counter = Counter()
+    for line in lines:
+        counter.update(keep.iter_filter(tokenize(NON_HANGUL.sub(" ", line))))
+    return counter
+
+
+def main():
+    with open("president_speech.txt", encoding="utf-8") as f:
+        freq = count_nouns(f)
+
+    font_path = next((p for p in FONT_CANDIDATES if os.path.exists(p)), None)
+    renderer = CachedWordCloud(
+        cache_dir="wc_layout_cache",
+        font_path=font_path,
+        background_color="white",
+        width=800,
+        height=500,
+        max_words=150,
+        prefer_horizontal=0.9,
+        random_state=42,
+    )
+
+    # 같은 빈도표를 색상표만 바꿔 네 번 그린다 → 첫 번째만 배치 계산
+    colormaps = ["tab10", "viridis", "plasma", "Set2"]
+    fig, axes = plt.subplots(2, 2, figsize=(14, 9))
+    for ax, cmap in zip(axes.ravel(), colormaps):
+        start = time.perf_counter()
+        wc = renderer.render(freq, colormap=cmap)
+        elapsed = time.perf_counter() - start
+        ax.imshow(wc, interpolation="bilinear")
+        ax.set_title(f"{cmap} ({elapsed * 1000:.0f} ms)")
+        ax.axis("off")
+        print(f"{cmap:<8} {elapsed * 1000:8.1f} ms")
+    print(f"배치 캐시: 적중 {renderer.hits} / 실패 {renderer.misses}")
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()